@@ -104,5 +104,6 @@ CREATE INDEX IF NOT EXISTS idx_audit_events_entity_id ON audit_events(entity_id)
 CREATE INDEX IF NOT EXISTS idx_audit_events_created_at ON audit_events(created_at);
 CREATE INDEX IF NOT EXISTS idx_model_metrics_model_name ON model_metrics(model_name);
 CREATE INDEX IF NOT EXISTS idx_model_metrics_timestamp ON model_metrics(timestamp);
+CREATE INDEX IF NOT EXISTS idx_model_metrics_type_timestamp ON model_metrics(metric_type, timestamp);
 CREATE INDEX IF NOT EXISTS idx_feature_drift_feature_name ON feature_drift(feature_name);
 CREATE INDEX IF NOT EXISTS idx_feature_drift_created_at ON feature_drift(created_at);
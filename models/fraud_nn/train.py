@@ -230,6 +230,13 @@ class FraudNNModel:
         with open(scaler_file, 'wb') as f:
             pickle.dump(self.scaler, f)
         
+        # Save scaler parameters as plain arrays for serving without unpickling
+        np.savez(
+            os.path.join(self.model_path, f"{self.model_version}_scaler.npz"),
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_
+        )
+        
         # Save feature names
         features_file = os.path.join(self.model_path, "feature_names.json")
         with open(features_file, 'w') as f:
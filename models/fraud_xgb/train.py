@@ -161,6 +161,26 @@ class FraudXGBModel:
         importance = self.model.feature_importances_
         return dict(zip(self.feature_names, importance))
     
+    def save_native_calibration(self) -> str:
+        """Save each calibration fold's booster as .ubj plus its sigmoid parameters as JSON.
+        
+        CalibratedClassifierCV(method='sigmoid') averages the Platt-scaled probabilities of
+        one booster per fold, so the served score needs every fold, not the base model.
+        """
+        boosters, a, b = [], [], []
+        for i, fold in enumerate(self.calibrated_model.calibrated_classifiers_):
+            booster_name = f"{self.model_version}_fold{i}.ubj"
+            fold.estimator.save_model(os.path.join(self.model_path, booster_name))
+            boosters.append(booster_name)
+            a.append(float(fold.calibrators[0].a_))
+            b.append(float(fold.calibrators[0].b_))
+        
+        calibration_file = os.path.join(self.model_path, f"{self.model_version}_calibration.json")
+        with open(calibration_file, 'w') as f:
+            json.dump({'boosters': boosters, 'a': a, 'b': b}, f, indent=2)
+        
+        return calibration_file
+    
     def save_model(self):
         """Save the trained model."""
         os.makedirs(self.model_path, exist_ok=True)
@@ -174,6 +194,9 @@ class FraudXGBModel:
         with open(model_file, 'wb') as f:
             pickle.dump(self.calibrated_model, f)
         
+        # Save the calibrated model in native form for serving
+        self.save_native_calibration()
+        
         # Save feature names
         features_file = os.path.join(self.model_path, "feature_names.json")
         with open(features_file, 'w') as f:
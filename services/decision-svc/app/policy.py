@@ -1,20 +1,26 @@
 from .config import settings
 
+_TRUSTED_CHANNELS = frozenset(settings.TRUSTED_CHANNELS)
+
 def decide(payload: dict) -> tuple[str, list[str]]:
     s = payload["scores"].get("calibrated", 0.0)
     f = payload.get("features", {})
     reasons = []
 
-    if f.get("velocity_1h", 0) >= 8:
+    # evaluate each rule once; the thresholds below test the flags, not the reasons list
+    velocity_high = f.get("velocity_1h", 0) >= 8
+    ip_proxy_match = float(f.get("ip_risk", 0)) >= 0.8
+
+    if velocity_high:
         reasons.append("velocity_high")
-    if float(f.get("ip_risk", 0)) >= 0.8:
+    if ip_proxy_match:
         reasons.append("ip_proxy_match")
-    if payload.get("channel") not in settings.TRUSTED_CHANNELS:
+    if payload.get("channel") not in _TRUSTED_CHANNELS:
         reasons.append("untrusted_channel")
 
     # primary thresholds
-    if s >= settings.BLOCK_THRESHOLD or ("ip_proxy_match" in reasons and s >= 0.80):
+    if s >= settings.BLOCK_THRESHOLD or (ip_proxy_match and s >= 0.80):
         return "block", reasons
-    if s >= settings.HOLD_THRESHOLD or "velocity_high" in reasons:
+    if s >= settings.HOLD_THRESHOLD or velocity_high:
         return "hold", reasons
     return "allow", reasons
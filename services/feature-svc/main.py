@@ -1,21 +1,24 @@
 """Feature service for real-time feature engineering."""
 
+import asyncio
 import json
 import logging
 import os
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-
-import redis
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Annotated, Dict, Any, Literal, Optional, Union
+
+import msgspec
+import redis.asyncio as redis
+from aiokafka import AIOKafkaConsumer
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from geopy.distance import geodesic
-from kafka import KafkaConsumer, KafkaProducer
-from pydantic import ValidationError
-
-from shared.schemas.events import TransactionEvent, ClaimEvent
-from shared.schemas.features import FeatureVector, Geolocation, FeatureMetadata
+from confluent_kafka import Producer
 
 # Configure logging
 logging.basicConfig(
@@ -27,7 +30,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FraudOps Feature Service",
     description="Service for real-time feature engineering",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -39,10 +43,129 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class TransactionEvent(msgspec.Struct, frozen=True):
+    """Transaction event decoded straight from Kafka bytes.
+
+    Mirrors ``shared.schemas.events.TransactionEvent``; msgspec validates the
+    same constraints without the intermediate dict and Pydantic model build.
+    """
+    
+    event_id: uuid.UUID
+    entity_id: str
+    timestamp: datetime
+    amount: Annotated[float, msgspec.Meta(ge=0)]
+    currency: Annotated[str, msgspec.Meta(pattern=r"^[A-Z]{3}$")]
+    channel: Literal['web', 'mobile', 'atm', 'pos', 'phone', 'api']
+    merchant_id: Optional[str] = None
+    merchant_category: Optional[str] = None
+    ip_address: Optional[str] = None
+    device_fingerprint: Optional[str] = None
+    user_agent: Optional[str] = None
+    session_id: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class ClaimEvent(msgspec.Struct, frozen=True):
+    """Claim event decoded straight from Kafka bytes.
+
+    Mirrors ``shared.schemas.events.ClaimEvent``.
+    """
+    
+    event_id: uuid.UUID
+    entity_id: str
+    timestamp: datetime
+    claim_amount: Annotated[float, msgspec.Meta(ge=0)]
+    claim_type: Literal['auto', 'home', 'health', 'life', 'travel', 'other']
+    policy_id: Optional[str] = None
+    incident_date: Optional[str] = None
+    incident_location: Optional[Dict[str, Any]] = None
+    claim_description: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+EVENT_TYPES = {
+    "events.txns.v1": TransactionEvent,
+    "events.claims.v1": ClaimEvent,
+}
+EVENT_DECODERS = {topic: msgspec.json.Decoder(event_type) for topic, event_type in EVENT_TYPES.items()}
+
+
+class Geolocation(msgspec.Struct):
+    """Geolocation information."""
+    
+    country: Optional[str] = None
+    region: Optional[str] = None
+    city: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+class FeatureMetadata(msgspec.Struct):
+    """Feature computation metadata."""
+    
+    computation_time_ms: Optional[float] = None
+    cache_hit: Optional[bool] = None
+    data_freshness_minutes: Optional[float] = None
+
+
+class FeatureVector(msgspec.Struct, kw_only=True):
+    """Feature vector published to ``features.online.v1``.
+
+    Mirrors ``shared.schemas.features.FeatureVector`` so it encodes straight
+    to the same JSON wire format without an intermediate dict.
+    """
+    
+    event_id: str
+    entity_id: str
+    timestamp: datetime
+    amount: Optional[float] = None
+    currency: Optional[str] = None
+    channel: Optional[str] = None
+    velocity_1h: int = 0
+    velocity_24h: int = 0
+    velocity_7d: int = 0
+    ip_risk: float = 0.0
+    ip_geolocation: Optional[Geolocation] = None
+    geo_distance_km: float = 0.0
+    merchant_risk: float = 0.0
+    merchant_category: Optional[str] = None
+    age_days: int = 0
+    device_fingerprint: Optional[str] = None
+    session_id: Optional[str] = None
+    user_agent_hash: Optional[str] = None
+    features_version: str
+    feature_metadata: Optional[FeatureMetadata] = None
+
+
+feature_encoder = msgspec.json.Encoder()
+
 # Redis client
 redis_client = None
 kafka_consumer = None
 kafka_producer = None
+consumer_task = None
+
+# In-process TTL caches in front of Redis for hot, slowly-changing lookups.
+# Everything runs on the FastAPI event loop, so no locking is needed.
+_ip_risk_cache = TTLCache(maxsize=100_000, ttl=600)
+_merchant_risk_cache = TTLCache(maxsize=100_000, ttl=3600)
+_account_age_cache = TTLCache(maxsize=100_000, ttl=3600)
+_geolocation_cache = TTLCache(maxsize=100_000, ttl=600)
+
+# Velocity window TTLs in seconds
+VELOCITY_WINDOW_TTLS = {"1h": 3600, "24h": 86400, "7d": 604800}
+
+# Creates each counter with its window TTL on first touch, then only INCRs,
+# so steady-state traffic no longer pays an EXPIRE per window per event.
+VELOCITY_INCR_LUA = """
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, 0, 'EX', ARGV[i], 'NX')
+    redis.call('INCR', key)
+end
+return #KEYS
+"""
+velocity_incr_script = None
 
 
 def get_redis_client() -> redis.Redis:
@@ -62,127 +185,181 @@ def get_redis_client() -> redis.Redis:
     return redis_client
 
 
-def get_kafka_consumer() -> KafkaConsumer:
-    """Get or create Kafka consumer."""
+async def get_kafka_consumer() -> AIOKafkaConsumer:
+    """Get or create and start the Kafka consumer."""
     global kafka_consumer
     if kafka_consumer is None:
         bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        kafka_consumer = KafkaConsumer(
+        kafka_consumer = AIOKafkaConsumer(
             "events.txns.v1",
             "events.claims.v1",
-            bootstrap_servers=[bootstrap_servers],
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            bootstrap_servers=bootstrap_servers,
             group_id="feature-svc",
             auto_offset_reset='latest',
             enable_auto_commit=True
         )
+        await kafka_consumer.start()
     return kafka_consumer
 
 
-def get_kafka_producer() -> KafkaProducer:
+def get_kafka_producer() -> Producer:
     """Get or create Kafka producer."""
     global kafka_producer
     if kafka_producer is None:
         bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        kafka_producer = KafkaProducer(
-            bootstrap_servers=[bootstrap_servers],
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-            key_serializer=lambda k: k.encode('utf-8') if k else None,
-            retries=3,
-            acks='all'
-        )
+        kafka_producer = Producer({
+            'bootstrap.servers': bootstrap_servers,
+            'linger.ms': 20,
+            'batch.num.messages': 10000,
+            'compression.type': 'lz4',
+            'acks': '1',
+            'queue.buffering.max.kbytes': 1048576,
+            'retries': 3
+        })
     return kafka_producer
 
 
-def get_ip_risk_score(ip_address: str) -> float:
+@lru_cache(maxsize=65536)
+def encode_key(key: str) -> bytes:
+    """Encode a Kafka message key, memoized since entity ids repeat heavily."""
+    return key.encode('utf-8')
+
+
+def on_delivery(err, msg):
+    """Log failed deliveries reported by librdkafka."""
+    if err is not None:
+        logger.error(f"Failed to deliver message to {msg.topic()}: {err}")
+
+
+def entity_key(prefix: str, entity_id: str, suffix: Optional[str] = None) -> str:
+    """Build a per-entity Redis key.
+
+    The entity id is wrapped in a ``{...}`` hash tag so every key belonging to
+    one entity maps to the same Redis Cluster slot and can be read with MGET or
+    updated in a single pipeline.
+    """
+    key = f"{prefix}:{{{entity_id}}}"
+    return f"{key}:{suffix}" if suffix else key
+
+
+def pack_ip(ip_address: str) -> Union[int, str]:
+    """Pack an IPv4 address into a uint32 cache key.
+
+    Anything that is not a dotted-quad IPv4 address is returned unchanged.
+    """
+    octets = ip_address.split('.')
+    if len(octets) == 4 and all(o.isdecimal() for o in octets):
+        a, b, c, d = map(int, octets)
+        if a <= 255 and b <= 255 and c <= 255 and d <= 255:
+            return (a << 24) | (b << 16) | (c << 8) | d
+    return ip_address
+
+
+async def get_ip_risk_score(ip_address: str) -> float:
     """Get IP risk score from cache or compute default."""
     if not ip_address:
         return 0.0
     
+    ip_key = pack_ip(ip_address)
+    local_value = _ip_risk_cache.get(ip_key)
+    if local_value is not None:
+        return local_value
+    
     redis_client = get_redis_client()
-    cache_key = f"ip_risk:{ip_address}"
+    cache_key = f"ip_risk:{ip_key}"
     
     # Try to get from cache
-    cached_score = redis_client.get(cache_key)
+    cached_score = await redis_client.get(cache_key)
     if cached_score:
-        return float(cached_score)
+        risk_score = float(cached_score)
+        _ip_risk_cache[ip_key] = risk_score
+        return risk_score
     
     # Default risk scoring logic (simplified)
     # In production, this would call an external IP risk service
     risk_score = 0.1  # Default low risk
     
     # Cache the result for 1 hour
-    redis_client.setex(cache_key, 3600, risk_score)
+    await redis_client.setex(cache_key, 3600, risk_score)
+    _ip_risk_cache[ip_key] = risk_score
     return risk_score
 
 
-def get_merchant_risk_score(merchant_id: str) -> float:
+async def get_merchant_risk_score(merchant_id: str) -> float:
     """Get merchant risk score from cache or compute default."""
     if not merchant_id:
         return 0.0
     
+    local_value = _merchant_risk_cache.get(merchant_id)
+    if local_value is not None:
+        return local_value
+    
     redis_client = get_redis_client()
     cache_key = f"merchant_risk:{merchant_id}"
     
     # Try to get from cache
-    cached_score = redis_client.get(cache_key)
+    cached_score = await redis_client.get(cache_key)
     if cached_score:
-        return float(cached_score)
+        risk_score = float(cached_score)
+        _merchant_risk_cache[merchant_id] = risk_score
+        return risk_score
     
     # Default risk scoring logic (simplified)
     risk_score = 0.05  # Default low risk
     
     # Cache the result for 24 hours
-    redis_client.setex(cache_key, 86400, risk_score)
+    await redis_client.setex(cache_key, 86400, risk_score)
+    _merchant_risk_cache[merchant_id] = risk_score
     return risk_score
 
 
-def get_velocity_counts(entity_id: str, time_windows: list) -> Dict[str, int]:
+async def get_velocity_counts(entity_id: str, time_windows: list) -> Dict[str, int]:
     """Get velocity counts for different time windows."""
     redis_client = get_redis_client()
-    velocity_counts = {}
     
-    for window in time_windows:
-        cache_key = f"velocity:{entity_id}:{window}"
-        count = redis_client.get(cache_key)
-        velocity_counts[f"velocity_{window}"] = int(count) if count else 0
+    # All windows share the entity hash tag, so one MGET covers them
+    counts = await redis_client.mget([entity_key("velocity", entity_id, window) for window in time_windows])
     
-    return velocity_counts
+    return {
+        f"velocity_{window}": int(count) if count else 0
+        for window, count in zip(time_windows, counts)
+    }
 
 
-def update_velocity_counts(entity_id: str, time_windows: list):
+async def update_velocity_counts(entity_id: str, time_windows: list):
     """Update velocity counts for different time windows."""
+    global velocity_incr_script
     redis_client = get_redis_client()
-    current_time = datetime.utcnow()
+    if velocity_incr_script is None:
+        velocity_incr_script = redis_client.register_script(VELOCITY_INCR_LUA)
     
-    for window in time_windows:
-        cache_key = f"velocity:{entity_id}:{window}"
-        
-        # Increment counter
-        redis_client.incr(cache_key)
-        
-        # Set expiration based on window
-        if window == "1h":
-            redis_client.expire(cache_key, 3600)
-        elif window == "24h":
-            redis_client.expire(cache_key, 86400)
-        elif window == "7d":
-            redis_client.expire(cache_key, 604800)
+    # Keys are co-located on one slot, so all windows update in one EVAL.
+    # The TTL is only set on first touch; INCR preserves it afterwards.
+    await velocity_incr_script(
+        keys=[entity_key("velocity", entity_id, window) for window in time_windows],
+        args=[VELOCITY_WINDOW_TTLS[window] for window in time_windows]
+    )
 
 
-def get_geolocation(ip_address: str) -> Optional[Geolocation]:
+async def get_geolocation(ip_address: str) -> Optional[Geolocation]:
     """Get geolocation for IP address."""
     if not ip_address:
         return None
     
+    ip_key = pack_ip(ip_address)
+    local_value = _geolocation_cache.get(ip_key)
+    if local_value is not None:
+        return local_value
+    
     redis_client = get_redis_client()
-    cache_key = f"geo:{ip_address}"
+    cache_key = f"geo:{ip_key}"
     
     # Try to get from cache
-    cached_geo = redis_client.get(cache_key)
+    cached_geo = await redis_client.get(cache_key)
     if cached_geo:
-        geo_data = json.loads(cached_geo)
-        return Geolocation(**geo_data)
+        geolocation = Geolocation(**json.loads(cached_geo))
+        _geolocation_cache[ip_key] = geolocation
+        return geolocation
     
     # Default geolocation (simplified)
     # In production, this would call a geolocation service
@@ -195,24 +372,26 @@ def get_geolocation(ip_address: str) -> Optional[Geolocation]:
     }
     
     # Cache the result for 24 hours
-    redis_client.setex(cache_key, 86400, json.dumps(geo_data))
-    return Geolocation(**geo_data)
+    await redis_client.setex(cache_key, 86400, json.dumps(geo_data))
+    geolocation = Geolocation(**geo_data)
+    _geolocation_cache[ip_key] = geolocation
+    return geolocation
 
 
-def calculate_geo_distance(entity_id: str, current_lat: float, current_lon: float) -> float:
+async def calculate_geo_distance(entity_id: str, current_lat: float, current_lon: float) -> float:
     """Calculate distance from usual location."""
     if not current_lat or not current_lon:
         return 0.0
     
     redis_client = get_redis_client()
-    cache_key = f"usual_location:{entity_id}"
+    cache_key = entity_key("usual_location", entity_id)
     
     # Get usual location from cache
-    usual_location = redis_client.get(cache_key)
+    usual_location = await redis_client.get(cache_key)
     if not usual_location:
         # Set default location and return 0 distance
         default_location = {"lat": current_lat, "lon": current_lon}
-        redis_client.setex(cache_key, 86400 * 30, json.dumps(default_location))
+        await redis_client.setex(cache_key, 86400 * 30, json.dumps(default_location))
         return 0.0
     
     usual_data = json.loads(usual_location)
@@ -224,36 +403,53 @@ def calculate_geo_distance(entity_id: str, current_lat: float, current_lon: floa
     return distance
 
 
-def get_account_age(entity_id: str) -> int:
+async def get_account_age(entity_id: str) -> int:
     """Get account age in days."""
+    local_value = _account_age_cache.get(entity_id)
+    if local_value is not None:
+        return local_value
+    
     redis_client = get_redis_client()
-    cache_key = f"account_age:{entity_id}"
+    cache_key = entity_key("account_age", entity_id)
     
     # Try to get from cache
-    cached_age = redis_client.get(cache_key)
+    cached_age = await redis_client.get(cache_key)
     if cached_age:
-        return int(cached_age)
+        age_days = int(cached_age)
+        _account_age_cache[entity_id] = age_days
+        return age_days
     
     # Default age (simplified)
     age_days = 365  # Default 1 year
     
     # Cache the result for 24 hours
-    redis_client.setex(cache_key, 86400, age_days)
+    await redis_client.setex(cache_key, 86400, age_days)
+    _account_age_cache[entity_id] = age_days
     return age_days
 
 
-def process_event(event_data: Dict[str, Any], topic: str):
-    """Process an event and generate features."""
-    start_time = time.time()
+async def process_event(event_data: Union[bytes, Dict[str, Any]], topic: str, timestamp: Optional[datetime] = None):
+    """Process an event and generate features.
+
+    ``event_data`` is either the raw Kafka value or an already-parsed dict.
+    ``timestamp`` lets batch callers share one computation timestamp across
+    events instead of building a new ``datetime`` per event.
+    """
+    start_ns = time.perf_counter_ns()
     
     try:
         # Parse event based on topic
+        if topic != "events.txns.v1":  # anything else is handled as a claim
+            topic = "events.claims.v1"
+        if isinstance(event_data, (bytes, bytearray)):
+            event = EVENT_DECODERS[topic].decode(event_data)
+        else:
+            event = msgspec.convert(event_data, EVENT_TYPES[topic])
+        
         if topic == "events.txns.v1":
-            event = TransactionEvent(**event_data)
             amount = event.amount
             currency = event.currency
         else:  # events.claims.v1
-            event = ClaimEvent(**event_data)
             amount = event.claim_amount
             currency = "USD"  # Default for claims
         
@@ -261,35 +457,35 @@ def process_event(event_data: Dict[str, Any], topic: str):
         
         # Get velocity counts
         time_windows = ["1h", "24h", "7d"]
-        velocity_counts = get_velocity_counts(entity_id, time_windows)
+        velocity_counts = await get_velocity_counts(entity_id, time_windows)
         
         # Update velocity counts
-        update_velocity_counts(entity_id, time_windows)
+        await update_velocity_counts(entity_id, time_windows)
         
         # Get risk scores
-        ip_risk = get_ip_risk_score(getattr(event, 'ip_address', None))
-        merchant_risk = get_merchant_risk_score(getattr(event, 'merchant_id', None))
+        ip_risk = await get_ip_risk_score(getattr(event, 'ip_address', None))
+        merchant_risk = await get_merchant_risk_score(getattr(event, 'merchant_id', None))
         
         # Get geolocation
-        ip_geolocation = get_geolocation(getattr(event, 'ip_address', None))
+        ip_geolocation = await get_geolocation(getattr(event, 'ip_address', None))
         
         # Calculate geo distance
         geo_distance = 0.0
         if ip_geolocation and ip_geolocation.latitude and ip_geolocation.longitude:
-            geo_distance = calculate_geo_distance(
+            geo_distance = await calculate_geo_distance(
                 entity_id, 
                 ip_geolocation.latitude, 
                 ip_geolocation.longitude
             )
         
         # Get account age
-        age_days = get_account_age(entity_id)
+        age_days = await get_account_age(entity_id)
         
         # Create feature vector
         feature_vector = FeatureVector(
-            event_id=event.event_id,
+            event_id=str(event.event_id),
             entity_id=entity_id,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp or datetime.now(timezone.utc),
             amount=amount,
             currency=currency,
             channel=getattr(event, 'channel', None),
@@ -304,26 +500,25 @@ def process_event(event_data: Dict[str, Any], topic: str):
             age_days=age_days,
             device_fingerprint=getattr(event, 'device_fingerprint', None),
             session_id=getattr(event, 'session_id', None),
-            user_agent_hash=hash(getattr(event, 'user_agent', '')) if getattr(event, 'user_agent', None) else None,
+            user_agent_hash=str(hash(event.user_agent)) if getattr(event, 'user_agent', None) else None,
             features_version="v1",
             feature_metadata=FeatureMetadata(
-                computation_time_ms=(time.time() - start_time) * 1000,
+                computation_time_ms=(time.perf_counter_ns() - start_ns) / 1e6,
                 cache_hit=True,  # Simplified
                 data_freshness_minutes=0.0
             )
         )
         
-        # Convert to dict for Kafka
-        feature_dict = feature_vector.dict()
-        feature_dict["timestamp"] = feature_dict["timestamp"].isoformat()
-        
         # Publish to Kafka
         producer = get_kafka_producer()
-        producer.send(
+        producer.produce(
             "features.online.v1",
-            key=entity_id,
-            value=feature_dict
+            key=encode_key(entity_id),
+            value=feature_encoder.encode(feature_vector),
+            on_delivery=on_delivery
         )
+        # Serve delivery callbacks without blocking; librdkafka batches the sends
+        producer.poll(0)
         
         logger.info(f"Features generated for event: {event.event_id}")
         
@@ -334,23 +529,28 @@ def process_event(event_data: Dict[str, Any], topic: str):
 @app.on_event("startup")
 async def startup_event():
     """Initialize service on startup."""
+    global consumer_task
     logger.info("Starting Feature Service")
     # Initialize clients
     get_redis_client()
-    get_kafka_consumer()
     get_kafka_producer()
+    await get_kafka_consumer()
+    # Consume on the same event loop as the HTTP handlers
+    consumer_task = asyncio.create_task(consume_events())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     global kafka_consumer, kafka_producer, redis_client
+    if consumer_task:
+        consumer_task.cancel()
     if kafka_consumer:
-        kafka_consumer.close()
+        await kafka_consumer.stop()
     if kafka_producer:
-        kafka_producer.close()
+        kafka_producer.flush(10)
     if redis_client:
-        redis_client.close()
+        await redis_client.close()
     logger.info("Shutting down Feature Service")
 
 
@@ -364,7 +564,7 @@ async def health_check():
 async def process_event_sync(event_data: Dict[str, Any], topic: str = "events.txns.v1"):
     """Process an event synchronously for testing."""
     try:
-        process_event(event_data, topic)
+        await process_event(event_data, topic)
         return {"status": "success", "message": "Event processed successfully"}
     except Exception as e:
         logger.error(f"Error processing event: {e}")
@@ -374,28 +574,29 @@ async def process_event_sync(event_data: Dict[str, Any], topic: str = "events.tx
         )
 
 
-def consume_events():
+async def consume_events():
     """Consume events from Kafka and process them."""
-    consumer = get_kafka_consumer()
+    consumer = await get_kafka_consumer()
     logger.info("Starting to consume events...")
     
-    for message in consumer:
-        try:
-            topic = message.topic
-            event_data = message.value
-            process_event(event_data, topic)
-        except Exception as e:
-            logger.error(f"Error consuming message: {e}")
+    while True:
+        batches = await consumer.getmany(timeout_ms=100, max_records=500)
+        if not batches:
+            continue
+        
+        # Events in one batch arrive within milliseconds, so share a timestamp
+        batch_timestamp = datetime.now(timezone.utc)
+        for partition, messages in batches.items():
+            for message in messages:
+                try:
+                    await process_event(message.value, message.topic, batch_timestamp)
+                except Exception as e:
+                    logger.error(f"Error consuming message: {e}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    import threading
-    
-    # Start consumer in background thread
-    consumer_thread = threading.Thread(target=consume_events, daemon=True)
-    consumer_thread.start()
     
-    # Start FastAPI server
+    # Start FastAPI server; the Kafka consumer starts with the app
     port = int(os.getenv("FEATURE_SVC_PORT", 8002))
     uvicorn.run(app, host="0.0.0.0", port=port)
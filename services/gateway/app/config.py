@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     CASE_URL: str = "http://case-svc:8000"
     MONITOR_URL: str = "http://model-monitor-svc:8000"
     ANALYTICS_URL: str = "http://analytics-svc:8000"
+    # Shared limiter storage, e.g. redis://redis:6379, so limits hold across workers
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
 
     class Config:
         env_file = ".env"
@@ -2,6 +2,7 @@ import httpx
 from fastapi import FastAPI, Depends, Body, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -9,8 +10,12 @@ from .config import settings
 from .auth import create_token, require_role
 
 # Rate limiting
-limiter = Limiter(key_func=get_remote_address)
-app = FastAPI(title="gateway", version="0.1.0")
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy="moving-window",
+)
+app = FastAPI(title="gateway", version="0.1.0", default_response_class=ORJSONResponse)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -46,10 +51,27 @@ async def forward_json(url: str, payload: dict | None = None, method: str = "POS
         r.raise_for_status()
         return r.json()
 
+def project_fields(data: dict, fields: str) -> dict:
+    """Keep only the comma-separated, dot-delimited paths in `fields`, e.g. "event_id,scores.calibrated" """
+    out = {}
+    for path in fields.split(","):
+        *parents, leaf = path.strip().split(".")
+        src = data
+        for key in parents:
+            src = src.get(key) if isinstance(src, dict) else None
+        if not isinstance(src, dict) or leaf not in src:
+            continue
+        dst = out
+        for key in parents:
+            dst = dst.setdefault(key, {})
+        dst[leaf] = src[leaf]
+    return out
+
 @app.post("/score")
 @limiter.limit("100/minute")
-async def score_proxy(request: Request, payload: dict, _=Depends(require_role(["analyst","supervisor","admin"]))):
-    return await forward_json(f"{settings.SCORE_URL}/score", payload, "POST")
+async def score_proxy(request: Request, payload: dict, fields: str | None = None, _=Depends(require_role(["analyst","supervisor","admin"]))):
+    result = await forward_json(f"{settings.SCORE_URL}/score", payload, "POST")
+    return project_fields(result, fields) if fields else result
 
 @app.post("/decide")
 @limiter.limit("100/minute")
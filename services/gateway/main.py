@@ -1,22 +1,30 @@
 """API Gateway with JWT authentication and RBAC."""
 
+import asyncio
+import hashlib
 import logging
 import os
 import time
-from datetime import datetime, timedelta
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, List
 
 import httpx
-import psycopg2
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from psycopg.conninfo import make_conninfo
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
 from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from starlette.background import BackgroundTask
 
 # Configure logging
 logging.basicConfig(
@@ -28,11 +36,21 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FraudOps API Gateway",
     description="API Gateway with authentication and authorization",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiting, backed by Redis so limits are global across gateway workers
+rate_limit_storage_uri = os.getenv(
+    "RATE_LIMIT_STORAGE_URI",
+    f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}"
+)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=rate_limit_storage_uri,
+    strategy="moving-window",
+    in_memory_fallback_enabled=True
+)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -48,13 +66,23 @@ app.add_middleware(
 
 # Security
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "10")),
+    deprecated="auto"
+)
 
 # Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# Built once; the required claims replace a separate "sub is None" check
+_DECODE_KWARGS = {
+    "algorithms": [ALGORITHM],
+    "options": {"verify_exp": True, "require_exp": True, "require_sub": True},
+}
+
 # Service URLs
 SERVICE_URLS = {
     "ingest": f"http://localhost:{os.getenv('INGEST_SVC_PORT', '8001')}",
@@ -67,8 +95,54 @@ SERVICE_URLS = {
     "summary": f"http://localhost:{os.getenv('SUMMARY_SVC_PORT', '8008')}",
 }
 
-# Global variables
-postgres_conn = None
+# Proxy request settings
+PROXY_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+PROXY_BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+PROXY_BASE_HEADERS = {"Content-Type": "application/json"}
+PROXY_PASSTHROUGH_HEADERS = ("content-encoding",)
+
+# PostgreSQL connection pool, opened on startup
+postgres_pool = AsyncConnectionPool(
+    conninfo=make_conninfo(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=os.getenv("POSTGRES_PORT", "5432"),
+        dbname=os.getenv("POSTGRES_DB", "fraudops"),
+        user=os.getenv("POSTGRES_USER", "fraudops"),
+        password=os.getenv("POSTGRES_PASSWORD", "fraudops_password")
+    ),
+    min_size=4,
+    max_size=20,
+    open=False
+)
+
+# Verified tokens keyed by SHA-256 of the bearer token -> (user, exp timestamp)
+_token_cache = TTLCache(maxsize=10000, ttl=5)
+
+# Hot auth queries, prepared server-side per connection (prepare=True)
+GET_USER_SQL = """
+    SELECT id, username, email, role, is_active
+    FROM users 
+    WHERE username = %s AND is_active = true
+"""
+AUTHENTICATE_USER_SQL = """
+    SELECT id, username, email, role, is_active, password_hash
+    FROM users 
+    WHERE username = %s AND is_active = true
+"""
+
+# Audit rows are buffered and written in batches by a background task
+AUDIT_INSERT_SQL = """
+    INSERT INTO audit_events 
+    (event_id, event_type, entity_id, user_id, action, details)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+AUDIT_BATCH_SIZE = 100
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.5
+audit_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
+audit_rows_dropped = 0
+audit_flusher_task = None
+# Queued at shutdown: the flusher writes the batch it holds and exits
+AUDIT_STOP = None
 
 
 # Pydantic models
@@ -98,24 +172,6 @@ class ServiceRequest(BaseModel):
     data: Optional[Dict[str, Any]] = None
 
 
-def get_postgres_connection():
-    """Get PostgreSQL connection."""
-    global postgres_conn
-    if postgres_conn is None or postgres_conn.closed:
-        try:
-            postgres_conn = psycopg2.connect(
-                host=os.getenv("POSTGRES_HOST", "localhost"),
-                port=os.getenv("POSTGRES_PORT", "5432"),
-                database=os.getenv("POSTGRES_DB", "fraudops"),
-                user=os.getenv("POSTGRES_USER", "fraudops"),
-                password=os.getenv("POSTGRES_PASSWORD", "fraudops_password")
-            )
-        except Exception as e:
-            logger.error(f"Error connecting to PostgreSQL: {e}")
-            return None
-    return postgres_conn
-
-
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
@@ -126,22 +182,13 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def get_user(username: str) -> Optional[User]:
+async def get_user(username: str) -> Optional[User]:
     """Get user by username."""
     try:
-        conn = get_postgres_connection()
-        if conn is None:
-            return None
-        
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, username, email, role, is_active
-            FROM users 
-            WHERE username = %s AND is_active = true
-        """, (username,))
-        
-        result = cursor.fetchone()
-        cursor.close()
+        async with postgres_pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(GET_USER_SQL, (username,), prepare=True)
+                result = await cursor.fetchone()
         
         if result:
             return User(
@@ -158,22 +205,13 @@ def get_user(username: str) -> Optional[User]:
         return None
 
 
-def authenticate_user(username: str, password: str) -> Optional[User]:
+async def authenticate_user(username: str, password: str) -> Optional[User]:
     """Authenticate a user."""
     try:
-        conn = get_postgres_connection()
-        if conn is None:
-            return None
-        
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, username, email, role, is_active, password_hash
-            FROM users 
-            WHERE username = %s AND is_active = true
-        """, (username,))
-        
-        result = cursor.fetchone()
-        cursor.close()
+        async with postgres_pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(AUTHENTICATE_USER_SQL, (username,), prepare=True)
+                result = await cursor.fetchone()
         
         if result and verify_password(password, result[5]):
             return User(
@@ -194,16 +232,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token."""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """Verify JWT token and return user."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -211,65 +249,120 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cache_key = hashlib.sha256(credentials.credentials.encode()).hexdigest()
+    cached = _token_cache.get(cache_key)
+    if cached is not None:
+        user, exp_ts = cached
+        # Still honour the token's own expiry on every request
+        if exp_ts is None or time.time() < exp_ts:
+            return user
+        _token_cache.pop(cache_key, None)
+        raise credentials_exception
+    
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, **_DECODE_KWARGS)
+        username: str = payload["sub"]
     except JWTError:
         raise credentials_exception
     
-    user = get_user(username)
+    user = await get_user(username)
     if user is None:
         raise credentials_exception
     
+    # Only successful validations are cached
+    _token_cache[cache_key] = (user, payload.get("exp"))
+    
     return user
 
 
-def require_role(allowed_roles: List[str]):
-    """Decorator to require specific roles."""
-    def role_checker(current_user: User = Depends(verify_token)):
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions"
-            )
-        return current_user
-    return role_checker
+_SUPERVISOR_OR_ADMIN = frozenset({"supervisor", "admin"})
+
+
+async def require_supervisor_or_admin(current_user: User = Depends(verify_token)) -> User:
+    """Require the supervisor or admin role."""
+    if current_user.role not in _SUPERVISOR_OR_ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions"
+        )
+    return current_user
+
+
+def _build_row(request: Request, user: Optional[User], service: Optional[str]) -> tuple:
+    """Build an audit row from plain values so the queue holds no Request references."""
+    return (
+        # Nanosecond clock plus a random suffix: unique even within one millisecond
+        f"req_{time.time_ns()}_{uuid.uuid4().hex[:8]}",
+        "api_request",
+        None,
+        user.id if user else None,
+        f"{request.method} {request.url.path}",
+        Jsonb({
+            "method": request.method,
+            "path": request.url.path,
+            "query_params": dict(request.query_params),
+            "service": service,
+            "user_agent": request.headers.get("user-agent"),
+            "ip_address": request.client.host if request.client else None
+        })
+    )
 
 
 def log_request(request: Request, user: Optional[User] = None, service: str = None):
-    """Log API request for audit."""
+    """Queue an API request audit row; never awaits, never blocks the request."""
+    global audit_rows_dropped
+    row = _build_row(request, user, service)
     try:
-        conn = get_postgres_connection()
-        if conn is None:
-            return
-        
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO audit_events 
-            (event_id, event_type, entity_id, user_id, action, details)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (
-            f"req_{int(time.time() * 1000)}",
-            "api_request",
-            None,
-            user.id if user else None,
-            f"{request.method} {request.url.path}",
-            {
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "service": service,
-                "user_agent": request.headers.get("user-agent"),
-                "ip_address": request.client.host if request.client else None
-            }
-        ))
-        conn.commit()
-        cursor.close()
-        
+        audit_queue.put_nowait(row)
+    except asyncio.QueueFull:
+        audit_rows_dropped += 1
+        logger.warning(f"Audit queue full, dropped {audit_rows_dropped} rows so far")
+
+
+async def write_audit_rows(rows: List[tuple]):
+    """Insert a batch of audit rows in one transaction."""
+    try:
+        async with postgres_pool.connection() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.executemany(AUDIT_INSERT_SQL, rows)
     except Exception as e:
-        logger.error(f"Error logging request: {e}")
+        logger.error(f"Error writing {len(rows)} audit rows: {e}")
+
+
+async def flush_audit_queue():
+    """Flush audit rows every AUDIT_BATCH_SIZE rows or AUDIT_FLUSH_INTERVAL_SECONDS."""
+    loop = asyncio.get_running_loop()
+    while True:
+        row = await audit_queue.get()
+        if row is AUDIT_STOP:
+            return
+        rows = [row]
+        stopping = False
+        deadline = loop.time() + AUDIT_FLUSH_INTERVAL_SECONDS
+        while len(rows) < AUDIT_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                row = await asyncio.wait_for(audit_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if row is AUDIT_STOP:
+                stopping = True
+                break
+            rows.append(row)
+        await write_audit_rows(rows)
+        if stopping:
+            return
+
+
+async def drain_audit_queue():
+    """Write out rows queued after the flusher stopped."""
+    rows = []
+    while not audit_queue.empty():
+        rows.append(audit_queue.get_nowait())
+    if rows:
+        await write_audit_rows(rows)
 
 
 async def proxy_request(service: str, path: str, method: str, data: Dict[str, Any] = None, user: User = None):
@@ -280,35 +373,58 @@ async def proxy_request(service: str, path: str, method: str, data: Dict[str, An
             detail=f"Service {service} not found"
         )
     
+    method = method.upper()
+    if method not in PROXY_METHODS:
+        raise HTTPException(
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            detail=f"Method {method} not allowed"
+        )
+    
     service_url = SERVICE_URLS[service]
     url = f"{service_url}{path}"
     
+    if user:
+        # Forward user context to backend service
+        headers = {**PROXY_BASE_HEADERS, "X-User-ID": str(user.id), "X-User-Role": user.role}
+    else:
+        headers = PROXY_BASE_HEADERS
+    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            headers = {"Content-Type": "application/json"}
-            if user:
-                # Forward user context to backend service
-                headers["X-User-ID"] = str(user.id)
-                headers["X-User-Role"] = user.role
-            
-            if method.upper() == "GET":
-                response = await client.get(url, headers=headers)
-            elif method.upper() == "POST":
-                response = await client.post(url, json=data, headers=headers)
-            elif method.upper() == "PUT":
-                response = await client.put(url, json=data, headers=headers)
-            elif method.upper() == "PATCH":
-                response = await client.patch(url, json=data, headers=headers)
-            elif method.upper() == "DELETE":
-                response = await client.delete(url, headers=headers)
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
-                    detail=f"Method {method} not allowed"
-                )
-            
-            return response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
-            
+        client = app.state.http
+        upstream_request = client.build_request(
+            method,
+            url,
+            json=data if method in PROXY_BODY_METHODS else None,
+            headers=headers
+        )
+        response = await client.send(upstream_request, stream=True)
+        
+        if response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            # Pass upstream throttling through so clients back off
+            await response.aclose()
+            retry_after = response.headers.get("retry-after")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Service {service} is rate limiting requests",
+                headers={"Retry-After": retry_after} if retry_after else None
+            )
+        
+        # Relay the backend body as-is rather than decoding and re-encoding it
+        passthrough_headers = {
+            name: response.headers[name]
+            for name in PROXY_PASSTHROUGH_HEADERS
+            if name in response.headers
+        }
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers=passthrough_headers,
+            media_type=response.headers.get("content-type", "application/json"),
+            background=BackgroundTask(response.aclose)
+        )
+        
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
@@ -330,30 +446,41 @@ async def proxy_request(service: str, path: str, method: str, data: Dict[str, An
 @app.on_event("startup")
 async def startup_event():
     """Initialize service on startup."""
+    global audit_flusher_task
     logger.info("Starting API Gateway")
-    get_postgres_connection()
+    await postgres_pool.open()
+    # One long-lived client so proxied calls reuse pooled keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+    )
+    audit_flusher_task = asyncio.create_task(flush_audit_queue())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    global postgres_conn
-    if postgres_conn:
-        postgres_conn.close()
+    if audit_flusher_task:
+        # Stop the flusher without cancelling it, so its in-hand batch and any in-flight write finish
+        await audit_queue.put(AUDIT_STOP)
+        await audit_flusher_task
+    await drain_audit_queue()
+    await app.state.http.aclose()
+    await postgres_pool.close()
     logger.info("Shutting down API Gateway")
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "gateway", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "service": "gateway", "timestamp": datetime.now(timezone.utc).isoformat()}
 
 
 @app.post("/auth/login", response_model=Token)
 @limiter.limit("5/minute")
 async def login(request: Request, user_credentials: UserLogin):
     """Authenticate user and return JWT token."""
-    user = authenticate_user(user_credentials.username, user_credentials.password)
+    user = await authenticate_user(user_credentials.username, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -492,7 +619,7 @@ async def update_case_status(
 @limiter.limit("50/minute")
 async def get_policy(
     request: Request,
-    current_user: User = Depends(require_role(["supervisor", "admin"]))
+    current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Get decision policy."""
     log_request(request, current_user, "decision")
@@ -504,7 +631,7 @@ async def get_policy(
 async def get_audit_event(
     request: Request,
     event_id: str,
-    current_user: User = Depends(require_role(["supervisor", "admin"]))
+    current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Get audit event."""
     log_request(request, current_user, "audit")
@@ -515,7 +642,7 @@ async def get_audit_event(
 @limiter.limit("50/minute")
 async def get_metrics(
     request: Request,
-    current_user: User = Depends(require_role(["supervisor", "admin"]))
+    current_user: User = Depends(require_supervisor_or_admin)
 ):
     """Get system metrics."""
     log_request(request, current_user, "model-monitor")
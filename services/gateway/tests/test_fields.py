@@ -0,0 +1,8 @@
+from app.main import project_fields
+
+def test_project_fields_keeps_requested_paths():
+    data = {"event_id": "e1", "scores": {"calibrated": 0.5, "xgb": 0.1}, "explain": {"ip_risk": 0.3}}
+    assert project_fields(data, "event_id,scores.calibrated") == {"event_id": "e1", "scores": {"calibrated": 0.5}}
+
+def test_project_fields_skips_missing_paths():
+    assert project_fields({"event_id": "e1"}, "scores.calibrated,event_id.x") == {}
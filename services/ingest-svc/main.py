@@ -1,6 +1,5 @@
 """Ingest service for transaction and claim events."""
 
-import json
 import logging
 import os
 import uuid
@@ -9,7 +8,8 @@ from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from kafka import KafkaProducer
+from fastapi.responses import ORJSONResponse
+from aiokafka import AIOKafkaProducer
 from pydantic import ValidationError
 
 from shared.schemas.events import TransactionEvent, ClaimEvent
@@ -24,7 +24,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FraudOps Ingest Service",
     description="Service for ingesting transaction and claim events",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -40,18 +41,20 @@ app.add_middleware(
 kafka_producer = None
 
 
-def get_kafka_producer() -> KafkaProducer:
-    """Get or create Kafka producer."""
+async def get_kafka_producer() -> AIOKafkaProducer:
+    """Get or create and start the Kafka producer."""
     global kafka_producer
     if kafka_producer is None:
         bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        kafka_producer = KafkaProducer(
-            bootstrap_servers=[bootstrap_servers],
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
-            key_serializer=lambda k: k.encode('utf-8') if k else None,
-            retries=3,
-            acks='all'
+        # Values and keys are handed over already encoded as bytes
+        kafka_producer = AIOKafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            acks='all',
+            linger_ms=20,
+            compression_type='lz4',
+            max_batch_size=262144
         )
+        await kafka_producer.start()
     return kafka_producer
 
 
@@ -60,7 +63,7 @@ async def startup_event():
     """Initialize service on startup."""
     logger.info("Starting Ingest Service")
     # Initialize Kafka producer
-    get_kafka_producer()
+    await get_kafka_producer()
 
 
 @app.on_event("shutdown")
@@ -68,7 +71,7 @@ async def shutdown_event():
     """Cleanup on shutdown."""
     global kafka_producer
     if kafka_producer:
-        kafka_producer.close()
+        await kafka_producer.stop()
     logger.info("Shutting down Ingest Service")
 
 
@@ -89,23 +92,23 @@ async def ingest_transaction(event_data: Dict[str, Any]):
         # Validate the event
         transaction_event = TransactionEvent(**event_data)
         
-        # Convert to dict for Kafka
-        event_dict = transaction_event.dict()
-        event_dict["timestamp"] = event_dict["timestamp"].isoformat()
+        # Serialize once, straight to JSON bytes for Kafka
+        payload = transaction_event.model_dump_json().encode('utf-8')
+        event_id = str(transaction_event.event_id)
         
         # Produce to Kafka
-        producer = get_kafka_producer()
-        producer.send(
+        producer = await get_kafka_producer()
+        await producer.send_and_wait(
             "events.txns.v1",
-            key=event_dict["entity_id"],
-            value=event_dict
+            key=transaction_event.entity_id.encode('utf-8'),
+            value=payload
         )
         
-        logger.info(f"Transaction event ingested: {event_dict['event_id']}")
+        logger.info(f"Transaction event ingested: {event_id}")
         
         return {
             "status": "success",
-            "event_id": event_dict["event_id"],
+            "event_id": event_id,
             "message": "Transaction event ingested successfully"
         }
         
@@ -134,23 +137,23 @@ async def ingest_claim(event_data: Dict[str, Any]):
         # Validate the event
         claim_event = ClaimEvent(**event_data)
         
-        # Convert to dict for Kafka
-        event_dict = claim_event.dict()
-        event_dict["timestamp"] = event_dict["timestamp"].isoformat()
+        # Serialize once, straight to JSON bytes for Kafka
+        payload = claim_event.model_dump_json().encode('utf-8')
+        event_id = str(claim_event.event_id)
         
         # Produce to Kafka
-        producer = get_kafka_producer()
-        producer.send(
+        producer = await get_kafka_producer()
+        await producer.send_and_wait(
             "events.claims.v1",
-            key=event_dict["entity_id"],
-            value=event_dict
+            key=claim_event.entity_id.encode('utf-8'),
+            value=payload
         )
         
-        logger.info(f"Claim event ingested: {event_dict['event_id']}")
+        logger.info(f"Claim event ingested: {event_id}")
         
         return {
             "status": "success",
-            "event_id": event_dict["event_id"],
+            "event_id": event_id,
             "message": "Claim event ingested successfully"
         }
         
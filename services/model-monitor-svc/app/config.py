@@ -8,6 +8,9 @@ class Settings(BaseSettings):
     # MLflow configuration
     MLFLOW_TRACKING_URI: Optional[str] = None
     MLFLOW_EXPERIMENT_NAME: str = "fraud-detection"
+    # Tracking HTTP calls run inside request handlers; mlflow's default is a 120s timeout
+    MLFLOW_HTTP_REQUEST_TIMEOUT: int = 10
+    MLFLOW_HTTP_REQUEST_MAX_RETRIES: int = 2
     
     # Weights & Biases configuration
     WANDB_PROJECT: Optional[str] = None
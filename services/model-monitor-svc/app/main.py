@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi.responses import Response
+from fastapi.responses import ORJSONResponse, Response
 from .store import SCORES, FEATURES, push_feature
+from .metrics import psi_from_counts, brier_score
 from .mlflow_client import mlflow_client
 from .config import settings
 import time
+import numpy as np
 
-app = FastAPI(title="model-monitor-svc", version="0.1.0")
+app = FastAPI(title="model-monitor-svc", version="0.1.0", default_response_class=ORJSONResponse)
 
 REQS = Counter("monitor_requests_total", "Requests total", ["route"])
 LAT = Histogram("monitor_latency_seconds", "Latency", ["route"])
@@ -42,27 +44,24 @@ def ingest_score(payload: dict):
 
 @app.get("/metrics")
 def prom_metrics():
-    # compute PSI for tracked features using first half as ref, last half as cur
-    for name, dq in FEATURES.items():
-        data = list(dq)
-        if len(data) >= 200:
-            mid = len(data)//2
-            from .metrics import psi, brier_score
-            psi_val = psi(data[:mid], data[mid:])
+    # compute PSI for tracked features using first half as ref, last half as cur;
+    # the per-half histograms are maintained incrementally on ingest
+    for name, stream in FEATURES.items():
+        if len(stream) >= 200:
+            psi_val = psi_from_counts(stream.ref, stream.cur)
             PSI_G.labels(name).set(psi_val)
             
             # Log drift alerts
             if psi_val > settings.PSI_THRESHOLD:
                 ALERT_G.labels("drift").inc()
                 if settings.MLFLOW_TRACKING_URI:
-                    mlflow_client.log_drift_metrics(name, psi_val, 0.0, len(data))
+                    mlflow_client.log_drift_metrics(name, psi_val, 0.0, len(stream))
     
     # Compute Brier score if we have labels
     if len(SCORES) >= 100:
         # Mock labels for demo (in production, get from ground truth)
-        mock_labels = [1 if s > 0.5 else 0 for s in list(SCORES)[-100:]]
-        mock_scores = list(SCORES)[-100:]
-        from .metrics import brier_score
+        mock_scores = SCORES.snapshot(100)
+        mock_labels = (mock_scores > 0.5).astype(np.int8)
         brier_val = brier_score(mock_labels, mock_scores)
         BRIER_G.set(brier_val)
         
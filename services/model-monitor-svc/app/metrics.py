@@ -1,19 +1,22 @@
-from math import sqrt
-from .store import SCORES, FEATURES
+import numpy as np
 
-def brier_score(y_true: list[int], y_prob: list[float]) -> float:
-    if not y_true or not y_prob or len(y_true) != len(y_prob): return -1.0
-    return sum((p - y)**2 for y,p in zip(y_true,y_prob)) / len(y_true)
+def brier_score(y_true, y_prob) -> float:
+    y, p = np.asarray(y_true, dtype=np.float64), np.asarray(y_prob, dtype=np.float64)
+    if len(y) == 0 or len(y) != len(p): return -1.0
+    d = p - y
+    return float(d @ d) / len(d)
 
-def psi(ref: list[float], cur: list[float], bins: int = 10) -> float:
+def psi_from_counts(ref_counts, cur_counts) -> float:
+    ref_n, cur_n = ref_counts.sum(), cur_counts.sum()
+    if ref_n == 0 or cur_n == 0: return 0.0
+    rp = np.maximum(ref_counts / ref_n, 1e-6)
+    cp = np.maximum(cur_counts / cur_n, 1e-6)
+    return float(((rp - cp) * np.log(rp / cp)).sum())
+
+def psi(ref, cur, bins: int = 10) -> float:
     if len(ref) < bins or len(cur) < bins: return 0.0
-    mn, mx = min(min(ref), min(cur)), max(max(ref), max(cur))
+    r, c = np.asarray(ref, dtype=np.float64), np.asarray(cur, dtype=np.float64)
+    mn, mx = min(r.min(), c.min()), max(r.max(), c.max())
     if mx == mn: return 0.0
-    w = (mx - mn)/bins
-    s = 0.0
-    for i in range(bins):
-        lo, hi = mn + i*w, mn + (i+1)*w
-        rp = max(1e-6, sum(1 for v in ref if lo <= v < hi)/len(ref))
-        cp = max(1e-6, sum(1 for v in cur if lo <= v < hi)/len(cur))
-        s += (rp - cp) * (0.0 if cp==0 else __import__("math").log(rp/cp))
-    return s
+    # uniform bins over a fixed range take numpy's O(n) fast path instead of a searchsorted per value
+    return psi_from_counts(np.histogram(r, bins, (mn, mx))[0], np.histogram(c, bins, (mn, mx))[0])
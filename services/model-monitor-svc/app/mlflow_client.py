@@ -3,15 +3,28 @@ MLflow integration for model tracking and monitoring
 """
 import mlflow
 import mlflow.sklearn
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
 from typing import Dict, Any, Optional
-from datetime import datetime
 import json
+import os
+import time
 from .config import settings
 
+def _iso_local(ts_ns: int) -> str:
+    """Local-time ISO-8601 string for a time.time_ns() value"""
+    sec, ns = divmod(ts_ns, 1_000_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(sec))}.{ns // 1000:06d}"
+
 class MLflowClient:
     def __init__(self):
+        # mlflow keeps one pooled keep-alive requests session per retry policy, so
+        # fixing the policy here means every tracking call reuses the same connections
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_TIMEOUT", str(settings.MLFLOW_HTTP_REQUEST_TIMEOUT))
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", str(settings.MLFLOW_HTTP_REQUEST_MAX_RETRIES))
         if settings.MLFLOW_TRACKING_URI:
             mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
+        self._client = None
         
         # Set experiment
         try:
@@ -22,6 +35,13 @@ class MLflowClient:
         except Exception as e:
             print(f"Warning: Could not set up MLflow experiment: {e}")
 
+    @property
+    def client(self) -> MlflowClient:
+        """Tracking client, created on first use so it targets the configured URI"""
+        if self._client is None:
+            self._client = MlflowClient()
+        return self._client
+
     def log_model_metrics(self, 
                          model_name: str,
                          metrics: Dict[str, float],
@@ -29,23 +49,19 @@ class MLflowClient:
                          tags: Dict[str, str] = None):
         """Log model performance metrics to MLflow"""
         try:
-            with mlflow.start_run(run_name=f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
-                # Log metrics
-                for metric_name, value in metrics.items():
-                    mlflow.log_metric(metric_name, value)
-                
-                # Log parameters
-                if parameters:
-                    for param_name, value in parameters.items():
-                        mlflow.log_param(param_name, value)
-                
-                # Log tags
-                if tags:
-                    mlflow.set_tags(tags)
-                
-                # Log metadata
-                mlflow.log_param("timestamp", datetime.now().isoformat())
-                mlflow.log_param("model_name", model_name)
+            # One clock read per call: run name, timestamp param and metric timestamps share it
+            ts_ns = time.time_ns()
+            ts = ts_ns // 1_000_000
+            with mlflow.start_run(run_name=f"{model_name}_{ts_ns}") as run:
+                # One log_batch request instead of a round trip per metric/param/tag
+                params = [Param(k, str(v)) for k, v in (parameters or {}).items()]
+                params += [Param("timestamp", _iso_local(ts_ns)), Param("model_name", model_name)]
+                self.client.log_batch(
+                    run.info.run_id,
+                    metrics=[Metric(k, v, ts, 0) for k, v in metrics.items()],
+                    params=params,
+                    tags=[RunTag(k, v) for k, v in (tags or {}).items()]
+                )
                 
         except Exception as e:
             print(f"Warning: Could not log to MLflow: {e}")
@@ -57,18 +73,27 @@ class MLflowClient:
                          sample_size: int):
         """Log drift detection metrics"""
         try:
-            with mlflow.start_run(run_name=f"drift_{feature_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
-                mlflow.log_metric(f"psi_{feature_name}", psi_value)
-                mlflow.log_metric("brier_score", brier_score)
-                mlflow.log_metric("sample_size", sample_size)
-                mlflow.log_param("feature_name", feature_name)
-                mlflow.log_param("timestamp", datetime.now().isoformat())
+            ts_ns = time.time_ns()
+            ts = ts_ns // 1_000_000
+            with mlflow.start_run(run_name=f"drift_{feature_name}_{ts_ns}") as run:
+                tags = []
                 
                 # Alert if thresholds exceeded
                 if psi_value > settings.PSI_THRESHOLD:
-                    mlflow.set_tag("drift_alert", "high_psi")
+                    tags.append(RunTag("drift_alert", "high_psi"))
                 if brier_score > settings.BRIER_THRESHOLD:
-                    mlflow.set_tag("calibration_alert", "high_brier")
+                    tags.append(RunTag("calibration_alert", "high_brier"))
+                
+                self.client.log_batch(
+                    run.info.run_id,
+                    metrics=[
+                        Metric(f"psi_{feature_name}", psi_value, ts, 0),
+                        Metric("brier_score", brier_score, ts, 0),
+                        Metric("sample_size", sample_size, ts, 0)
+                    ],
+                    params=[Param("feature_name", feature_name), Param("timestamp", _iso_local(ts_ns))],
+                    tags=tags
+                )
                     
         except Exception as e:
             print(f"Warning: Could not log drift metrics to MLflow: {e}")
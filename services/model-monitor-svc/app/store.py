@@ -1,12 +1,134 @@
-from collections import deque
-from statistics import mean
-from typing import Deque
+import numpy as np
+
+
+class RingBuffer:
+    """Fixed-capacity ring buffer over a preallocated NumPy array."""
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        self._buf = np.empty(capacity, dtype=dtype)
+        self._idx = 0
+        self._n = 0
+
+    def append(self, value) -> None:
+        self._buf[self._idx] = value
+        self._idx = (self._idx + 1) % len(self._buf)
+        self._n = min(self._n + 1, len(self._buf))
+
+    def extend(self, values) -> None:
+        """Append an array of values with at most two slice copies."""
+        values = np.asarray(values, dtype=self._buf.dtype)
+        cap = len(self._buf)
+        if len(values) >= cap:
+            self._buf[:] = values[-cap:]
+            self._idx, self._n = 0, cap
+            return
+        end = self._idx + len(values)
+        if end <= cap:
+            self._buf[self._idx : end] = values
+        else:
+            split = cap - self._idx
+            self._buf[self._idx :] = values[:split]
+            self._buf[: end - cap] = values[split:]
+        self._idx = end % cap
+        self._n = min(self._n + len(values), cap)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def clear(self) -> None:
+        self._idx = 0
+        self._n = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def at(self, i: int):
+        """Value at chronological position ``i`` (0 is the oldest)."""
+        return self._buf[(self._idx - self._n + i) % len(self._buf)]
+
+    def snapshot(self, n: int | None = None) -> np.ndarray:
+        """Last ``n`` values (all by default) in insertion order.
+
+        Returns a zero-copy view unless the requested window wraps around.
+        """
+        n = self._n if n is None else min(n, self._n)
+        start = self._idx - n
+        if start >= 0:
+            return self._buf[start : self._idx]
+        return np.concatenate((self._buf[start:], self._buf[: self._idx]))
+
+
+class FeatureStream:
+    """Ring buffer of one feature plus histograms of its two halves.
+
+    ``ref`` counts the older half of the buffer and ``cur`` the newer half.
+    Both are updated in O(1) per push by moving the values that cross the
+    midpoint or fall off the end, so PSI costs O(bins) per scrape. Bin edges
+    span the observed range and are rebuilt from the buffer only when a value
+    falls outside it.
+    """
+
+    def __init__(self, capacity: int = 10000, bins: int = 10):
+        self.values = RingBuffer(capacity)
+        self.bins = bins
+        self.ref = np.zeros(bins, dtype=np.int64)
+        self.cur = np.zeros(bins, dtype=np.int64)
+        self.mn = self.mx = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _bin(self, v: float) -> int:
+        if self.mx == self.mn:
+            return 0
+        return min(self.bins - 1, int((v - self.mn) * self.bins / (self.mx - self.mn)))
+
+    def _rebuild(self) -> None:
+        data = self.values.snapshot().astype(np.float64)
+        self.mn, self.mx = float(data.min()), float(data.max())
+        if self.mx == self.mn:
+            idx = np.zeros(len(data), dtype=np.int64)
+        else:
+            # Same arithmetic as _bin so incremental updates stay consistent
+            idx = np.minimum(self.bins - 1, ((data - self.mn) * self.bins / (self.mx - self.mn)).astype(np.int64))
+        mid = len(data) // 2
+        self.ref = np.bincount(idx[:mid], minlength=self.bins)
+        self.cur = np.bincount(idx[mid:], minlength=self.bins)
+
+    def push(self, value: float) -> None:
+        buf = self.values
+        n = len(buf)
+        full = n == buf.capacity
+        evicted = float(buf.at(0)) if full else None
+        buf.append(value)
+        v = float(buf.at(len(buf) - 1))  # as stored (float32)
+
+        if self.mn is None or not (self.mn <= v <= self.mx):
+            self._rebuild()
+            return
+
+        self.cur[self._bin(v)] += 1
+        if full:
+            # oldest value leaves ref; the value now just below the midpoint moves cur -> ref
+            self.ref[self._bin(evicted)] -= 1
+            moved = float(buf.at(n // 2 - 1))
+        elif (n + 1) // 2 > n // 2:
+            moved = float(buf.at(n // 2))
+        else:
+            return
+        b = self._bin(moved)
+        self.cur[b] -= 1
+        self.ref[b] += 1
+
 
 # In-memory ring buffers (swap to DB later)
-SCORES: Deque[float] = deque(maxlen=10000)
-LABELS: Deque[int] = deque(maxlen=10000)  # optional ground-truth later
-FEATURES: dict[str, Deque[float]] = {}    # per-feature stream for PSI
+SCORES = RingBuffer(10000)
+LABELS = RingBuffer(10000, dtype=np.int8)  # optional ground-truth later
+FEATURES: dict[str, FeatureStream] = {}  # per-feature stream for PSI
+
+
 def push_feature(name: str, value: float):
     if name not in FEATURES:
-        FEATURES[name] = deque(maxlen=10000)
-    FEATURES[name].append(float(value))
+        FEATURES[name] = FeatureStream(10000)
+    FEATURES[name].push(value)
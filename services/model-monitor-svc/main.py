@@ -1,22 +1,27 @@
 """Model monitoring service for drift detection and performance monitoring."""
 
-import json
+import asyncio
 import logging
 import os
+import threading
 import time
 from collections import defaultdict, deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 
 import numpy as np
+import orjson
 import pandas as pd
-import psycopg2
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from kafka import KafkaConsumer
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
-from sklearn.metrics import brier_score_loss
-from scipy import stats
+
+from app.store import RingBuffer
 
 # Configure logging
 logging.basicConfig(
@@ -28,7 +33,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FraudOps Model Monitor Service",
     description="Service for model monitoring and drift detection",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -47,22 +53,55 @@ model_score_histogram = Histogram('fraud_model_scores', 'Model scores distributi
 drift_psi_gauge = Gauge('fraud_feature_drift_psi', 'Feature drift PSI values', ['feature_name'])
 calibration_brier_gauge = Gauge('fraud_model_calibration_brier', 'Model calibration Brier score', ['model_name'])
 throughput_gauge = Gauge('fraud_throughput_per_second', 'Decisions per second')
+score_histograms: Dict[str, Any] = {}  # model_name -> labelled model_score_histogram child
 
 # Global variables
-postgres_conn = None
+postgres_pool = None
 kafka_consumer = None
-recent_scores = defaultdict(lambda: deque(maxlen=1000))
-recent_features = defaultdict(lambda: deque(maxlen=1000))
-reference_features = {}
-throughput_window = deque(maxlen=60)  # 60 seconds window
-
-
-def get_postgres_connection():
-    """Get PostgreSQL connection."""
-    global postgres_conn
-    if postgres_conn is None or postgres_conn.closed:
+# Preallocated float32 ring buffers; snapshot() hands NumPy arrays straight to PSI/Brier
+recent_scores = defaultdict(lambda: RingBuffer(1000))
+recent_features = defaultdict(lambda: RingBuffer(1000))
+reference_features: Dict[str, RingBuffer] = {}
+reference_seen: Dict[str, int] = defaultdict(int)  # values ever pushed per reference window
+reference_histograms: Dict[str, tuple] = {}  # (breakpoints, expected_prob, reference_seen at build)
+REFERENCE_REFRESH_SAMPLES = 1000
+KEY_FEATURES = ('amount', 'velocity_1h', 'velocity_24h', 'ip_risk', 'geo_distance_km', 'merchant_risk')
+throughput_window = deque(maxlen=60)  # (timestamp, message count) of recent score batches
+
+# Metric and drift rows are buffered and written with execute_values once
+# METRIC_BUFFER_MAX rows are pending or METRIC_BUFFER_MAX_AGE_SECONDS have passed since the last flush
+METRIC_INSERT_SQL = "INSERT INTO model_metrics (model_name, metric_type, metric_value, metadata) VALUES %s"
+DRIFT_INSERT_SQL = """
+    INSERT INTO feature_drift 
+    (feature_name, psi_value, reference_period_start, reference_period_end, 
+     current_period_start, current_period_end)
+    VALUES %s
+"""
+METRIC_BUFFER_MAX = 200
+METRIC_BUFFER_MAX_AGE_SECONDS = 2.0
+metric_buffer: List[tuple] = []
+drift_buffer: List[tuple] = []
+metric_buffer_lock = threading.Lock()
+last_metric_flush = time.time()
+
+# Background Kafka consumer thread (started in __main__) and its stop signal
+consumer_thread: Optional[threading.Thread] = None
+consumer_stop = threading.Event()
+
+
+def orjson_dumps(obj) -> str:
+    """JSON encoder for psycopg2's Json adapter."""
+    return orjson.dumps(obj).decode()
+
+
+def get_postgres_pool() -> Optional[ThreadedConnectionPool]:
+    """Get or create the PostgreSQL connection pool."""
+    global postgres_pool
+    if postgres_pool is None or postgres_pool.closed:
         try:
-            postgres_conn = psycopg2.connect(
+            postgres_pool = ThreadedConnectionPool(
+                1,
+                int(os.getenv("POSTGRES_POOL_MAX_SIZE", "8")),
                 host=os.getenv("POSTGRES_HOST", "localhost"),
                 port=os.getenv("POSTGRES_PORT", "5432"),
                 database=os.getenv("POSTGRES_DB", "fraudops"),
@@ -72,7 +111,28 @@ def get_postgres_connection():
         except Exception as e:
             logger.error(f"Error connecting to PostgreSQL: {e}")
             return None
-    return postgres_conn
+    return postgres_pool
+
+
+@contextmanager
+def pg():
+    """Borrow a pooled PostgreSQL connection; yields None if the database is unavailable."""
+    pool = get_postgres_pool()
+    if pool is None:
+        yield None
+        return
+    
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        # End any open transaction (reads included) before the connection is reused
+        if not conn.closed:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        pool.putconn(conn, close=bool(conn.closed))
 
 
 def get_kafka_consumer() -> KafkaConsumer:
@@ -84,38 +144,46 @@ def get_kafka_consumer() -> KafkaConsumer:
             "alerts.scores.v1",
             "alerts.decisions.v1",
             bootstrap_servers=[bootstrap_servers],
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            value_deserializer=orjson.loads,
             group_id="model-monitor-svc",
             auto_offset_reset='latest',
-            enable_auto_commit=True
+            # Offsets are committed by consume_messages after each processed batch
+            enable_auto_commit=False,
+            # Batch fetches: the broker waits for fetch_min_bytes or fetch_max_wait_ms,
+            # so on a quiet topic messages can sit up to fetch_max_wait_ms before delivery
+            fetch_min_bytes=int(os.getenv("KAFKA_FETCH_MIN_BYTES", "64000")),
+            fetch_max_wait_ms=int(os.getenv("KAFKA_FETCH_MAX_WAIT_MS", "200")),
+            max_poll_records=int(os.getenv("KAFKA_MAX_POLL_RECORDS", "2000")),
+            max_partition_fetch_bytes=4_000_000,
+            receive_buffer_bytes=2_000_000
         )
     return kafka_consumer
 
 
+def reference_histogram(expected: np.ndarray, bins: int = 10) -> tuple:
+    """Quantile breakpoints of the expected distribution and its (clamped) bin probabilities."""
+    # Interior quantile edges; the outer bins are open-ended
+    breakpoints = np.quantile(expected, np.linspace(0, 1, bins + 1))[1:-1]
+    expected_prob = np.bincount(np.searchsorted(breakpoints, expected, side='right'), minlength=bins) / expected.size
+    np.maximum(expected_prob, 1e-6, out=expected_prob)
+    return breakpoints, expected_prob
+
+
+def psi_against_reference(breakpoints: np.ndarray, expected_prob: np.ndarray, actual: np.ndarray) -> float:
+    """PSI of actual against a precomputed reference histogram."""
+    try:
+        actual_prob = np.bincount(np.searchsorted(breakpoints, actual, side='right'), minlength=expected_prob.size) / actual.size
+        np.maximum(actual_prob, 1e-6, out=actual_prob)
+        return float(((actual_prob - expected_prob) * np.log(actual_prob / expected_prob)).sum())
+    except Exception as e:
+        logger.error(f"Error calculating PSI: {e}")
+        return 0.0
+
+
 def calculate_psi(expected: np.ndarray, actual: np.ndarray, bins: int = 10) -> float:
     """Calculate Population Stability Index (PSI)."""
     try:
-        # Create bins based on expected distribution
-        breakpoints = np.percentile(expected, np.linspace(0, 100, bins + 1))
-        breakpoints[0] = -np.inf
-        breakpoints[-1] = np.inf
-        
-        # Calculate expected and actual distributions
-        expected_hist, _ = np.histogram(expected, bins=breakpoints)
-        actual_hist, _ = np.histogram(actual, bins=breakpoints)
-        
-        # Normalize to probabilities
-        expected_prob = expected_hist / len(expected)
-        actual_prob = actual_hist / len(actual)
-        
-        # Avoid division by zero
-        expected_prob = np.where(expected_prob == 0, 1e-6, expected_prob)
-        actual_prob = np.where(actual_prob == 0, 1e-6, actual_prob)
-        
-        # Calculate PSI
-        psi = np.sum((actual_prob - expected_prob) * np.log(actual_prob / expected_prob))
-        
-        return float(psi)
+        return psi_against_reference(*reference_histogram(expected, bins), actual)
     except Exception as e:
         logger.error(f"Error calculating PSI: {e}")
         return 0.0
@@ -124,24 +192,33 @@ def calculate_psi(expected: np.ndarray, actual: np.ndarray, bins: int = 10) -> f
 def calculate_brier_score(y_true: np.ndarray, y_prob: np.ndarray) -> float:
     """Calculate Brier score for calibration."""
     try:
-        return float(brier_score_loss(y_true, y_prob))
+        diff = y_prob - y_true
+        return float(np.dot(diff, diff) / diff.size)
     except Exception as e:
         logger.error(f"Error calculating Brier score: {e}")
         return 0.0
 
 
-def update_reference_features(features: Dict[str, Any]):
-    """Update reference feature distributions."""
-    global reference_features
-    
-    for feature_name, value in features.items():
-        if isinstance(value, (int, float)) and not np.isnan(value):
-            if feature_name not in reference_features:
-                reference_features[feature_name] = deque(maxlen=10000)
-            reference_features[feature_name].append(value)
+def update_reference_features(feature_name: str, values: np.ndarray):
+    """Update the reference distribution of a feature."""
+    if feature_name not in reference_features:
+        reference_features[feature_name] = RingBuffer(10000)
+    reference_features[feature_name].extend(values)
+    reference_seen[feature_name] += len(values)
+
 
+def get_reference_histogram(feature_name: str) -> tuple:
+    """Cached reference histogram, rebuilt once the reference window has turned over by ~10%."""
+    reference = reference_features[feature_name]
+    seen = reference_seen[feature_name]
+    cached = reference_histograms.get(feature_name)
+    if cached is None or seen - cached[2] >= min(REFERENCE_REFRESH_SAMPLES, len(reference) // 10):
+        breakpoints, expected_prob = reference_histogram(reference.snapshot())
+        cached = reference_histograms[feature_name] = (breakpoints, expected_prob, seen)
+    return cached[0], cached[1]
 
-def detect_feature_drift(feature_name: str, current_values: List[float]) -> float:
+
+def detect_feature_drift(feature_name: str, current_values: np.ndarray) -> float:
     """Detect feature drift using PSI."""
     if feature_name not in reference_features or len(reference_features[feature_name]) < 100:
         return 0.0
@@ -150,11 +227,8 @@ def detect_feature_drift(feature_name: str, current_values: List[float]) -> floa
         return 0.0
     
     try:
-        expected = np.array(list(reference_features[feature_name]))
-        actual = np.array(current_values)
-        
-        psi = calculate_psi(expected, actual)
-        return psi
+        breakpoints, expected_prob = get_reference_histogram(feature_name)
+        return psi_against_reference(breakpoints, expected_prob, current_values)
     except Exception as e:
         logger.error(f"Error detecting drift for {feature_name}: {e}")
         return 0.0
@@ -162,42 +236,26 @@ def detect_feature_drift(feature_name: str, current_values: List[float]) -> floa
 
 def store_metric(metric_type: str, metric_value: float, metadata: Dict[str, Any] = None):
     """Store metric in PostgreSQL."""
-    try:
-        conn = get_postgres_connection()
-        if conn is None:
-            return
-        
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO model_metrics (model_name, metric_type, metric_value, metadata)
-            VALUES (%s, %s, %s, %s)
-        """, (
-            metadata.get('model_name', 'ensemble') if metadata else 'ensemble',
-            metric_type,
-            metric_value,
-            json.dumps(metadata) if metadata else None
-        ))
-        conn.commit()
-        cursor.close()
-        
-    except Exception as e:
-        logger.error(f"Error storing metric: {e}")
+    store_metrics([(
+        metadata.get('model_name', 'ensemble') if metadata else 'ensemble',
+        metric_type,
+        metric_value,
+        Json(metadata, dumps=orjson_dumps) if metadata else None
+    )])
+
+
+def store_metrics(rows: List[tuple]):
+    """Buffer (model_name, metric_type, metric_value, Json metadata) rows for insertion."""
+    if rows:
+        with metric_buffer_lock:
+            metric_buffer.extend(rows)
+        flush_metric_buffers_if_due()
 
 
 def store_feature_drift(feature_name: str, psi_value: float, reference_period: tuple, current_period: tuple):
-    """Store feature drift information."""
-    try:
-        conn = get_postgres_connection()
-        if conn is None:
-            return
-        
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO feature_drift 
-            (feature_name, psi_value, reference_period_start, reference_period_end, 
-             current_period_start, current_period_end)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (
+    """Buffer feature drift information for insertion."""
+    with metric_buffer_lock:
+        drift_buffer.append((
             feature_name,
             psi_value,
             reference_period[0],
@@ -205,113 +263,176 @@ def store_feature_drift(feature_name: str, psi_value: float, reference_period: t
             current_period[0],
             current_period[1]
         ))
-        conn.commit()
-        cursor.close()
-        
-    except Exception as e:
-        logger.error(f"Error storing feature drift: {e}")
+    flush_metric_buffers_if_due()
 
 
-def process_score_message(score_data: Dict[str, Any]):
-    """Process score message for monitoring."""
+def flush_metric_buffers_if_due():
+    """Flush buffered rows once the buffer is full or old enough."""
+    with metric_buffer_lock:
+        due = (
+            len(metric_buffer) + len(drift_buffer) >= METRIC_BUFFER_MAX
+            or time.time() - last_metric_flush >= METRIC_BUFFER_MAX_AGE_SECONDS
+        )
+    if due:
+        flush_metric_buffers()
+
+
+def flush_metric_buffers():
+    """Write all buffered metric and drift rows in one transaction."""
+    global last_metric_flush
+    with metric_buffer_lock:
+        metric_rows, drift_rows = metric_buffer[:], drift_buffer[:]
+        metric_buffer.clear()
+        drift_buffer.clear()
+        last_metric_flush = time.time()
+    
+    if not metric_rows and not drift_rows:
+        return
+    
     try:
-        scores = score_data.get('scores', {})
-        computation_time = score_data.get('computation_time_ms', 0)
-        
-        # Update Prometheus metrics
-        for model_name, score in scores.items():
-            if isinstance(score, (int, float)):
-                model_score_histogram.labels(model_name=model_name).observe(score)
-                recent_scores[model_name].append(score)
-        
-        # Store latency metric
-        if computation_time > 0:
-            decision_latency.observe(computation_time / 1000.0)  # Convert to seconds
-        
-        # Store metrics in database
-        store_metric('latency_ms', computation_time, {
-            'model_name': 'ensemble',
-            'event_id': score_data.get('event_id')
-        })
-        
-        # Update throughput
-        current_time = time.time()
-        throughput_window.append(current_time)
-        
-        # Calculate throughput (decisions per second)
-        if len(throughput_window) > 1:
-            time_span = throughput_window[-1] - throughput_window[0]
-            if time_span > 0:
-                throughput = len(throughput_window) / time_span
-                throughput_gauge.set(throughput)
+        with pg() as conn:
+            if conn is None:
+                return
+            
+            cursor = conn.cursor()
+            if metric_rows:
+                execute_values(cursor, METRIC_INSERT_SQL, metric_rows, page_size=METRIC_BUFFER_MAX)
+            if drift_rows:
+                execute_values(cursor, DRIFT_INSERT_SQL, drift_rows, page_size=METRIC_BUFFER_MAX)
+            conn.commit()
+            cursor.close()
         
     except Exception as e:
-        logger.error(f"Error processing score message: {e}")
+        logger.error(f"Error flushing {len(metric_rows) + len(drift_rows)} metric rows: {e}")
 
 
-def process_decision_message(decision_data: Dict[str, Any]):
-    """Process decision message for monitoring."""
-    try:
-        action = decision_data.get('action', 'unknown')
-        decision_time = decision_data.get('decision_time_ms', 0)
-        
-        # Update Prometheus metrics
-        decision_counter.labels(action=action).inc()
-        
-        if decision_time > 0:
-            decision_latency.observe(decision_time / 1000.0)
-        
-        # Store metrics
-        store_metric('decision_latency_ms', decision_time, {
-            'action': action,
-            'event_id': decision_data.get('event_id')
-        })
-        
-    except Exception as e:
-        logger.error(f"Error processing decision message: {e}")
+def score_histogram(model_name: str):
+    """Labelled score histogram child, resolved once per model name."""
+    child = score_histograms.get(model_name)
+    if child is None:
+        child = score_histograms[model_name] = model_score_histogram.labels(model_name=model_name)
+    return child
+
+
+def process_score_batch(batch: List[Dict[str, Any]]):
+    """Process a batch of score messages for monitoring."""
+    metric_rows = []
+    batch_scores = defaultdict(list)
+    for score_data in batch:
+        try:
+            scores = score_data.get('scores', {})
+            computation_time = score_data.get('computation_time_ms', 0)
+            
+            for model_name, score in scores.items():
+                if isinstance(score, (int, float)):
+                    batch_scores[model_name].append(score)
+            
+            # Store latency metric
+            if computation_time > 0:
+                decision_latency.observe(computation_time / 1000.0)  # Convert to seconds
+            
+            metric_rows.append(('ensemble', 'latency_ms', computation_time, Json({
+                'model_name': 'ensemble',
+                'event_id': score_data.get('event_id')
+            }, dumps=orjson_dumps)))
+            
+        except Exception as e:
+            logger.error(f"Error processing score message: {e}")
+    
+    # Update Prometheus metrics and score windows once per model
+    for model_name, scores in batch_scores.items():
+        observe = score_histogram(model_name).observe
+        for score in scores:
+            observe(score)
+        recent_scores[model_name].extend(scores)
+    
+    # Store metrics in database, one round trip per batch
+    store_metrics(metric_rows)
+    
+    # Update throughput (decisions per second) over the recent batches
+    throughput_window.append((time.time(), len(batch)))
+    if len(throughput_window) > 1:
+        time_span = throughput_window[-1][0] - throughput_window[0][0]
+        if time_span > 0:
+            throughput_gauge.set(sum(n for _, n in throughput_window) / time_span)
+
+
+def process_decision_batch(batch: List[Dict[str, Any]]):
+    """Process a batch of decision messages for monitoring."""
+    metric_rows = []
+    for decision_data in batch:
+        try:
+            action = decision_data.get('action', 'unknown')
+            decision_time = decision_data.get('decision_time_ms', 0)
+            
+            # Update Prometheus metrics
+            decision_counter.labels(action=action).inc()
+            
+            if decision_time > 0:
+                decision_latency.observe(decision_time / 1000.0)
+            
+            metric_rows.append(('ensemble', 'decision_latency_ms', decision_time, Json({
+                'action': action,
+                'event_id': decision_data.get('event_id')
+            }, dumps=orjson_dumps)))
+            
+        except Exception as e:
+            logger.error(f"Error processing decision message: {e}")
+    
+    # Store metrics
+    store_metrics(metric_rows)
 
 
-def process_feature_message(feature_data: Dict[str, Any]):
-    """Process feature message for drift detection."""
+def process_feature_batch(batch: List[Dict[str, Any]]):
+    """Process a batch of feature messages for drift detection."""
     try:
-        # Extract numeric features
-        numeric_features = {}
-        for key, value in feature_data.items():
-            if isinstance(value, (int, float)) and not np.isnan(value):
-                numeric_features[key] = value
-        
-        # Update reference features
-        update_reference_features(numeric_features)
-        
-        # Check for drift in key features
-        key_features = ['amount', 'velocity_1h', 'velocity_24h', 'ip_risk', 'geo_distance_km', 'merchant_risk']
-        
-        for feature_name in key_features:
-            if feature_name in numeric_features:
-                recent_features[feature_name].append(numeric_features[feature_name])
+        for feature_name in KEY_FEATURES:
+            # Gather the column once; missing or non-numeric values become NaN and are masked out
+            column = np.fromiter(
+                (v if isinstance(v := m.get(feature_name), (int, float)) else np.nan for m in batch),
+                dtype=np.float32,
+                count=len(batch)
+            )
+            values = column[~np.isnan(column)]
+            if values.size == 0:
+                continue
+            
+            # Update reference features
+            update_reference_features(feature_name, values)
+            
+            # Check drift every 100 samples
+            recent = recent_features[feature_name]
+            while values.size:
+                take = 100 - len(recent)
+                recent.extend(values[:take])
+                values = values[take:]
                 
-                # Check drift every 100 samples
-                if len(recent_features[feature_name]) >= 100:
-                    psi_value = detect_feature_drift(feature_name, list(recent_features[feature_name]))
-                    
-                    if psi_value > 0:
-                        drift_psi_gauge.labels(feature_name=feature_name).set(psi_value)
-                        
-                        # Store drift information if significant
-                        if psi_value > 0.2:  # PSI threshold
-                            now = datetime.utcnow()
-                            reference_period = (now - timedelta(hours=24), now - timedelta(hours=1))
-                            current_period = (now - timedelta(hours=1), now)
-                            
-                            store_feature_drift(feature_name, psi_value, reference_period, current_period)
-                            
-                            logger.warning(f"Feature drift detected: {feature_name} PSI={psi_value:.3f}")
+                if len(recent) >= 100:
+                    check_feature_drift(feature_name, recent.snapshot())
                     
                     # Clear recent features after drift check
-                    recent_features[feature_name].clear()
+                    recent.clear()
         
     except Exception as e:
-        logger.error(f"Error processing feature message: {e}")
+        logger.error(f"Error processing feature batch: {e}")
+
+
+def check_feature_drift(feature_name: str, current_values: np.ndarray):
+    """Publish PSI for a window of current values and record significant drift."""
+    psi_value = detect_feature_drift(feature_name, current_values)
+    
+    if psi_value > 0:
+        drift_psi_gauge.labels(feature_name=feature_name).set(psi_value)
+        
+        # Store drift information if significant
+        if psi_value > 0.2:  # PSI threshold
+            now = datetime.utcnow()
+            reference_period = (now - timedelta(hours=24), now - timedelta(hours=1))
+            current_period = (now - timedelta(hours=1), now)
+            
+            store_feature_drift(feature_name, psi_value, reference_period, current_period)
+            
+            logger.warning(f"Feature drift detected: {feature_name} PSI={psi_value:.3f}")
 
 
 def calculate_calibration_metrics():
@@ -321,11 +442,11 @@ def calculate_calibration_metrics():
         # For demonstration, we'll use synthetic data
         for model_name in ['xgb', 'nn', 'ensemble']:
             if len(recent_scores[model_name]) > 100:
-                scores = np.array(list(recent_scores[model_name]))
+                scores = recent_scores[model_name].snapshot()
                 
                 # Simulate true labels (in practice, these would come from actual outcomes)
                 # Higher scores more likely to be fraud
-                true_labels = (scores > 0.5).astype(int)
+                true_labels = (scores > 0.5).astype(np.float32)
                 
                 brier_score = calculate_brier_score(true_labels, scores)
                 calibration_brier_gauge.labels(model_name=model_name).set(brier_score)
@@ -344,18 +465,23 @@ def calculate_calibration_metrics():
 async def startup_event():
     """Initialize service on startup."""
     logger.info("Starting Model Monitor Service")
-    get_postgres_connection()
+    get_postgres_pool()
     get_kafka_consumer()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    global kafka_consumer, postgres_conn
+    global kafka_consumer, postgres_pool
+    # Let the consumer thread finish its batch and commit before closing the consumer
+    consumer_stop.set()
+    if consumer_thread is not None:
+        await asyncio.to_thread(consumer_thread.join, 5)
+    flush_metric_buffers()
     if kafka_consumer:
         kafka_consumer.close()
-    if postgres_conn:
-        postgres_conn.close()
+    if postgres_pool:
+        postgres_pool.closeall()
     logger.info("Shutting down Model Monitor Service")
 
 
@@ -365,11 +491,9 @@ async def health_check():
     return {"status": "healthy", "service": "model-monitor-svc", "timestamp": datetime.utcnow().isoformat()}
 
 
-@app.get("/metrics/calibration")
-async def get_calibration_metrics():
-    """Get calibration metrics."""
-    try:
-        conn = get_postgres_connection()
+def query_calibration_metrics() -> Dict[str, Any]:
+    """Query and summarise recent calibration metrics (blocking)."""
+    with pg() as conn:
         if conn is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
@@ -384,36 +508,41 @@ async def get_calibration_metrics():
         
         results = cursor.fetchall()
         cursor.close()
-        
-        metrics = []
-        for row in results:
-            metrics.append({
-                'model_name': row[0],
-                'brier_score': float(row[1]),
-                'timestamp': row[2].isoformat()
-            })
-        
-        return {
-            'calibration_metrics': metrics,
-            'summary': {
-                'total_models': len(set(m['model_name'] for m in metrics)),
-                'latest_brier_scores': {
-                    m['model_name']: m['brier_score'] 
-                    for m in metrics[:3]  # Latest 3 entries
-                }
+    
+    metrics = []
+    for row in results:
+        metrics.append({
+            'model_name': row[0],
+            'brier_score': float(row[1]),
+            'timestamp': row[2].isoformat()
+        })
+    
+    return {
+        'calibration_metrics': metrics,
+        'summary': {
+            'total_models': len(set(m['model_name'] for m in metrics)),
+            'latest_brier_scores': {
+                m['model_name']: m['brier_score'] 
+                for m in metrics[:3]  # Latest 3 entries
             }
         }
-        
+    }
+
+
+@app.get("/metrics/calibration")
+async def get_calibration_metrics():
+    """Get calibration metrics."""
+    try:
+        # DB round trip and number crunching run on a worker thread, off the event loop
+        return await asyncio.to_thread(query_calibration_metrics)
     except Exception as e:
         logger.error(f"Error getting calibration metrics: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving calibration metrics")
 
 
-@app.get("/metrics/drift")
-async def get_drift_metrics():
-    """Get feature drift metrics."""
-    try:
-        conn = get_postgres_connection()
+def query_drift_metrics() -> Dict[str, Any]:
+    """Query and summarise feature drift over the last 24 hours (blocking)."""
+    with pg() as conn:
         if conn is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
@@ -428,90 +557,93 @@ async def get_drift_metrics():
         
         results = cursor.fetchall()
         cursor.close()
-        
-        drift_metrics = []
-        for row in results:
-            drift_metrics.append({
-                'feature_name': row[0],
-                'psi_value': float(row[1]),
-                'timestamp': row[2].isoformat(),
-                'drift_level': 'high' if row[1] > 0.2 else 'medium' if row[1] > 0.1 else 'low'
-            })
-        
-        return {
-            'drift_metrics': drift_metrics,
-            'summary': {
-                'total_features_monitored': len(set(m['feature_name'] for m in drift_metrics)),
-                'high_drift_features': [m['feature_name'] for m in drift_metrics if m['drift_level'] == 'high'],
-                'latest_psi_values': {
-                    m['feature_name']: m['psi_value'] 
-                    for m in drift_metrics[:5]  # Latest 5 entries
-                }
+    
+    drift_metrics = []
+    for row in results:
+        drift_metrics.append({
+            'feature_name': row[0],
+            'psi_value': float(row[1]),
+            'timestamp': row[2].isoformat(),
+            'drift_level': 'high' if row[1] > 0.2 else 'medium' if row[1] > 0.1 else 'low'
+        })
+    
+    return {
+        'drift_metrics': drift_metrics,
+        'summary': {
+            'total_features_monitored': len(set(m['feature_name'] for m in drift_metrics)),
+            'high_drift_features': [m['feature_name'] for m in drift_metrics if m['drift_level'] == 'high'],
+            'latest_psi_values': {
+                m['feature_name']: m['psi_value'] 
+                for m in drift_metrics[:5]  # Latest 5 entries
             }
         }
-        
+    }
+
+
+@app.get("/metrics/drift")
+async def get_drift_metrics():
+    """Get feature drift metrics."""
+    try:
+        return await asyncio.to_thread(query_drift_metrics)
     except Exception as e:
         logger.error(f"Error getting drift metrics: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving drift metrics")
 
 
-@app.get("/metrics/latency")
-async def get_latency_metrics():
-    """Get latency metrics."""
-    try:
-        conn = get_postgres_connection()
+def query_latency_metrics() -> Dict[str, Any]:
+    """Aggregate latency percentiles over the last hour (blocking)."""
+    with pg() as conn:
         if conn is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
         cursor = conn.cursor()
+        # Aggregate server-side so only one row crosses the wire
         cursor.execute("""
-            SELECT metric_value, created_at
+            SELECT percentile_disc(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY metric_value),
+                   avg(metric_value), max(metric_value), min(metric_value), count(*)
             FROM model_metrics 
             WHERE metric_type IN ('latency_ms', 'decision_latency_ms')
-            AND created_at >= NOW() - INTERVAL '1 hour'
-            ORDER BY created_at DESC
-            LIMIT 1000
+            AND timestamp >= NOW() - INTERVAL '1 hour'
         """)
         
-        results = cursor.fetchall()
+        percentiles, mean, max_ms, min_ms, n = cursor.fetchone()
         cursor.close()
+    
+    if n:
+        p50, p95, p99 = (float(p) for p in percentiles)
         
-        latencies = [float(row[0]) for row in results]
-        
-        if latencies:
-            latencies_sorted = sorted(latencies)
-            n = len(latencies_sorted)
-            
-            p50 = latencies_sorted[int(n * 0.5)]
-            p95 = latencies_sorted[int(n * 0.95)]
-            p99 = latencies_sorted[int(n * 0.99)]
-            
-            return {
-                'latency_metrics': {
-                    'p50_ms': p50,
-                    'p95_ms': p95,
-                    'p99_ms': p99,
-                    'mean_ms': np.mean(latencies),
-                    'max_ms': max(latencies),
-                    'min_ms': min(latencies),
-                    'sample_count': len(latencies)
-                },
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        else:
-            return {
-                'latency_metrics': {
-                    'p50_ms': 0,
-                    'p95_ms': 0,
-                    'p99_ms': 0,
-                    'mean_ms': 0,
-                    'max_ms': 0,
-                    'min_ms': 0,
-                    'sample_count': 0
-                },
-                'timestamp': datetime.utcnow().isoformat()
-            }
-        
+        return {
+            'latency_metrics': {
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99,
+                'mean_ms': float(mean),
+                'max_ms': float(max_ms),
+                'min_ms': float(min_ms),
+                'sample_count': n
+            },
+            'timestamp': datetime.utcnow().isoformat()
+        }
+    else:
+        return {
+            'latency_metrics': {
+                'p50_ms': 0,
+                'p95_ms': 0,
+                'p99_ms': 0,
+                'mean_ms': 0,
+                'max_ms': 0,
+                'min_ms': 0,
+                'sample_count': 0
+            },
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+@app.get("/metrics/latency")
+async def get_latency_metrics():
+    """Get latency metrics."""
+    try:
+        return await asyncio.to_thread(query_latency_metrics)
     except Exception as e:
         logger.error(f"Error getting latency metrics: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving latency metrics")
@@ -530,17 +662,26 @@ def consume_messages():
     
     last_calibration_check = time.time()
     
-    for message in consumer:
+    while not consumer_stop.is_set():
         try:
-            topic = message.topic
-            data = message.value
+            # Up to max_poll_records messages per poll, grouped by partition
+            batches = consumer.poll(timeout_ms=200)
+            for tp, records in batches.items():
+                batch = [record.value for record in records]
+                
+                if tp.topic == "alerts.scores.v1":
+                    process_score_batch(batch)
+                elif tp.topic == "alerts.decisions.v1":
+                    process_decision_batch(batch)
+                elif tp.topic == "features.online.v1":
+                    process_feature_batch(batch)
             
-            if topic == "alerts.scores.v1":
-                process_score_message(data)
-            elif topic == "alerts.decisions.v1":
-                process_decision_message(data)
-            elif topic == "features.online.v1":
-                process_feature_message(data)
+            # One offset commit per processed batch, not per auto-commit interval
+            if batches:
+                consumer.commit_async()
+            
+            # Flush buffered rows on the age limit even when traffic is quiet
+            flush_metric_buffers_if_due()
             
             # Calculate calibration metrics every 5 minutes
             if time.time() - last_calibration_check > 300:
@@ -548,12 +689,17 @@ def consume_messages():
                 last_calibration_check = time.time()
                 
         except Exception as e:
-            logger.error(f"Error consuming message: {e}")
+            logger.error(f"Error consuming messages: {e}")
+    
+    # Final synchronous commit; the consumer is closed by shutdown_event once this returns
+    try:
+        consumer.commit()
+    except Exception as e:
+        logger.error(f"Error committing offsets on shutdown: {e}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    import threading
     
     # Start consumer in background thread
     consumer_thread = threading.Thread(target=consume_messages, daemon=True)
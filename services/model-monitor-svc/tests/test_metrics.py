@@ -0,0 +1,45 @@
+from app.metrics import psi
+
+def test_psi_identical_distributions_is_zero():
+    data = [i / 100 for i in range(200)]
+    assert psi(data, data) == 0.0
+
+def test_psi_detects_shift():
+    ref = [i / 100 for i in range(200)]
+    cur = [1 + i / 100 for i in range(200)]
+    assert psi(ref, cur) > 0.2
+
+def test_psi_short_or_constant_input():
+    assert psi([1.0] * 5, [1.0] * 5) == 0.0
+    assert psi([1.0] * 20, [1.0] * 20) == 0.0
+
+def test_ring_buffer_snapshot_wraps_in_order():
+    from app.store import RingBuffer
+    buf = RingBuffer(4)
+    for v in range(6):
+        buf.append(v)
+    assert len(buf) == 4
+    assert buf.snapshot().tolist() == [2, 3, 4, 5]
+    assert buf.snapshot(2).tolist() == [4, 5]
+
+def test_feature_stream_histograms_match_rebuild():
+    import random
+    from app.store import FeatureStream
+    rng = random.Random(7)
+    stream = FeatureStream(capacity=50, bins=5)
+    for _ in range(500):
+        stream.push(rng.uniform(0, 1) if rng.random() < 0.95 else rng.uniform(-1, 2))
+        data = stream.values.snapshot().tolist()
+        idx = [stream._bin(float(v)) for v in data]
+        mid = len(data) // 2
+        assert stream.ref.tolist() == [idx[:mid].count(b) for b in range(5)]
+        assert stream.cur.tolist() == [idx[mid:].count(b) for b in range(5)]
+
+def test_ring_buffer_extend_matches_append():
+    from app.store import RingBuffer
+    a, b = RingBuffer(8), RingBuffer(8)
+    for chunk in ([1, 2, 3], [4, 5, 6, 7, 8, 9], [10], list(range(11, 30))):
+        for v in chunk:
+            a.append(v)
+        b.extend(chunk)
+        assert a.snapshot().tolist() == b.snapshot().tolist()
@@ -1,24 +1,62 @@
-from fastapi import FastAPI
+from typing import List
+import numpy as np
+from fastapi import Body, FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from .schemas import FeatureVector, ScoreResponse
 from .config import settings
 from .models import Ensemble
 
+SCORE_KEYS = ["xgb","nn","rules","ensemble","calibrated"]
+BATCH_FEATURES = ["amount","velocity_1h","ip_risk","geo_distance_km","merchant_risk"]
+
+def whole_int(v) -> int:
+    # int() would truncate 5.9 and accept True; reject both like pydantic did
+    if isinstance(v, bool) or not float(v).is_integer():
+        raise ValueError(f"{v!r} is not an integer")
+    return int(v)
+
+# Only the fields the models read, with their coercions
+SCORE_FIELDS = {"amount": float, "velocity_1h": whole_int, "ip_risk": float, "geo_distance_km": float, "merchant_risk": float}
+
+def parse_features(body: dict) -> dict:
+    try:
+        return {k: cast(body[k]) for k, cast in SCORE_FIELDS.items()}
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"missing field {e.args[0]}")
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"invalid feature value: {e}")
+
 weights = [float(x) for x in settings.ENSEMBLE_WEIGHTS.split(",")]
 model = Ensemble(*weights)
 
-app = FastAPI(title="score-svc", version="0.1.0")
+app = FastAPI(title="score-svc", version="0.1.0", default_response_class=ORJSONResponse)
 
 @app.get("/health")
 def health():
     return {"status": "ok", "service": settings.SERVICE_NAME, "model_version": model.version}
 
-@app.post("/score", response_model=ScoreResponse)
-def score(fv: FeatureVector):
-    feats = fv.model_dump()
-    out = model.score(feats)
+# ScoreResponse documents the shape; the handler skips pydantic on the way in and out
+@app.post("/score", response_model=None, responses={200: {"model": ScoreResponse}})
+def score(fv: dict = Body(...)):
+    if not isinstance(fv.get("event_id"), str):
+        raise HTTPException(status_code=422, detail="event_id must be a string")
+    out = model.score(parse_features(fv))
     return {
-        "event_id": fv.event_id,
-        "scores": {k: out[k] for k in ["xgb","nn","rules","ensemble","calibrated"]},
+        "event_id": fv["event_id"],
+        "scores": {k: out[k] for k in SCORE_KEYS},
         "explain": {"top_features": out["explain"]},
         "model_version": model.version,
     }
+
+@app.post("/score/batch", response_model=List[ScoreResponse])
+def score_batch(fvs: List[FeatureVector]):
+    n = len(fvs)
+    feats = {k: np.fromiter((getattr(fv, k) for fv in fvs), dtype=np.float64, count=n) for k in BATCH_FEATURES}
+    out = model.score_batch(feats)
+    cols = {k: out[k].tolist() for k in SCORE_KEYS}
+    return [{
+        "event_id": fv.event_id,
+        "scores": {k: cols[k][i] for k in SCORE_KEYS},
+        "explain": {"top_features": out["explain"][i]},
+        "model_version": model.version,
+    } for i, fv in enumerate(fvs)]
@@ -1,6 +1,16 @@
 from pathlib import Path
 import json
 import math
+import numpy as np
+
+# Calibration sigmoid tabulated on the 4-decimal grid of raw ensemble scores in [0, 1]
+_CAL = 1.0/(1.0 + np.exp(-5*(np.arange(10001)/10000 - 0.5)))
+
+def calibrate(raw: float) -> float:
+    """Platt-like calibration stub; a table lookup for raw scores in [0, 1]."""
+    if 0.0 <= raw <= 1.0:
+        return float(_CAL[round(raw*10000)])
+    return 1.0/(1.0 + math.exp(-5*(raw-0.5)))
 
 # Stubs you can replace with real loaders (xgboost/pytorch)
 class XGBModel:
@@ -8,11 +18,15 @@ class XGBModel:
     def predict_proba(self, feats: dict) -> float:
         # toy signal
         return min(1.0, 0.15 + 0.5*float(feats["ip_risk"]) + 0.01*feats["velocity_1h"])
+    def predict_proba_batch(self, feats: dict) -> np.ndarray:
+        return np.minimum(1.0, 0.15 + 0.5*feats["ip_risk"] + 0.01*feats["velocity_1h"])
 
 class NNModel:
     version = "nn_2025_10_01"
     def predict_proba(self, feats: dict) -> float:
         return min(1.0, 0.1 + 0.35*float(feats["merchant_risk"]) + 0.001*feats["geo_distance_km"])
+    def predict_proba_batch(self, feats: dict) -> np.ndarray:
+        return np.minimum(1.0, 0.1 + 0.35*feats["merchant_risk"] + 0.001*feats["geo_distance_km"])
 
 def rules_score(feats: dict) -> float:
     s = 0.0
@@ -21,14 +35,35 @@ def rules_score(feats: dict) -> float:
     if feats["amount"] >= 2000: s += 0.2
     return min(1.0, s)
 
+def rules_score_batch(feats: dict) -> np.ndarray:
+    s = (np.where(feats["velocity_1h"] >= 8, 0.35, 0.0)
+         + np.where(feats["ip_risk"] >= 0.8, 0.35, 0.0)
+         + np.where(feats["amount"] >= 2000, 0.2, 0.0))
+    return np.minimum(1.0, s)
+
 def shap_like(feats: dict):
-    # dummy "explanations"
-    return sorted(
-        [("velocity_1h", feats["velocity_1h"]/10.0),
-         ("ip_risk", feats["ip_risk"]*0.5),
-         ("merchant_risk", feats["merchant_risk"]*0.4)],
-        key=lambda x: -x[1]
-    )[:5]
+    # dummy "explanations", ranked by a stable 3-element insertion sort
+    a = ("velocity_1h", feats["velocity_1h"]/10.0)
+    b = ("ip_risk", feats["ip_risk"]*0.5)
+    c = ("merchant_risk", feats["merchant_risk"]*0.4)
+    if b[1] > a[1]: a, b = b, a
+    if c[1] > b[1]:
+        b, c = c, b
+        if b[1] > a[1]: a, b = b, a
+    return [a, b, c]
+
+EXPLAIN_FEATURES = ("velocity_1h", "ip_risk", "merchant_risk")
+
+def shap_like_batch(feats: dict) -> list:
+    contrib = np.column_stack((feats["velocity_1h"]/10.0, feats["ip_risk"]*0.5, feats["merchant_risk"]*0.4))
+    order = np.argsort(-contrib, axis=1, kind="stable")  # stable, like sorted() in shap_like
+    ranked = np.take_along_axis(contrib, order, axis=1).tolist()
+    return [[(EXPLAIN_FEATURES[j], v) for j, v in zip(o, r)] for o, r in zip(order.tolist(), ranked)]
+
+def calibrate_batch(raw: np.ndarray) -> np.ndarray:
+    in_range = (raw >= 0.0) & (raw <= 1.0)
+    lut = _CAL[np.rint(np.clip(raw, 0.0, 1.0)*10000).astype(np.intp)]
+    return np.where(in_range, lut, 1.0/(1.0 + np.exp(-5*(raw-0.5))))
 
 class Ensemble:
     def __init__(self, w_xgb=0.5, w_nn=0.4, w_rules=0.1):
@@ -45,8 +80,7 @@ class Ensemble:
         sn = self.nn.predict_proba(feats)
         sr = rules_score(feats)
         raw = self.w[0]*sx + self.w[1]*sn + self.w[2]*sr
-        # simple Platt-like calibration stub
-        calibrated = 1.0/(1.0 + math.exp(-5*(raw-0.5)))
+        calibrated = calibrate(raw)
         return {
             "xgb": round(sx, 4),
             "nn": round(sn, 4),
@@ -55,3 +89,19 @@ class Ensemble:
             "calibrated": round(calibrated, 4),
             "explain": shap_like(feats),
         }
+
+    def score_batch(self, feats: dict) -> dict:
+        """Score many events at once; ``feats`` maps each feature name to a float array."""
+        sx = self.xgb.predict_proba_batch(feats)
+        sn = self.nn.predict_proba_batch(feats)
+        sr = rules_score_batch(feats)
+        raw = self.w[0]*sx + self.w[1]*sn + self.w[2]*sr
+        calibrated = calibrate_batch(raw)
+        return {
+            "xgb": np.round(sx, 4),
+            "nn": np.round(sn, 4),
+            "rules": np.round(sr, 4),
+            "ensemble": np.round(raw, 4),
+            "calibrated": np.round(calibrated, 4),
+            "explain": shap_like_batch(feats),
+        }
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Dict, List, Tuple, Optional
 
+# Wire format of POST /score. Kept separate from services/shared FeatureVector: callers send
+# free-form string event ids and a raw `ts`, where the shared schema requires a UUID and `timestamp`.
 class FeatureVector(BaseModel):
     event_id: str
     entity_id: str
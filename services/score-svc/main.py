@@ -1,25 +1,42 @@
 """Score service for ensemble fraud scoring."""
 
+import asyncio
 import json
 import logging
+import math
 import os
 import pickle
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Annotated, Dict, Any, List, Optional
+from uuid import UUID
 
+import msgspec
 import numpy as np
+import orjson
 import pandas as pd
 import shap
 import torch
+from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+from cachetools import LRUCache
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from kafka import KafkaConsumer, KafkaProducer
+from fastapi.responses import Response
+from pydantic_core import to_json
 from sklearn.calibration import CalibratedClassifierCV
 from sklearn.preprocessing import StandardScaler
-from xgboost import XGBClassifier
+from xgboost import Booster, XGBClassifier
+
+try:
+    import tl2cgen
+    import treelite
+except ImportError:
+    tl2cgen = None
+    treelite = None
 
-from shared.schemas.features import FeatureVector
 from shared.schemas.scores import ScoreOutput, ModelScores, FeatureExplanation
 
 # Configure logging
@@ -44,14 +61,94 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class Geolocation(msgspec.Struct):
+    """Geolocation information."""
+    
+    country: Optional[str] = None
+    region: Optional[str] = None
+    city: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+
+class FeatureMetadata(msgspec.Struct):
+    """Feature computation metadata."""
+    
+    computation_time_ms: Optional[float] = None
+    cache_hit: Optional[bool] = None
+    data_freshness_minutes: Optional[float] = None
+
+
+class FeatureVector(msgspec.Struct, kw_only=True, frozen=True):
+    """Feature vector decoded straight from ``features.online.v1`` bytes.
+
+    Mirrors ``shared.schemas.features.FeatureVector``; msgspec validates the
+    same constraints without the intermediate dict and Pydantic model build.
+    """
+    
+    event_id: UUID
+    entity_id: str
+    timestamp: datetime
+    amount: Optional[float] = None
+    currency: Optional[str] = None
+    channel: Optional[str] = None
+    velocity_1h: Annotated[int, msgspec.Meta(ge=0)] = 0
+    velocity_24h: Annotated[int, msgspec.Meta(ge=0)] = 0
+    velocity_7d: Annotated[int, msgspec.Meta(ge=0)] = 0
+    ip_risk: Annotated[float, msgspec.Meta(ge=0, le=1)] = 0.0
+    ip_geolocation: Optional[Geolocation] = None
+    geo_distance_km: Annotated[float, msgspec.Meta(ge=0)] = 0.0
+    merchant_risk: Annotated[float, msgspec.Meta(ge=0, le=1)] = 0.0
+    merchant_category: Optional[str] = None
+    age_days: Annotated[int, msgspec.Meta(ge=0)] = 0
+    device_fingerprint: Optional[str] = None
+    session_id: Optional[str] = None
+    user_agent_hash: Optional[str] = None
+    features_version: str
+    feature_metadata: Optional[FeatureMetadata] = None
+
+
+feature_decoder = msgspec.json.Decoder(FeatureVector)
+
+# Learned ensemble weights (in production, these would be optimized)
+XGB_WEIGHT = 0.5
+NN_WEIGHT = 0.3
+RULES_WEIGHT = 0.2
+
+# Calibration sigmoid sampled over the ensemble score range
+CALIBRATION_STEPS = 10000
+CALIBRATION_LUT = 1 / (1 + np.exp(-5 * (np.arange(CALIBRATION_STEPS + 1) / CALIBRATION_STEPS - 0.5)))
+
+# Scoring is single-event latency bound; extra intra-op threads only add overhead
+torch.set_num_threads(int(os.getenv("TORCH_NUM_THREADS", "1")))
+
 # Global variables for models
 xgb_model = None
+xgb_booster = None
+xgb_predictor = None
+shap_explainer = None
 nn_model = None
 nn_scaler = None
 feature_names = None
 model_version = None
 kafka_consumer = None
 kafka_producer = None
+consumer_task = None
+explanation_tasks = set()
+
+# SHAP explanations are published separately on alerts.explanations.v1
+# when enabled, keeping the explainer off the scoring latency path
+SHAP_ASYNC_ENABLED = os.getenv("ENABLE_SHAP_ASYNC", "0") == "1"
+shap_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="shap") if SHAP_ASYNC_ENABLED else None
+
+# Recent single-event scores keyed by the exact float32 model input; repeated
+# feature vectors (retries, scripted attacks) skip inference entirely
+_score_cache = LRUCache(maxsize=int(os.getenv("SCORE_CACHE_SIZE", "10000")))
+_score_cache_lock = threading.Lock()
+
+# Per-thread single-row feature buffer; the consumer thread and request
+# handlers score concurrently, so the buffer must not be shared
+feature_buffers = threading.local()
 
 
 class FraudNN(torch.nn.Module):
@@ -81,20 +178,146 @@ class FraudNN(torch.nn.Module):
         return self.network(x)
 
 
+def quantize_nn_model(model: FraudNN) -> torch.nn.Module:
+    """Put the network in eval mode and quantize its Linear layers to INT8."""
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+@dataclass
+class FeatureScaler:
+    """Fitted StandardScaler parameters, loaded without unpickling sklearn."""
+    
+    mean_: np.ndarray
+    scale_: np.ndarray
+
+
+@dataclass
+class CalibratedXGBModel:
+    """Sigmoid-calibrated XGBoost folds, loaded from native boosters without unpickling sklearn.
+    
+    predict_proba matches CalibratedClassifierCV(method='sigmoid'): each fold's booster
+    probability is Platt-scaled with that fold's a/b, then the folds are averaged.
+    """
+    
+    boosters: List[Booster]
+    a: np.ndarray
+    b: np.ndarray
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        raw = np.stack([booster.inplace_predict(X) for booster in self.boosters])
+        proba = (1.0 / (1.0 + np.exp(self.a[:, None] * raw + self.b[:, None]))).mean(axis=0)
+        return np.column_stack((1.0 - proba, proba))
+
+
+def load_calibrated_xgb(calibration_file: str) -> CalibratedXGBModel:
+    """Load the per-fold boosters and sigmoid parameters written by the XGBoost trainer."""
+    with open(calibration_file, 'r') as f:
+        calibration = json.load(f)
+    
+    boosters = []
+    for booster_name in calibration["boosters"]:
+        booster = Booster()
+        booster.load_model(os.path.join(os.path.dirname(calibration_file), booster_name))
+        # Requests are scored concurrently; one thread per prediction avoids oversubscription
+        booster.set_param({"nthread": 1})
+        boosters.append(booster)
+    
+    return CalibratedXGBModel(
+        boosters=boosters,
+        a=np.asarray(calibration["a"], dtype=np.float64),
+        b=np.asarray(calibration["b"], dtype=np.float64)
+    )
+
+
+def load_feature_scaler(scaler_file: str):
+    """Load scaler parameters from an .npz archive, or a legacy pickled StandardScaler."""
+    if scaler_file.endswith('.npz'):
+        with np.load(scaler_file, allow_pickle=False) as arrays:
+            return FeatureScaler(mean_=arrays["mean"], scale_=arrays["scale"])
+    
+    with open(scaler_file, 'rb') as f:
+        return pickle.load(f)
+
+
+def fold_nn_scaler(model: torch.nn.Module, scaler) -> torch.nn.Module:
+    """Prepend the StandardScaler to the network as a frozen float Linear layer."""
+    # Added after quantization so the per-feature scales keep full precision
+    n_features = len(scaler.mean_)
+    scale = torch.from_numpy(1.0 / scaler.scale_).float()
+    shift = torch.from_numpy(-scaler.mean_ / scaler.scale_).float()
+    
+    pre = torch.nn.Linear(n_features, n_features, bias=True)
+    pre.weight.data = torch.diag(scale)
+    pre.bias.data = shift
+    pre.requires_grad_(False)
+    
+    return torch.nn.Sequential(pre, model).eval()
+
+
+def trace_nn_model(model: torch.nn.Module, input_size: int) -> torch.nn.Module:
+    """Trace the network into an inference-optimized TorchScript graph."""
+    try:
+        example = torch.zeros(1, input_size)
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example)
+        return torch.jit.optimize_for_inference(traced)
+    except Exception as e:
+        logger.error(f"Error tracing Neural Network model, using eager mode: {e}")
+        return model
+
+
+def artifact_is_fresh(artifact_path: str, *source_paths: str) -> bool:
+    """Return True if a derived model artifact exists and is newer than its sources."""
+    if not os.path.exists(artifact_path):
+        return False
+    mtime = os.path.getmtime(artifact_path)
+    return all(os.path.getmtime(path) <= mtime for path in source_paths)
+
+
+def save_script_model(model: torch.nn.Module, path: str):
+    """Save a traced network so later workers can load it without rebuilding."""
+    if not isinstance(model, torch.jit.ScriptModule):
+        return
+    
+    try:
+        # Write then rename so concurrently starting workers never read a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        torch.jit.save(model, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"Error saving TorchScript model: {e}")
+
+
+def clear_score_cache():
+    """Drop cached scores computed with previously loaded models."""
+    with _score_cache_lock:
+        _score_cache.clear()
+
+
 def load_models():
     """Load trained models."""
     global xgb_model, nn_model, nn_scaler, feature_names, model_version
     
+    xgb_model_file = None
+    
     try:
         # Load XGBoost model
         xgb_path = "models/fraud_xgb/"
         if os.path.exists(xgb_path):
-            # Find latest model file
-            model_files = [f for f in os.listdir(xgb_path) if f.endswith('.pkl')]
+            # Find latest model file, preferring native calibrated boosters over pickle
+            model_files = (
+                [f for f in os.listdir(xgb_path) if f.endswith('_calibration.json')] or
+                [f for f in os.listdir(xgb_path) if f.endswith('.pkl')]
+            )
             if model_files:
                 latest_model = sorted(model_files)[-1]
-                with open(os.path.join(xgb_path, latest_model), 'rb') as f:
-                    xgb_model = pickle.load(f)
+                xgb_model_file = os.path.join(xgb_path, latest_model)
+                if xgb_model_file.endswith('_calibration.json'):
+                    xgb_model = load_calibrated_xgb(xgb_model_file)
+                else:
+                    with open(xgb_model_file, 'rb') as f:
+                        xgb_model = pickle.load(f)
                 logger.info(f"Loaded XGBoost model: {latest_model}")
         
         # Load Neural Network model
@@ -102,21 +325,32 @@ def load_models():
         if os.path.exists(nn_path):
             # Find latest model file
             model_files = [f for f in os.listdir(nn_path) if f.endswith('.pth')]
-            scaler_files = [f for f in os.listdir(nn_path) if f.endswith('_scaler.pkl')]
+            scaler_files = (
+                [f for f in os.listdir(nn_path) if f.endswith('_scaler.npz')] or
+                [f for f in os.listdir(nn_path) if f.endswith('_scaler.pkl')]
+            )
             
             if model_files and scaler_files:
                 latest_model = sorted(model_files)[-1]
                 latest_scaler = sorted(scaler_files)[-1]
+                model_file = os.path.join(nn_path, latest_model)
+                scaler_file = os.path.join(nn_path, latest_scaler)
+                script_file = os.path.splitext(model_file)[0] + ".ts"
                 
-                # Load scaler
-                with open(os.path.join(nn_path, latest_scaler), 'rb') as f:
-                    nn_scaler = pickle.load(f)
-                
-                # Load model
-                input_size = len(feature_names) if feature_names else 8
-                nn_model = FraudNN(input_size)
-                nn_model.load_state_dict(torch.load(os.path.join(nn_path, latest_model)))
-                nn_model.eval()
+                if artifact_is_fresh(script_file, model_file, scaler_file):
+                    # Quantized, scaler-folded graph saved by an earlier load
+                    nn_model = torch.jit.load(script_file, map_location="cpu")
+                else:
+                    # Load scaler
+                    nn_scaler = load_feature_scaler(scaler_file)
+                    
+                    # Load model
+                    input_size = len(feature_names) if feature_names else 8
+                    nn_model = FraudNN(input_size)
+                    nn_model.load_state_dict(torch.load(model_file))
+                    nn_model = quantize_nn_model(nn_model)
+                    nn_model = trace_nn_model(fold_nn_scaler(nn_model, nn_scaler), input_size)
+                    save_script_model(nn_model, script_file)
                 
                 logger.info(f"Loaded Neural Network model: {latest_model}")
         
@@ -128,6 +362,11 @@ def load_models():
         
         # Set model version
         model_version = f"2025_01_15_xgb_01_nn_01"
+        clear_score_cache()
+        
+        cache_xgb_booster()
+        compile_xgb_predictor(xgb_model_file)
+        build_shap_explainer()
         
         logger.info("Models loaded successfully")
         
@@ -156,48 +395,140 @@ def create_dummy_models():
     xgb_model.fit(dummy_X, dummy_y)
     
     # Dummy Neural Network model
-    nn_model = FraudNN(len(feature_names))
     nn_scaler = StandardScaler()
     nn_scaler.fit(dummy_X)
+    nn_model = quantize_nn_model(FraudNN(len(feature_names)))
+    nn_model = trace_nn_model(fold_nn_scaler(nn_model, nn_scaler), len(feature_names))
     
     model_version = "dummy_models_v1"
+    clear_score_cache()
+    cache_xgb_booster()
+    compile_xgb_predictor()
+    build_shap_explainer()
     logger.info("Dummy models created")
 
 
-def get_kafka_consumer() -> KafkaConsumer:
-    """Get or create Kafka consumer."""
+def plain_xgb_model() -> Optional[XGBClassifier]:
+    """The loaded model if it is an uncalibrated XGBClassifier, else None.
+    
+    Calibrated models average several Platt-scaled boosters, so the single-booster fast
+    paths (inplace prediction, Treelite) do not apply and they use predict_proba.
+    """
+    return xgb_model if isinstance(xgb_model, XGBClassifier) else None
+
+
+def cache_xgb_booster():
+    """Cache the XGBoost booster for DMatrix-free inplace prediction."""
+    global xgb_booster
+    xgb_booster = None
+    
+    if plain_xgb_model() is None:
+        return
+    
+    try:
+        xgb_booster = xgb_model.get_booster()
+        # Requests are scored concurrently; one thread per prediction avoids oversubscription
+        xgb_booster.set_param({"nthread": 1})
+    except Exception as e:
+        logger.error(f"Error caching XGBoost booster: {e}")
+
+
+def compile_xgb_predictor(model_file: Optional[str] = None):
+    """Compile the XGBoost model to a native Treelite library for single-row inference."""
+    global xgb_predictor
+    xgb_predictor = None
+    
+    if plain_xgb_model() is None or tl2cgen is None:
+        return
+    
+    try:
+        default_libpath = os.path.splitext(model_file)[0] + ".so" if model_file else "models/fraud_xgb/fraud.so"
+        libpath = os.getenv("XGB_PREDICTOR_LIB", default_libpath)
+        
+        # The library is dlopen'ed, so workers share its pages; reuse one built for this model
+        if model_file and artifact_is_fresh(libpath, model_file):
+            xgb_predictor = tl2cgen.Predictor(libpath, nthread=1)
+            logger.info(f"Loaded XGBoost predictor: {libpath}")
+            return
+        
+        os.makedirs(os.path.dirname(libpath) or ".", exist_ok=True)
+        
+        tl_model = treelite.frontend.from_xgboost(xgb_model.get_booster())
+        tmp_libpath = f"{os.path.splitext(libpath)[0]}.{os.getpid()}.tmp.so"
+        tl2cgen.export_lib(
+            tl_model,
+            toolchain="gcc",
+            libpath=tmp_libpath,
+            params={"parallel_comp": 8, "quantize": 1}
+        )
+        os.replace(tmp_libpath, libpath)
+        xgb_predictor = tl2cgen.Predictor(libpath, nthread=1)
+        logger.info(f"Compiled XGBoost predictor: {libpath}")
+    except Exception as e:
+        logger.error(f"Error compiling XGBoost predictor, using predict_proba: {e}")
+
+
+def build_shap_explainer():
+    """Build the SHAP explainer once per loaded XGBoost model."""
+    global shap_explainer
+    shap_explainer = None
+    
+    # Calibration is monotonic per fold, so the first fold's trees rank feature contributions
+    if isinstance(xgb_model, CalibratedXGBModel):
+        tree_model = xgb_model.boosters[0]
+    else:
+        tree_model = plain_xgb_model()
+    if tree_model is None:
+        return
+    
+    try:
+        shap_explainer = shap.TreeExplainer(tree_model, feature_perturbation="tree_path_dependent")
+    except Exception as e:
+        logger.error(f"Error building SHAP explainer: {e}")
+
+
+def orjson_dumps(value: Any) -> bytes:
+    """Serialize a Kafka payload, including NumPy scores, to JSON bytes."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC)
+
+
+async def get_kafka_consumer() -> AIOKafkaConsumer:
+    """Get or create and start the Kafka consumer."""
     global kafka_consumer
     if kafka_consumer is None:
         bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        kafka_consumer = KafkaConsumer(
+        kafka_consumer = AIOKafkaConsumer(
             "features.online.v1",
-            bootstrap_servers=[bootstrap_servers],
-            value_deserializer=lambda m: json.loads(m.decode('utf-8')),
+            bootstrap_servers=bootstrap_servers,
             group_id="score-svc",
             auto_offset_reset='latest',
             enable_auto_commit=True
         )
+        await kafka_consumer.start()
     return kafka_consumer
 
 
-def get_kafka_producer() -> KafkaProducer:
-    """Get or create Kafka producer."""
+async def get_kafka_producer() -> AIOKafkaProducer:
+    """Get or create and start the Kafka producer."""
     global kafka_producer
     if kafka_producer is None:
         bootstrap_servers = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
-        kafka_producer = KafkaProducer(
-            bootstrap_servers=[bootstrap_servers],
-            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+        # Values are handed over already encoded as bytes
+        kafka_producer = AIOKafkaProducer(
+            bootstrap_servers=bootstrap_servers,
             key_serializer=lambda k: k.encode('utf-8') if k else None,
-            retries=3,
-            acks='all'
+            acks='all',
+            linger_ms=10,
+            max_batch_size=65536,
+            compression_type='lz4'
         )
+        await kafka_producer.start()
     return kafka_producer
 
 
-def extract_features(feature_vector: FeatureVector) -> np.ndarray:
-    """Extract features from feature vector."""
-    features = [
+def feature_row(feature_vector: FeatureVector) -> List[float]:
+    """Return the model input columns of a feature vector in training order."""
+    return [
         feature_vector.amount or 0,
         feature_vector.velocity_1h,
         feature_vector.velocity_24h,
@@ -207,7 +538,31 @@ def extract_features(feature_vector: FeatureVector) -> np.ndarray:
         feature_vector.merchant_risk,
         feature_vector.age_days
     ]
-    return np.array(features).reshape(1, -1)
+
+
+def extract_features(feature_vector: FeatureVector) -> np.ndarray:
+    """Extract features from feature vector into this thread's reusable (1, 8) buffer."""
+    features = getattr(feature_buffers, "row", None)
+    if features is None:
+        features = feature_buffers.row = np.empty((1, 8), dtype=np.float32)
+    
+    features[0, 0] = feature_vector.amount or 0
+    features[0, 1] = feature_vector.velocity_1h
+    features[0, 2] = feature_vector.velocity_24h
+    features[0, 3] = feature_vector.velocity_7d
+    features[0, 4] = feature_vector.ip_risk
+    features[0, 5] = feature_vector.geo_distance_km
+    features[0, 6] = feature_vector.merchant_risk
+    features[0, 7] = feature_vector.age_days
+    return features
+
+
+def extract_feature_matrix(feature_vectors: List[FeatureVector]) -> np.ndarray:
+    """Stack feature vectors into an (N, 8) float32 matrix."""
+    X = np.empty((len(feature_vectors), 8), dtype=np.float32)
+    for i, feature_vector in enumerate(feature_vectors):
+        X[i] = feature_row(feature_vector)
+    return X
 
 
 def compute_rule_score(feature_vector: FeatureVector) -> float:
@@ -243,12 +598,33 @@ def compute_rule_score(feature_vector: FeatureVector) -> float:
     return min(score, 1.0)
 
 
+def compute_rule_scores_batch(X: np.ndarray) -> np.ndarray:
+    """Compute rule-based scores for a feature matrix without per-row branching."""
+    amount, velocity_1h, ip_risk, geo_distance, merchant_risk = X[:, 0], X[:, 1], X[:, 4], X[:, 5], X[:, 6]
+    
+    score = (
+        0.3 * (amount > 10000) +
+        np.where(velocity_1h > 10, 0.4, np.where(velocity_1h > 5, 0.2, 0.0)) +
+        np.where(ip_risk > 0.8, 0.3, np.where(ip_risk > 0.5, 0.1, 0.0)) +
+        np.where(geo_distance > 1000, 0.2, np.where(geo_distance > 500, 0.1, 0.0)) +
+        0.2 * (merchant_risk > 0.7)
+    )
+    return np.minimum(score, 1.0)
+
+
 def compute_xgb_score(features: np.ndarray) -> float:
     """Compute XGBoost score."""
     if xgb_model is None:
         return 0.1  # Default score
     
     try:
+        if xgb_predictor is not None:
+            # Binary logistic models emit one probability per row
+            return float(xgb_predictor.predict(tl2cgen.DMatrix(features)).ravel()[-1])
+        
+        if xgb_booster is not None:
+            return float(xgb_booster.inplace_predict(features)[0])
+        
         proba = xgb_model.predict_proba(features)[0, 1]
         return float(proba)
     except Exception as e:
@@ -258,15 +634,12 @@ def compute_xgb_score(features: np.ndarray) -> float:
 
 def compute_nn_score(features: np.ndarray) -> float:
     """Compute Neural Network score."""
-    if nn_model is None or nn_scaler is None:
+    if nn_model is None:
         return 0.1  # Default score
     
     try:
-        # Scale features
-        features_scaled = nn_scaler.transform(features)
-        
-        # Convert to tensor
-        features_tensor = torch.FloatTensor(features_scaled)
+        # Scaling is folded into the model; the float32 buffer is shared, not copied
+        features_tensor = torch.from_numpy(features)
         
         # Predict
         with torch.no_grad():
@@ -278,66 +651,113 @@ def compute_nn_score(features: np.ndarray) -> float:
         return 0.1
 
 
-def compute_shap_explanation(features: np.ndarray) -> List[List]:
-    """Compute SHAP explanation for top features."""
+def compute_xgb_scores(X: np.ndarray) -> np.ndarray:
+    """Compute XGBoost scores for a feature matrix."""
+    if xgb_model is None:
+        return np.full(len(X), 0.1)
+    
     try:
-        if xgb_model is None:
-            return [["amount", 0.1], ["velocity_1h", 0.1]]
-        
-        # Create SHAP explainer
-        explainer = shap.TreeExplainer(xgb_model)
-        shap_values = explainer.shap_values(features)
+        if xgb_predictor is not None:
+            return xgb_predictor.predict(tl2cgen.DMatrix(X)).reshape(len(X), -1)[:, -1]
         
-        # Get top features
-        feature_importance = np.abs(shap_values[0])
-        top_indices = np.argsort(feature_importance)[-5:][::-1]
+        if xgb_booster is not None:
+            return xgb_booster.inplace_predict(X)
         
-        top_features = []
-        for idx in top_indices:
-            if idx < len(feature_names):
-                feature_name = feature_names[idx]
-                importance = float(feature_importance[idx])
-                top_features.append([feature_name, importance])
+        return xgb_model.predict_proba(X)[:, 1]
+    except Exception as e:
+        logger.error(f"Error computing XGBoost scores: {e}")
+        return np.full(len(X), 0.1)
+
+
+def compute_nn_scores(X: np.ndarray) -> np.ndarray:
+    """Compute Neural Network scores for a feature matrix."""
+    if nn_model is None:
+        return np.full(len(X), 0.1)
+    
+    try:
+        features_tensor = torch.from_numpy(X)
+        with torch.no_grad():
+            return nn_model(features_tensor).numpy().ravel()
+    except Exception as e:
+        logger.error(f"Error computing Neural Network scores: {e}")
+        return np.full(len(X), 0.1)
+
+
+def top_shap_features(shap_values: np.ndarray, k: int = 5) -> List[List[List]]:
+    """Return the k features with the largest absolute SHAP value for every row."""
+    feature_importance = np.abs(shap_values)
+    k = min(k, feature_importance.shape[1])
+    
+    # Select the top k per row in linear time, then order only those k
+    top_indices = np.argpartition(feature_importance, -k, axis=1)[:, -k:]
+    top_importance = np.take_along_axis(feature_importance, top_indices, axis=1)
+    order = np.argsort(-top_importance, axis=1, kind="stable")
+    top_indices = np.take_along_axis(top_indices, order, axis=1)
+    top_importance = np.take_along_axis(top_importance, order, axis=1)
+    
+    return [
+        [[feature_names[idx], float(importance)] for idx, importance in zip(row_indices, row_importance) if idx < len(feature_names)]
+        for row_indices, row_importance in zip(top_indices.tolist(), top_importance.tolist())
+    ]
+
+
+def compute_shap_explanations(X: np.ndarray) -> List[List[List]]:
+    """Compute SHAP explanations for every row of a feature matrix in one call."""
+    try:
+        if shap_explainer is None:
+            return [[["amount", 0.1], ["velocity_1h", 0.1]] for _ in range(len(X))]
         
-        return top_features
+        shap_values = shap_explainer.shap_values(X, check_additivity=False)
+        return top_shap_features(shap_values)
     except Exception as e:
         logger.error(f"Error computing SHAP explanation: {e}")
-        return [["amount", 0.1], ["velocity_1h", 0.1]]
+        return [[["amount", 0.1], ["velocity_1h", 0.1]] for _ in range(len(X))]
+
+
+def compute_shap_explanation(features: np.ndarray) -> List[List]:
+    """Compute SHAP explanation for top features."""
+    return compute_shap_explanations(features)[0]
 
 
 def compute_ensemble_score(xgb_score: float, nn_score: float, rules_score: float) -> float:
-    """Compute weighted ensemble score."""
-    # Learned weights (in production, these would be optimized)
-    weights = {
-        'xgb': 0.5,
-        'nn': 0.3,
-        'rules': 0.2
-    }
-    
-    ensemble_score = (
-        weights['xgb'] * xgb_score +
-        weights['nn'] * nn_score +
-        weights['rules'] * rules_score
-    )
-    
-    return ensemble_score
+    """Compute weighted ensemble score; also accepts score arrays for batches."""
+    return XGB_WEIGHT * xgb_score + NN_WEIGHT * nn_score + RULES_WEIGHT * rules_score
 
 
 def calibrate_score(ensemble_score: float) -> float:
     """Apply Platt calibration to ensemble score."""
     # Simplified calibration (in production, use proper calibration)
-    # Sigmoid function for calibration
-    calibrated = 1 / (1 + np.exp(-5 * (ensemble_score - 0.5)))
-    return calibrated
+    # Sigmoid lookup for scores in [0, 1], exact sigmoid otherwise
+    if 0.0 <= ensemble_score <= 1.0:
+        return float(CALIBRATION_LUT[round(ensemble_score * CALIBRATION_STEPS)])
+    return 1 / (1 + math.exp(-5 * (ensemble_score - 0.5)))
+
+
+def calibrate_scores_batch(ensemble_scores: np.ndarray) -> np.ndarray:
+    """Apply Platt calibration to an array of ensemble scores."""
+    in_range = (ensemble_scores >= 0.0) & (ensemble_scores <= 1.0)
+    indices = np.rint(np.clip(ensemble_scores, 0.0, 1.0) * CALIBRATION_STEPS).astype(np.intp)
+    return np.where(in_range, CALIBRATION_LUT[indices], 1 / (1 + np.exp(-5 * (ensemble_scores - 0.5))))
 
 
-def score_feature_vector(feature_vector: FeatureVector) -> ScoreOutput:
+def score_feature_vector(feature_vector: FeatureVector, explain: bool = True) -> ScoreOutput:
     """Score a feature vector using ensemble models."""
     start_time = time.time()
     
     # Extract features
     features = extract_features(feature_vector)
     
+    # Identical inputs score identically; only the event id and timing differ. Keyed on the
+    # full-precision fields, since the rules score compares them before float32 rounding
+    cache_key = (tuple(feature_row(feature_vector)), explain)
+    with _score_cache_lock:
+        cached_output = _score_cache.get(cache_key)
+    if cached_output is not None:
+        return cached_output.model_copy(update={
+            "event_id": feature_vector.event_id,
+            "computation_time_ms": (time.time() - start_time) * 1000
+        })
+    
     # Compute individual scores
     xgb_score = compute_xgb_score(features)
     nn_score = compute_nn_score(features)
@@ -350,7 +770,7 @@ def score_feature_vector(feature_vector: FeatureVector) -> ScoreOutput:
     calibrated_score = calibrate_score(ensemble_score)
     
     # Compute explanation
-    top_features = compute_shap_explanation(features)
+    top_features = compute_shap_explanation(features) if explain else None
     
     # Create scores object
     scores = ModelScores(
@@ -361,12 +781,6 @@ def score_feature_vector(feature_vector: FeatureVector) -> ScoreOutput:
         calibrated=calibrated_score
     )
     
-    # Create explanation object
-    explain = FeatureExplanation(
-        top_features=top_features,
-        feature_importance={}
-    )
-    
     # Compute processing time
     computation_time = (time.time() - start_time) * 1000
     
@@ -374,35 +788,135 @@ def score_feature_vector(feature_vector: FeatureVector) -> ScoreOutput:
     score_output = ScoreOutput(
         event_id=feature_vector.event_id,
         scores=scores,
-        explain=explain,
+        explain=FeatureExplanation(top_features=top_features, feature_importance={}) if explain else None,
         model_version=model_version,
         computation_time_ms=computation_time
     )
     
+    with _score_cache_lock:
+        _score_cache[cache_key] = score_output
+    
     return score_output
 
 
-def process_feature_vector(feature_data: Dict[str, Any]):
+def score_feature_batch(feature_vectors: List[FeatureVector], explain: bool = True) -> List[ScoreOutput]:
+    """Score a batch of feature vectors with one model call per stage."""
+    start_time = time.time()
+    
+    X = extract_feature_matrix(feature_vectors)
+    xgb_scores = compute_xgb_scores(X)
+    nn_scores = compute_nn_scores(X)
+    rules_scores = compute_rule_scores_batch(X)
+    ensemble_scores = compute_ensemble_score(xgb_scores, nn_scores, rules_scores)
+    calibrated_scores = calibrate_scores_batch(ensemble_scores)
+    explanations = compute_shap_explanations(X) if explain else None
+    
+    outputs = []
+    for i, feature_vector in enumerate(feature_vectors):
+        outputs.append(ScoreOutput(
+            event_id=feature_vector.event_id,
+            scores=ModelScores(
+                xgb=float(xgb_scores[i]),
+                nn=float(nn_scores[i]),
+                rules=float(rules_scores[i]),
+                ensemble=float(ensemble_scores[i]),
+                calibrated=float(calibrated_scores[i])
+            ),
+            explain=FeatureExplanation(
+                top_features=explanations[i],
+                feature_importance={}
+            ) if explain else None,
+            model_version=model_version,
+            computation_time_ms=0.0
+        ))
+    
+    # Report the amortized per-event cost of the batch
+    computation_time = (time.time() - start_time) * 1000 / len(feature_vectors)
+    for output in outputs:
+        output.computation_time_ms = computation_time
+    
+    return outputs
+
+
+async def publish_explanations(feature_vectors: List[FeatureVector]):
+    """Compute SHAP explanations for scored events and publish them."""
+    try:
+        loop = asyncio.get_running_loop()
+        explanations = await loop.run_in_executor(
+            shap_executor, compute_shap_explanations, extract_feature_matrix(feature_vectors)
+        )
+        
+        producer = await get_kafka_producer()
+        for feature_vector, top_features in zip(feature_vectors, explanations):
+            await producer.send(
+                "alerts.explanations.v1",
+                key=feature_vector.entity_id,
+                value=orjson_dumps({
+                    "event_id": feature_vector.event_id,
+                    "model_version": model_version,
+                    "explain": {"top_features": top_features, "feature_importance": {}}
+                })
+            )
+        
+    except Exception as e:
+        logger.error(f"Error publishing explanations: {e}")
+
+
+def schedule_explanations(feature_vectors: List[FeatureVector]):
+    """Publish explanations in the background, keeping a reference to the task."""
+    task = asyncio.create_task(publish_explanations(feature_vectors))
+    explanation_tasks.add(task)
+    task.add_done_callback(explanation_tasks.discard)
+
+
+async def process_feature_batch(feature_vectors: List[FeatureVector]):
+    """Score a batch of feature vectors and publish the scores."""
+    try:
+        # Model inference releases the GIL, so score off the event loop
+        score_outputs = await asyncio.to_thread(
+            score_feature_batch, feature_vectors, not SHAP_ASYNC_ENABLED
+        )
+        
+        producer = await get_kafka_producer()
+        for feature_vector, score_output in zip(feature_vectors, score_outputs):
+            await producer.send(
+                "alerts.scores.v1",
+                key=feature_vector.entity_id,
+                value=to_json(score_output)
+            )
+        await producer.flush()
+        
+        if SHAP_ASYNC_ENABLED:
+            schedule_explanations(feature_vectors)
+        
+        logger.info(f"Scores generated for {len(feature_vectors)} events")
+        
+    except Exception as e:
+        logger.error(f"Error processing feature batch: {e}")
+
+
+async def process_feature_vector(feature_data: Dict[str, Any]):
     """Process a feature vector and publish scores."""
     try:
         # Parse feature vector
-        feature_vector = FeatureVector(**feature_data)
+        feature_vector = msgspec.convert(feature_data, FeatureVector)
         
         # Score the feature vector
-        score_output = score_feature_vector(feature_vector)
-        
-        # Convert to dict for Kafka
-        score_dict = score_output.dict()
-        score_dict["event_id"] = str(score_dict["event_id"])
+        score_output = await asyncio.to_thread(
+            score_feature_vector, feature_vector, not SHAP_ASYNC_ENABLED
+        )
         
-        # Publish to Kafka
-        producer = get_kafka_producer()
-        producer.send(
+        # Publish to Kafka, serialized straight from the model
+        producer = await get_kafka_producer()
+        await producer.send(
             "alerts.scores.v1",
             key=feature_vector.entity_id,
-            value=score_dict
+            value=to_json(score_output)
         )
         
+        if SHAP_ASYNC_ENABLED:
+            schedule_explanations([feature_vector])
+        
         logger.info(f"Scores generated for event: {feature_vector.event_id}")
         
     except Exception as e:
@@ -412,20 +926,29 @@ def process_feature_vector(feature_data: Dict[str, Any]):
 @app.on_event("startup")
 async def startup_event():
     """Initialize service on startup."""
+    global consumer_task
     logger.info("Starting Score Service")
     load_models()
-    get_kafka_consumer()
-    get_kafka_producer()
+    await get_kafka_producer()
+    await get_kafka_consumer()
+    # Consume on the same event loop as the HTTP handlers
+    consumer_task = asyncio.create_task(consume_features())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     global kafka_consumer, kafka_producer
+    if consumer_task:
+        consumer_task.cancel()
+    if explanation_tasks:
+        await asyncio.gather(*explanation_tasks, return_exceptions=True)
+    if shap_executor:
+        shap_executor.shutdown(wait=True, cancel_futures=True)
     if kafka_consumer:
-        kafka_consumer.close()
+        await kafka_consumer.stop()
     if kafka_producer:
-        kafka_producer.close()
+        await kafka_producer.stop()
     logger.info("Shutting down Score Service")
 
 
@@ -445,16 +968,13 @@ async def score_sync(feature_data: Dict[str, Any]):
     """Score a feature vector synchronously for testing."""
     try:
         # Parse feature vector
-        feature_vector = FeatureVector(**feature_data)
+        feature_vector = msgspec.convert(feature_data, FeatureVector)
         
         # Score the feature vector
-        score_output = score_feature_vector(feature_vector)
+        score_output = await asyncio.to_thread(score_feature_vector, feature_vector)
         
-        # Convert to dict for response
-        score_dict = score_output.dict()
-        score_dict["event_id"] = str(score_dict["event_id"])
-        
-        return score_dict
+        # Serialize straight from the model for the response
+        return Response(content=to_json(score_output), media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error scoring feature vector: {e}")
@@ -464,27 +984,34 @@ async def score_sync(feature_data: Dict[str, Any]):
         )
 
 
-def consume_features():
+async def consume_features():
     """Consume feature vectors from Kafka and score them."""
-    consumer = get_kafka_consumer()
+    consumer = await get_kafka_consumer()
     logger.info("Starting to consume feature vectors...")
     
-    for message in consumer:
-        try:
-            feature_data = message.value
-            process_feature_vector(feature_data)
-        except Exception as e:
-            logger.error(f"Error consuming message: {e}")
+    poll_timeout_ms = int(os.getenv("KAFKA_POLL_TIMEOUT_MS", "50"))
+    max_records = int(os.getenv("KAFKA_MAX_POLL_RECORDS", "256"))
+    
+    while True:
+        records = await consumer.getmany(timeout_ms=poll_timeout_ms, max_records=max_records)
+        if not records:
+            continue
+        
+        feature_vectors = []
+        for partition_records in records.values():
+            for message in partition_records:
+                try:
+                    feature_vectors.append(feature_decoder.decode(message.value))
+                except Exception as e:
+                    logger.error(f"Error consuming message: {e}")
+        
+        if feature_vectors:
+            await process_feature_batch(feature_vectors)
 
 
 if __name__ == "__main__":
     import uvicorn
-    import threading
-    
-    # Start consumer in background thread
-    consumer_thread = threading.Thread(target=consume_features, daemon=True)
-    consumer_thread.start()
     
-    # Start FastAPI server
+    # Start FastAPI server; the Kafka consumer starts with the app
     port = int(os.getenv("SCORE_SVC_PORT", 8003))
     uvicorn.run(app, host="0.0.0.0", port=port)
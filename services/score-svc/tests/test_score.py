@@ -0,0 +1,22 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+FV = {"event_id": "e1", "entity_id": "u1", "ts": "2025-01-01T00:00:00Z", "amount": 2500.0, "channel": "web",
+      "velocity_1h": 9, "ip_risk": 0.9, "geo_distance_km": 12.5, "merchant_risk": 0.3, "age_days": 30,
+      "device_fingerprint": "d"}
+
+def test_score():
+    r = TestClient(app).post("/score", json=FV)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["event_id"] == "e1"
+    assert set(body["scores"]) == {"xgb", "nn", "rules", "ensemble", "calibrated"}
+    assert body["scores"]["rules"] == 0.9
+
+def test_score_rejects_missing_or_invalid_fields():
+    c = TestClient(app)
+    assert c.post("/score", json={k: v for k, v in FV.items() if k != "ip_risk"}).status_code == 422
+    assert c.post("/score", json=dict(FV, amount="lots")).status_code == 422
+    assert c.post("/score", json=dict(FV, velocity_1h=1.5)).status_code == 422
+    assert c.post("/score", json=dict(FV, velocity_1h=True)).status_code == 422
+    assert c.post("/score", json=dict(FV, event_id=None)).status_code == 422
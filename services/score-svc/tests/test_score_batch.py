@@ -0,0 +1,19 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+def _fv(i, **kw):
+    fv = {"event_id": f"e{i}", "entity_id": "u1", "ts": "2025-01-01T00:00:00Z", "amount": 100.0 * i,
+          "channel": "web", "velocity_1h": i, "ip_risk": 0.1 * i, "geo_distance_km": 10.0 * i,
+          "merchant_risk": 0.05 * i, "age_days": 30, "device_fingerprint": "d"}
+    fv.update(kw)
+    return fv
+
+def test_batch_matches_single():
+    c = TestClient(app)
+    fvs = [_fv(i) for i in range(10)] + [_fv(10, amount=2500.0, velocity_1h=9, ip_risk=0.9)]
+    batch = c.post("/score/batch", json=fvs).json()
+    assert [b["event_id"] for b in batch] == [fv["event_id"] for fv in fvs]
+    for fv, b in zip(fvs, batch):
+        single = c.post("/score", json=fv).json()
+        assert b["scores"] == single["scores"]
+        assert b["explain"] == single["explain"]
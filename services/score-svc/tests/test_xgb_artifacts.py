@@ -0,0 +1,28 @@
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("xgboost")
+pytest.importorskip("torch")
+pytest.importorskip("shap")
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path[:0] = [os.path.join(ROOT, "services"), os.path.join(ROOT, "models", "fraud_xgb")]
+
+import main
+from train import FraudXGBModel
+
+def test_native_calibrated_artifacts_match_pickle(tmp_path):
+    trainer = FraudXGBModel(model_path=str(tmp_path))
+    trainer.train(trainer.generate_synthetic_data(n_samples=2000))
+
+    with open(tmp_path / f"{trainer.model_version}.pkl", "rb") as f:
+        calibrated = pickle.load(f)
+    native = main.load_calibrated_xgb(str(tmp_path / f"{trainer.model_version}_calibration.json"))
+
+    X = trainer.prepare_features(trainer.generate_synthetic_data(n_samples=200)).astype(np.float32)
+    np.testing.assert_allclose(native.predict_proba(X), calibrated.predict_proba(X), rtol=1e-5, atol=1e-6)
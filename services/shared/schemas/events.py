@@ -14,7 +14,7 @@ class TransactionEvent(BaseModel):
     entity_id: str = Field(..., description="Account or user identifier")
     timestamp: datetime = Field(..., description="ISO 8601 timestamp of the transaction")
     amount: float = Field(..., ge=0, description="Transaction amount")
-    currency: str = Field(..., regex=r"^[A-Z]{3}$", description="ISO 4217 currency code")
+    currency: str = Field(..., pattern=r"^[A-Z]{3}$", description="ISO 4217 currency code")
     channel: str = Field(..., description="Transaction channel")
     merchant_id: Optional[str] = Field(None, description="Merchant identifier")
     merchant_category: Optional[str] = Field(None, description="Merchant category code")
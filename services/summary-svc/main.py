@@ -1,16 +1,28 @@
 """Summary service with provider abstraction for event and case summarization."""
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
 import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 
+import httpx
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+# Optional SIMD regex engine for redacting large contexts
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,7 +33,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FraudOps Summary Service",
     description="Service for event and case summarization with provider abstraction",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -33,6 +46,85 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress summary payloads; batch responses in particular are mostly natural-language text
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
+
+# PII patterns, in match priority order
+_PII_PATTERNS = {
+    'email': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b',
+    'phone': r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b|\(\d{3}\)\s*\d{3}[-.]?\d{4}',
+    'card': r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b',
+    'ssn': r'\b\d{3}-\d{2}-\d{4}\b',
+}
+
+# Fused into one alternation so text is scanned once
+_PII_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _PII_PATTERNS.items()))
+
+_PII_LABELS = {
+    'email': '[EMAIL_REDACTED]',
+    'phone': '[PHONE_REDACTED]',
+    'card': '[CARD_REDACTED]',
+    'ssn': '[SSN_REDACTED]',
+}
+
+
+def _pii_label(match: re.Match) -> str:
+    return _PII_LABELS[match.lastgroup]
+
+
+# Inputs shorter than this stay on re; hyperscan's per-scan overhead only pays off on large text
+PII_HYPERSCAN_MIN_LENGTH = int(os.getenv("PII_HYPERSCAN_MIN_LENGTH", "4096"))
+_PII_HS_LABELS = [_PII_LABELS[name].encode() for name in _PII_PATTERNS]
+
+
+def _compile_pii_database():
+    """Compile the PII patterns into a hyperscan block-mode database."""
+    if hyperscan is None:
+        return None
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern in _PII_PATTERNS.values()],
+            ids=list(range(len(_PII_PATTERNS))),
+            elements=len(_PII_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_PII_PATTERNS)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Failed to compile hyperscan PII database, using re: {e}")
+        return None
+
+
+_PII_HS_DB = _compile_pii_database()
+
+
+def _redact_pii_hyperscan(text: str) -> Tuple[str, bool]:
+    """Redact PII with one hyperscan pass, resolving overlaps the way the fused regex does."""
+    data = text.encode()
+    matches = []
+    
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        matches.append((start, pattern_id, -end))
+    
+    _PII_HS_DB.scan(data, match_event_handler=on_match)
+    if not matches:
+        return text, False
+    
+    # hyperscan reports every match; keep the leftmost, then highest-priority pattern, then longest,
+    # and drop anything overlapping an earlier replacement
+    matches.sort()
+    redacted = bytearray()
+    pos = 0
+    for start, pattern_id, neg_end in matches:
+        if start < pos:
+            continue
+        redacted += data[pos:start]
+        redacted += _PII_HS_LABELS[pattern_id]
+        pos = -neg_end
+    redacted += data[pos:]
+    return redacted.decode(), True
+
 
 # Pydantic models
 class SummaryRequest(BaseModel):
@@ -50,30 +142,365 @@ class SummaryResponse(BaseModel):
     pii_redacted: bool
 
 
+# Shared provider helpers
+class _UnknownDefaults(dict):
+    """Mapping for str.format_map that renders missing fields as 'Unknown'."""
+    
+    def __missing__(self, key: str) -> str:
+        return 'Unknown'
+
+
+_EVENT_CONTEXT = (
+    "Event Details:\n"
+    "- Event ID: {event_id}\n"
+    "- Amount: {amount}\n"
+    "- Channel: {channel}\n"
+    "- Timestamp: {timestamp}"
+)
+_DECISION_CONTEXT = (
+    "\n\nDecision Details:\n"
+    "- Action: {action}\n"
+    "- Risk Score: {risk}\n"
+    "- Reasons: {reasons}"
+)
+_CASE_CONTEXT = (
+    "\n\nCase Details:\n"
+    "- Case ID: {case_id}\n"
+    "- Status: {status}\n"
+    "- Priority: {priority}\n"
+    "- Assigned To: {assigned_to}"
+)
+
+
+_MISSING = object()
+
+
+def event_amount(event_data: Dict[str, Any]) -> Any:
+    """Return the transaction amount, or the claim amount for claim events."""
+    amount = event_data.get('amount', _MISSING)
+    if amount is _MISSING:
+        return event_data.get('claim_amount', 'Unknown')
+    return amount
+
+
+def prepare_context(event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                    case_data: Optional[Dict[str, Any]] = None) -> str:
+    """Prepare context for summarization."""
+    context = _EVENT_CONTEXT.format_map(_UnknownDefaults(event_data, amount=event_amount(event_data)))
+    
+    if decision_data:
+        context += _DECISION_CONTEXT.format_map(
+            _UnknownDefaults(decision_data, reasons=', '.join(decision_data.get('reasons', [])))
+        )
+    
+    if case_data:
+        context += _CASE_CONTEXT.format_map(
+            _UnknownDefaults(case_data, assigned_to=case_data.get('assigned_to', 'Unassigned'))
+        )
+    
+    return context
+
+
+# Upper bound on prompt size; oversized reasons or case fields are cut rather than billed
+SUMMARY_MAX_CONTEXT_TOKENS = int(os.getenv("SUMMARY_MAX_CONTEXT_TOKENS", "1000"))
+
+
+def trim_context(text: str) -> str:
+    """Truncate a context to roughly SUMMARY_MAX_CONTEXT_TOKENS (~4 characters per token)."""
+    max_chars = SUMMARY_MAX_CONTEXT_TOKENS * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars] + "\n[TRUNCATED]"
+
+
+def redact_pii(text: str) -> Tuple[str, bool]:
+    """Redact PII from text, returning the redacted text and whether anything was redacted."""
+    if _PII_HS_DB is not None and len(text) > PII_HYPERSCAN_MIN_LENGTH:
+        return _redact_pii_hyperscan(text)
+    redacted, count = _PII_RE.subn(_pii_label, text)
+    return redacted, count > 0
+
+
+def fallback_summary(event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                     case_data: Optional[Dict[str, Any]] = None) -> str:
+    """Generate a basic summary when an LLM provider fails."""
+    event_id = event_data.get('event_id', 'Unknown')
+    amount = event_amount(event_data)
+    action = decision_data.get('action', 'Unknown') if decision_data else 'Unknown'
+    
+    summary = f"A transaction event {event_id} involving amount {amount} was processed through the fraud detection system. "
+    summary += f"The system made a decision to {action} the transaction based on risk assessment. "
+    
+    if case_data:
+        case_id = case_data.get('case_id', 'Unknown')
+        status = case_data.get('status', 'Unknown')
+        summary += f"A case {case_id} was created and is currently in {status} status for further investigation."
+    
+    return summary
+
+
+# LLM summaries for recently seen payloads; replays and re-fetches skip the provider call
+_summary_cache = TTLCache(
+    maxsize=int(os.getenv("SUMMARY_CACHE_MAXSIZE", "10000")),
+    ttl=int(os.getenv("SUMMARY_CACHE_TTL", "3600"))
+)
+
+
+def summary_cache_key(provider_name: str, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None,
+                      case_data: Optional[Dict[str, Any]] = None) -> bytes:
+    """Hash the provider and request payload into a summary cache key."""
+    payload = orjson.dumps([provider_name, event_data, decision_data, case_data], default=str,
+                           option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+# Bound in-flight LLM calls to what the provider's rate limits will actually serve
+_llm_semaphore = asyncio.Semaphore(int(os.getenv("SUMMARY_MAX_CONCURRENCY", "16")))
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client shared by an LLM provider's requests."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("SUMMARY_HTTP_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("SUMMARY_HTTP_MAX_KEEPALIVE", "100"))
+        ),
+        timeout=httpx.Timeout(float(os.getenv("SUMMARY_HTTP_TIMEOUT", "30.0")), connect=5.0)
+    )
+
+
+_SYSTEM_PROMPT = (
+    "You are a fraud analyst assistant. Generate a neutral, factual summary of fraud detection events in 120-180 "
+    "words. Focus on key details like transaction amounts, risk scores, decisions made, and case status. Do not "
+    "include any personal opinions or recommendations."
+)
+
+
+def summary_messages(redacted_context: str) -> List[Dict[str, str]]:
+    """Build the chat messages for summarizing one redacted context."""
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": f"Please summarize this fraud detection event:\n\n{redacted_context}"}
+    ]
+
+
+async def llm_summarize(provider: "SummaryProvider", model: str, event_data: Dict[str, Any],
+                        decision_data: Optional[Dict[str, Any]] = None,
+                        case_data: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
+    """Summarize one event with a single chat completion, caching successful summaries."""
+    cache_key = summary_cache_key(provider.get_provider_name(), event_data, decision_data, case_data)
+    cached_summary = _summary_cache.get(cache_key)
+    if cached_summary is not None:
+        return cached_summary
+    
+    try:
+        redacted_context, pii_redacted = redact_pii(prepare_context(event_data, decision_data, case_data))
+        redacted_context = trim_context(redacted_context)
+        async with _llm_semaphore:
+            response = await provider.client.chat.completions.create(
+                model=model,
+                messages=summary_messages(redacted_context),
+                max_tokens=300,
+                temperature=0.3
+            )
+        summary = response.choices[0].message.content.strip()
+    except Exception as e:
+        logger.error(f"Error generating {provider.get_provider_name()} summary: {e}")
+        return fallback_summary(event_data, decision_data, case_data), False
+    
+    # Only successful completions are cached; fallbacks retry the provider next time
+    _summary_cache[cache_key] = (summary, pii_redacted)
+    return summary, pii_redacted
+
+
+async def llm_summarize_stream(provider: "SummaryProvider", model: str, event_data: Dict[str, Any],
+                               decision_data: Optional[Dict[str, Any]] = None,
+                               case_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """Stream a summary's text as the LLM produces it, caching the completed summary."""
+    cache_key = summary_cache_key(provider.get_provider_name(), event_data, decision_data, case_data)
+    cached_summary = _summary_cache.get(cache_key)
+    if cached_summary is not None:
+        yield cached_summary[0]
+        return
+    
+    redacted_context, pii_redacted = redact_pii(prepare_context(event_data, decision_data, case_data))
+    redacted_context = trim_context(redacted_context)
+    parts = []
+    try:
+        async with _llm_semaphore:
+            stream = await provider.client.chat.completions.create(
+                model=model,
+                messages=summary_messages(redacted_context),
+                max_tokens=300,
+                temperature=0.3,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+    except Exception as e:
+        logger.error(f"Error streaming {provider.get_provider_name()} summary: {e}")
+        # Text already sent can't be retracted; only fall back if nothing was streamed
+        if not parts:
+            yield fallback_summary(event_data, decision_data, case_data)
+        return
+    
+    _summary_cache[cache_key] = ("".join(parts).strip(), pii_redacted)
+
+
+# Batch summarization: several redacted contexts per LLM call
+SUMMARY_BATCH_MAX_TOKENS = int(os.getenv("SUMMARY_BATCH_MAX_TOKENS", "4000"))
+SUMMARY_BATCH_MAX_ITEMS = int(os.getenv("SUMMARY_BATCH_MAX_ITEMS", "10"))
+
+_BATCH_SYSTEM_PROMPT = (
+    "You are a fraud analyst assistant. For each fraud detection event you are given, generate a neutral, "
+    "factual summary in 120-180 words. Focus on key details like transaction amounts, risk scores, decisions "
+    "made, and case status. Do not include any personal opinions or recommendations. Respond with only a JSON "
+    "array of summary strings, one per event, in the order the events were given."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for sizing batches."""
+    return len(text) // 4 + 1
+
+
+def split_batches(contexts: List[str]) -> List[List[int]]:
+    """Group context indices into sub-batches that fit the batch token and item limits."""
+    batches = []
+    current = []
+    current_tokens = 0
+    for i, context in enumerate(contexts):
+        tokens = estimate_tokens(context)
+        if current and (current_tokens + tokens > SUMMARY_BATCH_MAX_TOKENS or len(current) >= SUMMARY_BATCH_MAX_ITEMS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def batch_prompt(contexts: List[str]) -> str:
+    """Number the redacted contexts into a single user prompt."""
+    events = "\n\n".join(f"Event {i}:\n{context}" for i, context in enumerate(contexts, 1))
+    return f"Summarize each of the following {len(contexts)} fraud detection events:\n\n{events}"
+
+
+def parse_batch_summaries(content: str, expected: int) -> List[str]:
+    """Parse the JSON array of summaries returned for a batch prompt."""
+    # Tolerate markdown fences or preamble around the array
+    start = content.find('[')
+    end = content.rfind(']')
+    if start == -1 or end < start:
+        raise ValueError("Batch response does not contain a JSON array")
+    summaries = orjson.loads(content[start:end + 1])
+    if len(summaries) != expected or not all(isinstance(summary, str) for summary in summaries):
+        raise ValueError(f"Expected {expected} summaries in batch response, got {len(summaries)}")
+    return [summary.strip() for summary in summaries]
+
+
+async def llm_summarize_batch(provider: "SummaryProvider", model: str,
+                              requests: List["SummaryRequest"]) -> List[Tuple[str, bool]]:
+    """Summarize requests with one chat completion per sub-batch, reusing cached summaries."""
+    provider_name = provider.get_provider_name()
+    keys = [summary_cache_key(provider_name, r.event_data, r.decision_data, r.case_data) for r in requests]
+    summaries = [_summary_cache.get(key) for key in keys]
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+    redacted = [redact_pii(prepare_context(requests[i].event_data, requests[i].decision_data, requests[i].case_data))
+                for i in pending]
+    contexts = [trim_context(context) for context, _ in redacted]
+    
+    async def summarize_sub_batch(batch: List[int]) -> None:
+        indices = [pending[j] for j in batch]
+        try:
+            async with _llm_semaphore:
+                response = await provider.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": _BATCH_SYSTEM_PROMPT},
+                        {"role": "user", "content": batch_prompt([contexts[j] for j in batch])}
+                    ],
+                    max_tokens=300 * len(batch),
+                    temperature=0.3
+                )
+            batch_summaries = [
+                (summary, redacted[j][1])
+                for j, summary in zip(batch, parse_batch_summaries(response.choices[0].message.content, len(batch)))
+            ]
+        except Exception as e:
+            logger.error(f"Error generating batch summary: {e}")
+            # Fall back to one call per request; summarize() handles its own fallback and caching
+            batch_summaries = await asyncio.gather(*(
+                provider.summarize(requests[i].event_data, requests[i].decision_data, requests[i].case_data)
+                for i in indices
+            ))
+        else:
+            for i, summary in zip(indices, batch_summaries):
+                _summary_cache[keys[i]] = summary
+        for i, summary in zip(indices, batch_summaries):
+            summaries[i] = summary
+    
+    await asyncio.gather(*(summarize_sub_batch(batch) for batch in split_batches(contexts)))
+    return summaries
+
+
 # Abstract base class for summary providers
 class SummaryProvider(ABC):
     """Abstract base class for summary providers."""
     
     @abstractmethod
-    def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                 case_data: Optional[Dict[str, Any]] = None) -> str:
-        """Generate a summary of the event, decision, and case data."""
+    async def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                 case_data: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
+        """Generate a summary of the event, decision, and case data, and whether PII was redacted."""
         pass
     
+    async def summarize_stream(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None,
+                               case_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Yield the summary text in chunks; providers without streaming yield it whole."""
+        summary, _ = await self.summarize(event_data, decision_data, case_data)
+        yield summary
+    
+    async def summarize_batch(self, requests: List["SummaryRequest"]) -> List[Tuple[str, bool]]:
+        """Generate summaries for several requests, in request order."""
+        return list(await asyncio.gather(*(
+            self.summarize(r.event_data, r.decision_data, r.case_data) for r in requests
+        )))
+    
     @abstractmethod
     def get_provider_name(self) -> str:
         """Get the provider name."""
         pass
+    
+    async def verify(self) -> None:
+        """Check that the provider is usable; raise if it is misconfigured."""
+        pass
+    
+    async def close(self) -> None:
+        """Release provider resources."""
+        pass
 
 
 class NoneProvider(SummaryProvider):
     """No-op provider that returns a basic summary."""
     
-    def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                 case_data: Optional[Dict[str, Any]] = None) -> str:
+    async def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                 case_data: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
         """Generate a basic summary without external services."""
+        return self.basic_summary(event_data, decision_data, case_data), False
+    
+    async def summarize_batch(self, requests: List["SummaryRequest"]) -> List[Tuple[str, bool]]:
+        """Generate basic summaries inline; nothing here awaits, so no tasks are scheduled."""
+        return [(self.basic_summary(r.event_data, r.decision_data, r.case_data), False) for r in requests]
+    
+    def basic_summary(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                      case_data: Optional[Dict[str, Any]] = None) -> str:
+        """Build the basic summary text."""
         event_id = event_data.get('event_id', 'Unknown')
-        amount = event_data.get('amount', event_data.get('claim_amount', 'Unknown'))
+        amount = event_amount(event_data)
         action = decision_data.get('action', 'Unknown') if decision_data else 'Unknown'
         
         summary = f"Transaction {event_id} for amount {amount} was processed with decision {action}. "
@@ -99,109 +526,35 @@ class OpenAIProvider(SummaryProvider):
         
         try:
             import openai
-            self.client = openai.OpenAI(api_key=self.api_key)
+            self.http_client = build_http_client()
+            self.client = openai.AsyncOpenAI(api_key=self.api_key, http_client=self.http_client)
         except ImportError:
             raise ImportError("openai package is required for OpenAI provider")
     
-    def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                 case_data: Optional[Dict[str, Any]] = None) -> str:
+    async def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                 case_data: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
         """Generate a summary using OpenAI."""
-        try:
-            # Prepare context
-            context = self._prepare_context(event_data, decision_data, case_data)
-            
-            # Redact PII
-            redacted_context = self._redact_pii(context)
-            
-            # Generate summary
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a fraud analyst assistant. Generate a neutral, factual summary of fraud detection events in 120-180 words. Focus on key details like transaction amounts, risk scores, decisions made, and case status. Do not include any personal opinions or recommendations."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please summarize this fraud detection event:\n\n{redacted_context}"
-                    }
-                ],
-                max_tokens=300,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error generating OpenAI summary: {e}")
-            # Fallback to basic summary
-            return self._generate_fallback_summary(event_data, decision_data, case_data)
+        return await llm_summarize(self, "gpt-3.5-turbo", event_data, decision_data, case_data)
+    
+    def summarize_stream(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None,
+                         case_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Stream a summary from OpenAI as tokens arrive."""
+        return llm_summarize_stream(self, "gpt-3.5-turbo", event_data, decision_data, case_data)
+    
+    async def summarize_batch(self, requests: List[SummaryRequest]) -> List[Tuple[str, bool]]:
+        """Generate summaries for several requests using batched OpenAI calls."""
+        return await llm_summarize_batch(self, "gpt-3.5-turbo", requests)
     
     def get_provider_name(self) -> str:
         return "openai"
     
-    def _prepare_context(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                        case_data: Optional[Dict[str, Any]] = None) -> str:
-        """Prepare context for summarization."""
-        context_parts = []
-        
-        # Event data
-        context_parts.append("Event Details:")
-        context_parts.append(f"- Event ID: {event_data.get('event_id', 'Unknown')}")
-        context_parts.append(f"- Amount: {event_data.get('amount', event_data.get('claim_amount', 'Unknown'))}")
-        context_parts.append(f"- Channel: {event_data.get('channel', 'Unknown')}")
-        context_parts.append(f"- Timestamp: {event_data.get('timestamp', 'Unknown')}")
-        
-        # Decision data
-        if decision_data:
-            context_parts.append("\nDecision Details:")
-            context_parts.append(f"- Action: {decision_data.get('action', 'Unknown')}")
-            context_parts.append(f"- Risk Score: {decision_data.get('risk', 'Unknown')}")
-            context_parts.append(f"- Reasons: {', '.join(decision_data.get('reasons', []))}")
-        
-        # Case data
-        if case_data:
-            context_parts.append("\nCase Details:")
-            context_parts.append(f"- Case ID: {case_data.get('case_id', 'Unknown')}")
-            context_parts.append(f"- Status: {case_data.get('status', 'Unknown')}")
-            context_parts.append(f"- Priority: {case_data.get('priority', 'Unknown')}")
-            context_parts.append(f"- Assigned To: {case_data.get('assigned_to', 'Unassigned')}")
-        
-        return "\n".join(context_parts)
-    
-    def _redact_pii(self, text: str) -> str:
-        """Redact PII from text."""
-        # Email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', text)
-        
-        # Phone numbers (various formats)
-        text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE_REDACTED]', text)
-        text = re.sub(r'\(\d{3}\)\s*\d{3}[-.]?\d{4}', '[PHONE_REDACTED]', text)
-        
-        # Credit card numbers (basic pattern)
-        text = re.sub(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD_REDACTED]', text)
-        
-        # SSN (basic pattern)
-        text = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '[SSN_REDACTED]', text)
-        
-        return text
+    async def verify(self) -> None:
+        """Check credentials with a cheap models listing."""
+        await self.client.models.list(timeout=2.0)
     
-    def _generate_fallback_summary(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                                  case_data: Optional[Dict[str, Any]] = None) -> str:
-        """Generate a fallback summary when OpenAI fails."""
-        event_id = event_data.get('event_id', 'Unknown')
-        amount = event_data.get('amount', event_data.get('claim_amount', 'Unknown'))
-        action = decision_data.get('action', 'Unknown') if decision_data else 'Unknown'
-        
-        summary = f"A transaction event {event_id} involving amount {amount} was processed through the fraud detection system. "
-        summary += f"The system made a decision to {action} the transaction based on risk assessment. "
-        
-        if case_data:
-            case_id = case_data.get('case_id', 'Unknown')
-            status = case_data.get('status', 'Unknown')
-            summary += f"A case {case_id} was created and is currently in {status} status for further investigation."
-        
-        return summary
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.http_client.aclose()
 
 
 class AzureAIProvider(SummaryProvider):
@@ -216,114 +569,41 @@ class AzureAIProvider(SummaryProvider):
             raise ValueError("AZURE_OPENAI_ENDPOINT and AZURE_OPENAI_API_KEY environment variables are required")
         
         try:
-            from azure.ai.openai import AzureOpenAI
-            self.client = AzureOpenAI(
+            from openai import AsyncAzureOpenAI
+            self.http_client = build_http_client()
+            self.client = AsyncAzureOpenAI(
                 azure_endpoint=self.endpoint,
                 api_key=self.api_key,
-                api_version=self.api_version
+                api_version=self.api_version,
+                http_client=self.http_client
             )
         except ImportError:
-            raise ImportError("azure-ai-openai package is required for Azure AI provider")
+            raise ImportError("openai package is required for Azure AI provider")
     
-    def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                 case_data: Optional[Dict[str, Any]] = None) -> str:
+    async def summarize(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
+                 case_data: Optional[Dict[str, Any]] = None) -> Tuple[str, bool]:
         """Generate a summary using Azure OpenAI."""
-        try:
-            # Prepare context
-            context = self._prepare_context(event_data, decision_data, case_data)
-            
-            # Redact PII
-            redacted_context = self._redact_pii(context)
-            
-            # Generate summary
-            response = self.client.chat.completions.create(
-                model="gpt-35-turbo",  # Azure model name
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a fraud analyst assistant. Generate a neutral, factual summary of fraud detection events in 120-180 words. Focus on key details like transaction amounts, risk scores, decisions made, and case status. Do not include any personal opinions or recommendations."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please summarize this fraud detection event:\n\n{redacted_context}"
-                    }
-                ],
-                max_tokens=300,
-                temperature=0.3
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error generating Azure AI summary: {e}")
-            # Fallback to basic summary
-            return self._generate_fallback_summary(event_data, decision_data, case_data)
+        return await llm_summarize(self, "gpt-35-turbo", event_data, decision_data, case_data)
+    
+    def summarize_stream(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None,
+                         case_data: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Stream a summary from Azure OpenAI as tokens arrive."""
+        return llm_summarize_stream(self, "gpt-35-turbo", event_data, decision_data, case_data)
+    
+    async def summarize_batch(self, requests: List[SummaryRequest]) -> List[Tuple[str, bool]]:
+        """Generate summaries for several requests using batched Azure OpenAI calls."""
+        return await llm_summarize_batch(self, "gpt-35-turbo", requests)
     
     def get_provider_name(self) -> str:
         return "azureai"
     
-    def _prepare_context(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                        case_data: Optional[Dict[str, Any]] = None) -> str:
-        """Prepare context for summarization."""
-        context_parts = []
-        
-        # Event data
-        context_parts.append("Event Details:")
-        context_parts.append(f"- Event ID: {event_data.get('event_id', 'Unknown')}")
-        context_parts.append(f"- Amount: {event_data.get('amount', event_data.get('claim_amount', 'Unknown'))}")
-        context_parts.append(f"- Channel: {event_data.get('channel', 'Unknown')}")
-        context_parts.append(f"- Timestamp: {event_data.get('timestamp', 'Unknown')}")
-        
-        # Decision data
-        if decision_data:
-            context_parts.append("\nDecision Details:")
-            context_parts.append(f"- Action: {decision_data.get('action', 'Unknown')}")
-            context_parts.append(f"- Risk Score: {decision_data.get('risk', 'Unknown')}")
-            context_parts.append(f"- Reasons: {', '.join(decision_data.get('reasons', []))}")
-        
-        # Case data
-        if case_data:
-            context_parts.append("\nCase Details:")
-            context_parts.append(f"- Case ID: {case_data.get('case_id', 'Unknown')}")
-            context_parts.append(f"- Status: {case_data.get('status', 'Unknown')}")
-            context_parts.append(f"- Priority: {case_data.get('priority', 'Unknown')}")
-            context_parts.append(f"- Assigned To: {case_data.get('assigned_to', 'Unassigned')}")
-        
-        return "\n".join(context_parts)
+    async def verify(self) -> None:
+        """Check credentials with a cheap models listing."""
+        await self.client.models.list(timeout=2.0)
     
-    def _redact_pii(self, text: str) -> str:
-        """Redact PII from text."""
-        # Email addresses
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[EMAIL_REDACTED]', text)
-        
-        # Phone numbers (various formats)
-        text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE_REDACTED]', text)
-        text = re.sub(r'\(\d{3}\)\s*\d{3}[-.]?\d{4}', '[PHONE_REDACTED]', text)
-        
-        # Credit card numbers (basic pattern)
-        text = re.sub(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', '[CARD_REDACTED]', text)
-        
-        # SSN (basic pattern)
-        text = re.sub(r'\b\d{3}-\d{2}-\d{4}\b', '[SSN_REDACTED]', text)
-        
-        return text
-    
-    def _generate_fallback_summary(self, event_data: Dict[str, Any], decision_data: Optional[Dict[str, Any]] = None, 
-                                  case_data: Optional[Dict[str, Any]] = None) -> str:
-        """Generate a fallback summary when Azure AI fails."""
-        event_id = event_data.get('event_id', 'Unknown')
-        amount = event_data.get('amount', event_data.get('claim_amount', 'Unknown'))
-        action = decision_data.get('action', 'Unknown') if decision_data else 'Unknown'
-        
-        summary = f"A transaction event {event_id} involving amount {amount} was processed through the fraud detection system. "
-        summary += f"The system made a decision to {action} the transaction based on risk assessment. "
-        
-        if case_data:
-            case_id = case_data.get('case_id', 'Unknown')
-            status = case_data.get('status', 'Unknown')
-            summary += f"A case {case_id} was created and is currently in {status} status for further investigation."
-        
-        return summary
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.http_client.aclose()
 
 
 # Provider factory
@@ -338,31 +618,53 @@ def create_provider() -> SummaryProvider:
     elif provider_name == "azureai":
         return AzureAIProvider()
     else:
-        logger.warning(f"Unknown provider {provider_name}, falling back to none")
-        return NoneProvider()
+        raise ValueError(f"Unknown summary provider: {provider_name}")
+
+
+def detect_available_providers() -> List[str]:
+    """List the providers whose credentials are configured."""
+    providers = ["none"]
+    
+    # Check if OpenAI is available
+    if os.getenv("OPENAI_API_KEY"):
+        providers.append("openai")
+    
+    # Check if Azure AI is available
+    if os.getenv("AZURE_OPENAI_ENDPOINT") and os.getenv("AZURE_OPENAI_API_KEY"):
+        providers.append("azureai")
+    
+    return providers
 
 
 # Global provider instance
 summary_provider = None
+# Provider credentials are fixed for the container's lifetime; resolved once at startup
+available_providers = ["none"]
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize service on startup."""
-    global summary_provider
+    global summary_provider, available_providers
     logger.info("Starting Summary Service")
+    available_providers = detect_available_providers()
+    # A misconfigured provider fails startup instead of silently degrading to no-op summaries
+    provider = create_provider()
     try:
-        summary_provider = create_provider()
-        logger.info(f"Summary provider initialized: {summary_provider.get_provider_name()}")
-    except Exception as e:
-        logger.error(f"Error initializing summary provider: {e}")
-        summary_provider = NoneProvider()
+        await provider.verify()
+    except Exception:
+        await provider.close()
+        raise
+    summary_provider = provider
+    logger.info(f"Summary provider initialized: {summary_provider.get_provider_name()}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Summary Service")
+    if summary_provider:
+        await summary_provider.close()
 
 
 @app.get("/health")
@@ -375,6 +677,30 @@ async def health_check():
     }
 
 
+def summary_payload(summary: str, pii_redacted: bool, provider_name: str) -> Dict[str, Any]:
+    """Build a SummaryResponse body.
+    
+    Fields are built here from trusted values, so endpoints return this dict directly
+    and skip response_model re-validation.
+    """
+    return {
+        "summary": summary,
+        "provider": provider_name,
+        "word_count": len(summary.split()),
+        "pii_redacted": pii_redacted
+    }
+
+
+async def build_summary_response(request: SummaryRequest) -> Dict[str, Any]:
+    """Summarize a request with the active provider and build the response body."""
+    summary, pii_redacted = await summary_provider.summarize(
+        request.event_data,
+        request.decision_data,
+        request.case_data
+    )
+    return summary_payload(summary, pii_redacted, summary_provider.get_provider_name())
+
+
 @app.post("/summaries/{case_id}", response_model=SummaryResponse)
 async def generate_summary(case_id: str, request: SummaryRequest):
     """Generate a summary for a case."""
@@ -385,27 +711,7 @@ async def generate_summary(case_id: str, request: SummaryRequest):
                 detail="Summary provider not available"
             )
         
-        # Generate summary
-        summary = summary_provider.summarize(
-            request.event_data,
-            request.decision_data,
-            request.case_data
-        )
-        
-        # Count words
-        word_count = len(summary.split())
-        
-        # Check if PII was redacted (basic check)
-        pii_redacted = any(marker in summary for marker in [
-            '[EMAIL_REDACTED]', '[PHONE_REDACTED]', '[CARD_REDACTED]', '[SSN_REDACTED]'
-        ])
-        
-        return SummaryResponse(
-            summary=summary,
-            provider=summary_provider.get_provider_name(),
-            word_count=word_count,
-            pii_redacted=pii_redacted
-        )
+        return ORJSONResponse(await build_summary_response(request))
         
     except Exception as e:
         logger.error(f"Error generating summary: {e}")
@@ -415,6 +721,37 @@ async def generate_summary(case_id: str, request: SummaryRequest):
         )
 
 
+def sse_event(data: str) -> str:
+    """Frame text as a server-sent event, prefixing every line with 'data:'."""
+    return "".join(f"data: {line}\n" for line in data.split("\n")) + "\n"
+
+
+@app.post("/summaries/{case_id}/stream")
+async def stream_summary(case_id: str, request: SummaryRequest):
+    """Stream a case summary as server-sent events while it is generated."""
+    if not summary_provider:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Summary provider not available"
+        )
+    
+    async def events() -> AsyncIterator[str]:
+        async for text in summary_provider.summarize_stream(
+            request.event_data,
+            request.decision_data,
+            request.case_data
+        ):
+            yield sse_event(text)
+        yield sse_event("[DONE]")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # identity keeps GZipMiddleware from buffering the stream; no-cache/no-buffering for proxies
+        headers={"Content-Encoding": "identity", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/summaries/event", response_model=SummaryResponse)
 async def generate_event_summary(request: SummaryRequest):
     """Generate a summary for an event."""
@@ -425,51 +762,47 @@ async def generate_event_summary(request: SummaryRequest):
                 detail="Summary provider not available"
             )
         
-        # Generate summary
-        summary = summary_provider.summarize(
-            request.event_data,
-            request.decision_data,
-            request.case_data
+        return ORJSONResponse(await build_summary_response(request))
+        
+    except Exception as e:
+        logger.error(f"Error generating event summary: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error generating event summary"
         )
+
+
+@app.post("/summaries:batch", response_model=List[SummaryResponse])
+async def generate_batch_summaries(requests: List[SummaryRequest]):
+    """Generate summaries for a batch of events or cases."""
+    try:
+        if not summary_provider:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Summary provider not available"
+            )
         
-        # Count words
-        word_count = len(summary.split())
+        # Generate summaries
+        summaries = await summary_provider.summarize_batch(requests)
         
-        # Check if PII was redacted (basic check)
-        pii_redacted = any(marker in summary for marker in [
-            '[EMAIL_REDACTED]', '[PHONE_REDACTED]', '[CARD_REDACTED]', '[SSN_REDACTED]'
+        provider_name = summary_provider.get_provider_name()
+        return ORJSONResponse([
+            summary_payload(summary, pii_redacted, provider_name) for summary, pii_redacted in summaries
         ])
         
-        return SummaryResponse(
-            summary=summary,
-            provider=summary_provider.get_provider_name(),
-            word_count=word_count,
-            pii_redacted=pii_redacted
-        )
-        
     except Exception as e:
-        logger.error(f"Error generating event summary: {e}")
+        logger.error(f"Error generating batch summaries: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error generating event summary"
+            detail="Error generating batch summaries"
         )
 
 
 @app.get("/providers")
 async def get_available_providers():
     """Get available summary providers."""
-    providers = ["none"]
-    
-    # Check if OpenAI is available
-    if os.getenv("OPENAI_API_KEY"):
-        providers.append("openai")
-    
-    # Check if Azure AI is available
-    if os.getenv("AZURE_OPENAI_ENDPOINT") and os.getenv("AZURE_OPENAI_API_KEY"):
-        providers.append("azureai")
-    
     return {
-        "available_providers": providers,
+        "available_providers": available_providers,
         "current_provider": summary_provider.get_provider_name() if summary_provider else "none"
     }
 
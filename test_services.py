@@ -6,6 +6,12 @@ import requests
 import json
 import time
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Keep-alive session shared by all checks so each call reuses a pooled connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
 
 def test_gateway_auth():
     """Test JWT authentication"""
@@ -14,7 +20,7 @@ def test_gateway_auth():
     # Test login
     login_data = {"username": "sup:gerria", "password": "x"}
     try:
-        response = requests.post("http://localhost:8001/auth/login", json=login_data)
+        response = SESSION.post("http://localhost:8001/auth/login", json=login_data)
         if response.status_code == 200:
             token_data = response.json()
             token = token_data["access_token"]
@@ -50,7 +56,7 @@ def test_score_service(token):
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
     try:
-        response = requests.post("http://localhost:8001/score", json=test_data, headers=headers)
+        response = SESSION.post("http://localhost:8001/score", json=test_data, headers=headers)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Score service working: {result}")
@@ -81,7 +87,7 @@ def test_decision_service(token, score_result):
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
     try:
-        response = requests.post("http://localhost:8001/decide", json=test_data, headers=headers)
+        response = SESSION.post("http://localhost:8001/decide", json=test_data, headers=headers)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Decision service working: {result}")
@@ -114,7 +120,7 @@ def test_case_service(token, decision_result):
         headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
         
         try:
-            response = requests.post("http://localhost:8001/cases", json=test_data, headers=headers)
+            response = SESSION.post("http://localhost:8001/cases", json=test_data, headers=headers)
             if response.status_code == 200:
                 result = response.json()
                 print(f"✅ Case service working: {result}")
@@ -146,7 +152,7 @@ def test_model_monitor(token, score_result):
     headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
     try:
-        response = requests.post("http://localhost:8001/monitor/ingest-score", json=monitor_data, headers=headers)
+        response = SESSION.post("http://localhost:8001/monitor/ingest-score", json=monitor_data, headers=headers)
         if response.status_code == 200:
             result = response.json()
             print(f"✅ Model monitor working: {result}")
@@ -163,7 +169,7 @@ def test_prometheus_metrics():
     print("\n📈 Testing Prometheus metrics...")
     
     try:
-        response = requests.get("http://localhost:8005/metrics")
+        response = SESSION.get("http://localhost:8005/metrics")
         if response.status_code == 200:
             metrics = response.text
             if "monitor_requests_total" in metrics:
@@ -191,12 +197,15 @@ def main():
     
     # Test end-to-end flow
     score_result = test_score_service(token)
-    decision_result = test_decision_service(token, score_result)
-    case_result = test_case_service(token, decision_result)
-    monitor_result = test_model_monitor(token, score_result)
     
-    # Test monitoring
-    prometheus_ok = test_prometheus_metrics()
+    # The monitor and metrics checks don't depend on the decision/case chain; overlap them
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        monitor_future = executor.submit(test_model_monitor, token, score_result)
+        prometheus_future = executor.submit(test_prometheus_metrics)
+        decision_result = test_decision_service(token, score_result)
+        case_result = test_case_service(token, decision_result)
+        monitor_result = monitor_future.result()
+        prometheus_ok = prometheus_future.result()
     
     # Summary
     print("\n" + "=" * 60)
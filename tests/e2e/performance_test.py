@@ -3,28 +3,189 @@ End-to-end performance testing for the fraud detection platform
 """
 import asyncio
 import aiohttp
+import numpy as np
+import orjson
 import time
-import statistics
 import json
-from typing import List, Dict, Any
+from collections import Counter, deque
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 import random
+import sys
+
+# Decision actions that open a case
+CASE_ACTIONS = frozenset(("hold", "block"))
+
+# Score fields the decide stage consumes; the gateway projects the response down to these
+SCORE_FIELDS = "event_id,scores.calibrated"
+
+
+class LatencyReservoir:
+    """Fixed-size uniform sample of latencies with an exact running count and mean
+    
+    Memory stays O(capacity) however many requests a run makes, so the harness does not
+    skew its own latency measurements with allocator and GC pressure.
+    """
+    
+    def __init__(self, capacity: int = 100_000, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.samples = np.empty(capacity, dtype=np.float64)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._rng = random.Random(seed)
+    
+    def append(self, latency: float):
+        """Record one latency (reservoir sampling, Algorithm R)"""
+        # Welford's single-pass update keeps the mean and variance exact without the full history
+        self.count += 1
+        delta = latency - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (latency - self.mean)
+        if self.count <= self.capacity:
+            self.samples[self.count - 1] = latency
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self.capacity:
+                self.samples[slot] = latency
+    
+    def extend(self, latencies: List[float]):
+        for latency in latencies:
+            self.append(latency)
+    
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of every recorded latency"""
+        return (self._m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+    
+    def values(self) -> np.ndarray:
+        """The retained sample"""
+        return self.samples[:min(self.count, self.capacity)]
+    
+    def percentile(self, q):
+        return np.percentile(self.values(), q)
+    
+    def __len__(self) -> int:
+        return self.count
+
+class StageBatcher:
+    """Micro-batches requests for one pipeline stage and hands results back to each awaiter"""
+    
+    def __init__(self, single: Callable[[Any], Awaitable[Any]],
+                 batch: Optional[Callable[[List[Any]], Awaitable[Optional[List[Any]]]]] = None,
+                 max_batch: int = 32, batch_ms: float = 5.0):
+        self.single = single
+        self.batch = batch
+        self.max_batch = max_batch
+        self.batch_ms = batch_ms
+        self.queue = asyncio.Queue()
+        self.flushes = set()
+    
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((item, future))
+        return await future
+    
+    async def run(self):
+        """Collect items until the batch is full or the window closes, then flush without blocking"""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]
+            deadline = loop.time() + self.batch_ms / 1000
+            while len(pending) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            task = asyncio.create_task(self.flush(pending))
+            self.flushes.add(task)
+            task.add_done_callback(self.flushes.discard)
+    
+    async def flush(self, pending: List):
+        """Send one batch call, or individual calls if the server has no batch endpoint"""
+        items = [item for item, _ in pending]
+        try:
+            results = None
+            if self.batch is not None:
+                results = await self.batch(items)
+                if results is None:
+                    # Batch endpoint unsupported; stop trying it
+                    self.batch = None
+            if results is None:
+                results = await asyncio.gather(*(self.single(item) for item in items))
+            for (_, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
 
 class PerformanceTest:
     """Performance testing suite for the fraud detection platform"""
     
-    def __init__(self, base_url: str = "http://localhost:8001"):
+    def __init__(self, base_url: str = "http://localhost:8001", max_connections: int = 50,
+                 max_batch: int = 32, batch_ms: float = 5.0, seed: Optional[int] = None):
         self.base_url = base_url
+        # Per-instance generator: reproducible runs for A/B comparisons, no shared global state
+        self.np_rng = np.random.default_rng(seed)
+        self.max_connections = max_connections
+        self.max_batch = max_batch
+        self.batch_ms = batch_ms
+        self.session = None
+        self.stages = None
         self.auth_token = None
+        # Request headers are fixed once authenticated; built once, shared by every POST
+        self.headers = {"Content-Type": "application/json"}
         self.results = {
-            "score_latencies": [],
-            "decision_latencies": [],
-            "case_latencies": [],
+            "score_latencies": LatencyReservoir(),
+            "decision_latencies": LatencyReservoir(),
+            "case_latencies": LatencyReservoir(),
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
-            "errors": []
+            # Bounded error bookkeeping: O(1) counts per (stage, status) plus the latest samples
+            "error_counts": Counter(),
+            "error_samples": deque(maxlen=100)
         }
     
+    async def __aenter__(self):
+        """Open a pooled session shared by every run_load_test call"""
+        self.session = self.create_session(self.max_connections)
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        self.session = None
+    
+    def record_error(self, stage: str, kind: Any, detail: Optional[str] = None, count: int = 1):
+        """Count a failure under (stage, kind) and keep `detail` as a recent sample"""
+        self.results["error_counts"][(stage, kind)] += count
+        if detail is not None:
+            self.results["error_samples"].append(f"{stage} {kind}: {detail}")
+    
+    def wants_error_sample(self) -> bool:
+        """Only read failed response bodies while the sample buffer has room"""
+        samples = self.results["error_samples"]
+        return len(samples) < samples.maxlen
+    
+    def create_session(self, max_connections: int) -> aiohttp.ClientSession:
+        """Create a keep-alive session sized for the given concurrency"""
+        connector = aiohttp.TCPConnector(
+            limit=max_connections,
+            limit_per_host=max_connections,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+            force_close=False
+        )
+        timeout = aiohttp.ClientTimeout(total=30)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+    
     async def authenticate(self, session: aiohttp.ClientSession):
         """Authenticate and get JWT token"""
         auth_data = {
@@ -36,55 +197,122 @@ class PerformanceTest:
             if response.status == 200:
                 data = await response.json()
                 self.auth_token = data["access_token"]
+                self.headers = {
+                    "Authorization": f"Bearer {self.auth_token}",
+                    "Content-Type": "application/json"
+                }
                 return True
             return False
     
-    def generate_transaction_data(self, event_id: str) -> Dict[str, Any]:
-        """Generate realistic transaction data for testing"""
+    def decision_payload(self, score_data: Dict[str, Any], transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the /decide request body for a scored transaction"""
         return {
-            "event_id": event_id,
-            "entity_id": f"acct_{random.randint(1000, 9999)}",
-            "ts": "2025-10-21T21:10:11Z",
-            "amount": random.uniform(10.0, 5000.0),
-            "channel": random.choice(["web", "mobile", "api"]),
-            "velocity_1h": random.randint(1, 20),
-            "ip_risk": random.uniform(0.0, 1.0),
-            "geo_distance_km": random.uniform(0.0, 2000.0),
-            "merchant_risk": random.uniform(0.0, 1.0),
-            "age_days": random.randint(1, 365),
-            "device_fingerprint": f"device_{random.randint(100000, 999999)}",
-            "features_version": "v1"
+            "event_id": score_data["event_id"],
+            "entity_id": transaction_data["entity_id"],
+            "channel": transaction_data["channel"],
+            "scores": {"calibrated": score_data["scores"]["calibrated"]},
+            "features": {
+                "velocity_1h": transaction_data["velocity_1h"],
+                "ip_risk": transaction_data["ip_risk"]
+            }
         }
     
-    async def score_transaction(self, session: aiohttp.ClientSession, 
-                              transaction_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Score a single transaction"""
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
+    def case_payload(self, decision_data: Dict[str, Any], transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the /cases request body for a decision"""
+        return {
+            "event_id": decision_data["event_id"],
+            "entity_id": transaction_data["entity_id"],
+            "risk": decision_data["risk"],
+            "action": decision_data["action"],
+            "reasons": decision_data["reasons"]
         }
+    
+    async def post_batch(self, session: aiohttp.ClientSession, path: str, payloads: List[bytes],
+                         latency_key: str, label: str) -> Optional[List[Any]]:
+        """POST serialized payloads to a bulk endpoint; returns None if the server has no such endpoint"""
+        headers = self.headers
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        try:
+            async with session.post(f"{self.base_url}{path}/batch", 
+                                  data=b"[" + b",".join(payloads) + b"]", 
+                                  headers=headers) as response:
+                if response.status in (404, 405):
+                    return None
+                
+                latency = (time.perf_counter_ns() - start_ns) * 1e-9
+                self.results[latency_key].extend([latency] * len(payloads))
+                self.results["total_requests"] += len(payloads)
+                
+                if response.status == 200:
+                    self.results["successful_requests"] += len(payloads)
+                    return orjson.loads(await response.read())
+                else:
+                    self.results["failed_requests"] += len(payloads)
+                    error_text = await response.text() if self.wants_error_sample() else None
+                    self.record_error(f"{label} batch", response.status, error_text, len(payloads))
+                    return [None] * len(payloads)
+        except Exception as e:
+            latency = (time.perf_counter_ns() - start_ns) * 1e-9
+            self.results[latency_key].extend([latency] * len(payloads))
+            self.results["total_requests"] += len(payloads)
+            self.results["failed_requests"] += len(payloads)
+            self.record_error(f"{label} batch", "exception", str(e), len(payloads))
+            return [None] * len(payloads)
+    
+    def create_stages(self, session: aiohttp.ClientSession) -> Dict[str, StageBatcher]:
+        """Build the score/decide/case micro-batchers for a session"""
+        def batcher(single, batch):
+            return StageBatcher(single, batch, max_batch=self.max_batch, batch_ms=self.batch_ms)
+        
+        return {
+            "score": batcher(
+                lambda item: self.score_transaction(session, *item),
+                lambda items: self.post_batch(session, "/score", [payload for _, payload in items],
+                                              "score_latencies", "Score")
+            ),
+            "decide": batcher(
+                lambda item: self.make_decision(session, *item),
+                lambda items: self.post_batch(session, "/decide",
+                                              [orjson.dumps(self.decision_payload(*item)) for item in items],
+                                              "decision_latencies", "Decision")
+            ),
+            "case": batcher(
+                lambda item: self.create_case(session, *item, read_body=False),
+                lambda items: self.post_batch(session, "/cases",
+                                              [orjson.dumps(self.case_payload(*item)) for item in items],
+                                              "case_latencies", "Case creation")
+            )
+        }
+    
+    async def score_transaction(self, session: aiohttp.ClientSession, 
+                              transaction_data: Dict[str, Any],
+                              payload: Optional[bytes] = None) -> Dict[str, Any]:
+        """Score a single transaction, sending `payload` if it was pre-serialized"""
+        headers = self.headers
+        
+        start_ns = time.perf_counter_ns()
         try:
             async with session.post(f"{self.base_url}/score", 
-                                  json=transaction_data, 
+                                  data=payload if payload is not None else orjson.dumps(transaction_data), 
+                                  params={"fields": SCORE_FIELDS},
                                   headers=headers) as response:
-                latency = time.time() - start_time
+                latency = (time.perf_counter_ns() - start_ns) * 1e-9
                 self.results["score_latencies"].append(latency)
                 
                 if response.status == 200:
                     self.results["successful_requests"] += 1
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 else:
                     self.results["failed_requests"] += 1
-                    error_text = await response.text()
-                    self.results["errors"].append(f"Score failed: {response.status} - {error_text}")
+                    error_text = await response.text() if self.wants_error_sample() else None
+                    self.record_error("Score", response.status, error_text)
                     return None
         except Exception as e:
-            latency = time.time() - start_time
+            latency = (time.perf_counter_ns() - start_ns) * 1e-9
             self.results["score_latencies"].append(latency)
             self.results["failed_requests"] += 1
-            self.results["errors"].append(f"Score exception: {str(e)}")
+            self.record_error("Score", "exception", str(e))
             return None
         finally:
             self.results["total_requests"] += 1
@@ -93,99 +321,142 @@ class PerformanceTest:
                           score_data: Dict[str, Any], 
                           transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Make a decision based on score"""
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self.headers
         
-        decision_data = {
-            "event_id": score_data["event_id"],
-            "entity_id": transaction_data["entity_id"],
-            "channel": transaction_data["channel"],
-            "scores": {"calibrated": score_data["scores"]["calibrated"]},
-            "features": {
-                "velocity_1h": transaction_data["velocity_1h"],
-                "ip_risk": transaction_data["ip_risk"]
-            }
-        }
+        decision_data = self.decision_payload(score_data, transaction_data)
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
             async with session.post(f"{self.base_url}/decide", 
-                                  json=decision_data, 
+                                  data=orjson.dumps(decision_data), 
                                   headers=headers) as response:
-                latency = time.time() - start_time
+                latency = (time.perf_counter_ns() - start_ns) * 1e-9
                 self.results["decision_latencies"].append(latency)
                 
                 if response.status == 200:
                     self.results["successful_requests"] += 1
-                    return await response.json()
+                    return orjson.loads(await response.read())
                 else:
                     self.results["failed_requests"] += 1
-                    error_text = await response.text()
-                    self.results["errors"].append(f"Decision failed: {response.status} - {error_text}")
+                    error_text = await response.text() if self.wants_error_sample() else None
+                    self.record_error("Decision", response.status, error_text)
                     return None
         except Exception as e:
-            latency = time.time() - start_time
+            latency = (time.perf_counter_ns() - start_ns) * 1e-9
             self.results["decision_latencies"].append(latency)
             self.results["failed_requests"] += 1
-            self.results["errors"].append(f"Decision exception: {str(e)}")
+            self.record_error("Decision", "exception", str(e))
             return None
         finally:
             self.results["total_requests"] += 1
     
     async def create_case(self, session: aiohttp.ClientSession, 
                         decision_data: Dict[str, Any], 
-                        transaction_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a case if decision requires it"""
-        if decision_data["action"] not in ["hold", "block"]:
+                        transaction_data: Dict[str, Any],
+                        read_body: bool = True) -> Dict[str, Any]:
+        """Create a case if decision requires it; with read_body=False a created case returns {} unparsed"""
+        if decision_data["action"] not in CASE_ACTIONS:
             return None
         
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
+        headers = self.headers
         
-        case_data = {
-            "event_id": decision_data["event_id"],
-            "entity_id": transaction_data["entity_id"],
-            "risk": decision_data["risk"],
-            "action": decision_data["action"],
-            "reasons": decision_data["reasons"]
-        }
+        case_data = self.case_payload(decision_data, transaction_data)
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         try:
-            async with session.post(f"{self.BASE_URL}/cases", 
-                                  json=case_data, 
+            async with session.post(f"{self.base_url}/cases", 
+                                  data=orjson.dumps(case_data), 
                                   headers=headers) as response:
-                latency = time.time() - start_time
+                latency = (time.perf_counter_ns() - start_ns) * 1e-9
                 self.results["case_latencies"].append(latency)
                 
                 if response.status == 200:
                     self.results["successful_requests"] += 1
-                    return await response.json()
+                    if not read_body:
+                        response.release()
+                        return {}
+                    return orjson.loads(await response.read())
                 else:
                     self.results["failed_requests"] += 1
-                    error_text = await response.text()
-                    self.results["errors"].append(f"Case creation failed: {response.status} - {error_text}")
+                    error_text = await response.text() if self.wants_error_sample() else None
+                    self.record_error("Case creation", response.status, error_text)
                     return None
         except Exception as e:
-            latency = time.time() - start_time
+            latency = (time.perf_counter_ns() - start_ns) * 1e-9
             self.results["case_latencies"].append(latency)
             self.results["failed_requests"] += 1
-            self.results["errors"].append(f"Case creation exception: {str(e)}")
+            self.record_error("Case creation", "exception", str(e))
             return None
         finally:
             self.results["total_requests"] += 1
     
+    def prepare_transactions(self, num_transactions: int) -> List[Tuple[Dict[str, Any], bytes]]:
+        """Generate and serialize every transaction up front, outside the measured window"""
+        # One vectorized draw per field instead of a Python-level RNG call per field per transaction
+        n = num_transactions
+        rng = self.np_rng
+        channels = np.array(["web", "mobile", "api"])
+        fields = zip(
+            rng.integers(1000, 10000, size=n).tolist(),
+            rng.uniform(10.0, 5000.0, size=n).tolist(),
+            channels[rng.integers(0, 3, size=n)].tolist(),
+            rng.integers(1, 21, size=n).tolist(),
+            rng.uniform(0.0, 1.0, size=n).tolist(),
+            rng.uniform(0.0, 2000.0, size=n).tolist(),
+            rng.uniform(0.0, 1.0, size=n).tolist(),
+            rng.integers(1, 366, size=n).tolist(),
+            rng.integers(100000, 1000000, size=n).tolist()
+        )
+        
+        transactions = []
+        for i, (entity, amount, channel, velocity, ip_risk, geo_distance, merchant_risk, age_days,
+                device) in enumerate(fields):
+            transaction_data = {
+                "event_id": f"perf_test_{i:06d}",
+                "entity_id": f"acct_{entity}",
+                "ts": "2025-10-21T21:10:11Z",
+                "amount": amount,
+                "channel": channel,
+                "velocity_1h": velocity,
+                "ip_risk": ip_risk,
+                "geo_distance_km": geo_distance,
+                "merchant_risk": merchant_risk,
+                "age_days": age_days,
+                "device_fingerprint": f"device_{device}",
+                "features_version": "v1"
+            }
+            transactions.append((transaction_data, orjson.dumps(transaction_data)))
+        return transactions
+    
     async def process_single_transaction(self, session: aiohttp.ClientSession, 
-                                       event_id: str) -> Dict[str, Any]:
+                                       transaction_data: Dict[str, Any],
+                                       payload: Optional[bytes] = None) -> Dict[str, Any]:
         """Process a single transaction through the complete pipeline"""
-        transaction_data = self.generate_transaction_data(event_id)
+        # Pipelined run: each stage call joins that stage's next micro-batch
+        if self.stages is not None:
+            if payload is None:
+                payload = orjson.dumps(transaction_data)
+            score_data = await self.stages["score"].submit((transaction_data, payload))
+            if not score_data:
+                return None
+            
+            decision_data = await self.stages["decide"].submit((score_data, transaction_data))
+            if not decision_data:
+                return None
+            
+            case_data = None
+            if decision_data["action"] in CASE_ACTIONS:
+                case_data = await self.stages["case"].submit((decision_data, transaction_data))
+            
+            return {
+                "transaction": transaction_data,
+                "score": score_data,
+                "decision": decision_data,
+                "case": case_data
+            }
         
         # Score transaction
-        score_data = await self.score_transaction(session, transaction_data)
+        score_data = await self.score_transaction(session, transaction_data, payload)
         if not score_data:
             return None
         
@@ -195,7 +466,7 @@ class PerformanceTest:
             return None
         
         # Create case if needed
-        case_data = await self.create_case(session, decision_data, transaction_data)
+        case_data = await self.create_case(session, decision_data, transaction_data, read_body=False)
         
         return {
             "transaction": transaction_data,
@@ -209,42 +480,70 @@ class PerformanceTest:
         """Run load test with specified number of transactions"""
         print(f"Starting load test: {num_transactions} transactions, {concurrent_requests} concurrent")
         
-        connector = aiohttp.TCPConnector(limit=concurrent_requests)
-        timeout = aiohttp.ClientTimeout(total=30)
+        # Reuse the pool opened by `async with PerformanceTest(...)`; otherwise open one for this run
+        if self.session is not None:
+            await self._run_load_test(self.session, num_transactions, concurrent_requests)
+            return
         
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            # Authenticate
-            if not await self.authenticate(session):
-                print("Authentication failed")
-                return
-            
-            print("Authentication successful")
-            
-            # Create semaphore to limit concurrent requests
-            semaphore = asyncio.Semaphore(concurrent_requests)
-            
-            async def process_with_semaphore(event_id: str):
-                async with semaphore:
-                    return await self.process_single_transaction(session, event_id)
-            
-            # Run load test
-            start_time = time.time()
-            tasks = [
-                process_with_semaphore(f"perf_test_{i:06d}")
-                for i in range(num_transactions)
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            end_time = time.time()
-            
-            # Process results
-            successful_results = [r for r in results if r is not None and not isinstance(r, Exception)]
-            failed_results = [r for r in results if r is None or isinstance(r, Exception)]
-            
-            self.print_results(end_time - start_time, num_transactions, successful_results, failed_results)
+        async with self.create_session(concurrent_requests) as session:
+            await self._run_load_test(session, num_transactions, concurrent_requests)
+    
+    async def _run_load_test(self, session: aiohttp.ClientSession, num_transactions: int,
+                             concurrent_requests: int):
+        # Authenticate
+        if not await self.authenticate(session):
+            print("Authentication failed")
+            return
+        
+        print("Authentication successful")
+        
+        transactions = self.prepare_transactions(num_transactions)
+        
+        # Start the per-stage micro-batching workers
+        self.stages = self.create_stages(session)
+        workers = [asyncio.create_task(stage.run()) for stage in self.stages.values()]
+        
+        # Run load test with a sliding window of in-flight transactions; a new task is only
+        # created when a slot frees up, so live tasks never exceed concurrent_requests
+        # Fold each finished transaction into counters instead of keeping every result dict alive
+        succeeded = 0
+        failed = 0
+        action_counts = Counter()
+        pending = set()
+        remaining = iter(transactions)
+        
+        start_ns = time.perf_counter_ns()
+        try:
+            while True:
+                for transaction_data, payload in remaining:
+                    pending.add(asyncio.create_task(
+                        self.process_single_transaction(session, transaction_data, payload)
+                    ))
+                    if len(pending) >= concurrent_requests:
+                        break
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = None if task.exception() else task.result()
+                    if result is None:
+                        failed += 1
+                    else:
+                        succeeded += 1
+                        action_counts[result["decision"]["action"]] += 1
+        finally:
+            for task in pending:
+                task.cancel()
+            for worker in workers:
+                worker.cancel()
+            self.stages = None
+        elapsed = (time.perf_counter_ns() - start_ns) * 1e-9
+        
+        self.print_results(elapsed, num_transactions, succeeded, failed, action_counts)
     
     def print_results(self, total_time: float, num_transactions: int, 
-                     successful_results: List, failed_results: List):
+                     succeeded: int, failed: int, action_counts: Counter):
         """Print performance test results"""
         print("\n" + "="*60)
         print("PERFORMANCE TEST RESULTS")
@@ -252,62 +551,87 @@ class PerformanceTest:
         
         # Basic metrics
         print(f"Total Transactions: {num_transactions}")
-        print(f"Successful: {len(successful_results)}")
-        print(f"Failed: {len(failed_results)}")
-        print(f"Success Rate: {len(successful_results)/num_transactions*100:.2f}%")
+        print(f"Successful: {succeeded}")
+        print(f"Failed: {failed}")
+        print(f"Success Rate: {succeeded/num_transactions*100:.2f}%")
         print(f"Total Time: {total_time:.2f} seconds")
         print(f"Throughput: {num_transactions/total_time:.2f} transactions/second")
         
         # Latency metrics
+        # One selection pass per stage for all percentiles instead of a full sort per percentile
         if self.results["score_latencies"]:
             score_latencies = self.results["score_latencies"]
+            p50, p95, p99 = score_latencies.percentile([50, 95, 99])
             print(f"\nScore Service Latency:")
-            print(f"  Average: {statistics.mean(score_latencies)*1000:.2f}ms")
-            print(f"  Median: {statistics.median(score_latencies)*1000:.2f}ms")
-            print(f"  95th percentile: {sorted(score_latencies)[int(len(score_latencies)*0.95)]*1000:.2f}ms")
-            print(f"  99th percentile: {sorted(score_latencies)[int(len(score_latencies)*0.99)]*1000:.2f}ms")
+            print(f"  Average: {score_latencies.mean*1000:.2f}ms")
+            print(f"  Std dev: {score_latencies.std*1000:.2f}ms")
+            print(f"  Median: {p50*1000:.2f}ms")
+            print(f"  95th percentile: {p95*1000:.2f}ms")
+            print(f"  99th percentile: {p99*1000:.2f}ms")
         
         if self.results["decision_latencies"]:
             decision_latencies = self.results["decision_latencies"]
+            p50, p95 = decision_latencies.percentile([50, 95])
             print(f"\nDecision Service Latency:")
-            print(f"  Average: {statistics.mean(decision_latencies)*1000:.2f}ms")
-            print(f"  Median: {statistics.median(decision_latencies)*1000:.2f}ms")
-            print(f"  95th percentile: {sorted(decision_latencies)[int(len(decision_latencies)*0.95)]*1000:.2f}ms")
+            print(f"  Average: {decision_latencies.mean*1000:.2f}ms")
+            print(f"  Std dev: {decision_latencies.std*1000:.2f}ms")
+            print(f"  Median: {p50*1000:.2f}ms")
+            print(f"  95th percentile: {p95*1000:.2f}ms")
         
         if self.results["case_latencies"]:
             case_latencies = self.results["case_latencies"]
             print(f"\nCase Service Latency:")
-            print(f"  Average: {statistics.mean(case_latencies)*1000:.2f}ms")
-            print(f"  Median: {statistics.median(case_latencies)*1000:.2f}ms")
+            print(f"  Average: {case_latencies.mean*1000:.2f}ms")
+            print(f"  Std dev: {case_latencies.std*1000:.2f}ms")
+            print(f"  Median: {case_latencies.percentile(50)*1000:.2f}ms")
             print(f"  Cases Created: {len(case_latencies)}")
         
         # Error summary
-        if self.results["errors"]:
-            print(f"\nErrors ({len(self.results['errors'])}):")
-            error_counts = {}
-            for error in self.results["errors"]:
-                error_type = error.split(":")[0]
-                error_counts[error_type] = error_counts.get(error_type, 0) + 1
+        error_counts = self.results["error_counts"]
+        if error_counts:
+            print(f"\nErrors ({sum(error_counts.values())}):")
+            for (stage, kind), count in error_counts.most_common():
+                print(f"  {stage} {kind}: {count}")
             
-            for error_type, count in error_counts.items():
-                print(f"  {error_type}: {count}")
+            samples = self.results["error_samples"]
+            print(f"\nRecent error samples ({len(samples)}):")
+            for sample in list(samples)[-5:]:
+                print(f"  {sample[:200]}")
         
         # Business metrics
-        if successful_results:
-            actions = [r["decision"]["action"] for r in successful_results if r["decision"]]
-            action_counts = {}
-            for action in actions:
-                action_counts[action] = action_counts.get(action, 0) + 1
-            
+        if action_counts:
+            decided = sum(action_counts.values())
             print(f"\nDecision Distribution:")
             for action, count in action_counts.items():
-                percentage = count/len(actions)*100
+                percentage = count/decided*100
                 print(f"  {action}: {count} ({percentage:.1f}%)")
         
         print("="*60)
 
-async def main():
-    """Main function to run performance tests"""
+def install_event_loop(loop: str = "auto") -> str:
+    """Install a faster event loop policy for the load generator; returns the loop in use
+    
+    "auto" prefers uvloop (winloop on Windows) and falls back to the stdlib loop when
+    neither is installed; "asyncio" always keeps the stdlib loop for A/B comparisons.
+    """
+    if loop == "asyncio":
+        return "asyncio"
+    
+    try:
+        if sys.platform == "win32":
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        if loop != "auto":
+            raise
+        return "asyncio"
+    
+    fast_loop.install()
+    return fast_loop.__name__
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command-line options for a performance run"""
     import argparse
     
     parser = argparse.ArgumentParser(description="Run performance tests")
@@ -317,11 +641,26 @@ async def main():
                        help="Number of concurrent requests")
     parser.add_argument("--url", type=str, default="http://localhost:8001", 
                        help="Base URL for the API")
+    parser.add_argument("--max-batch", type=int, default=32, 
+                       help="Maximum requests per stage micro-batch")
+    parser.add_argument("--batch-ms", type=float, default=5.0, 
+                       help="Micro-batch collection window in milliseconds")
+    parser.add_argument("--seed", type=int, default=None, 
+                       help="Random seed for reproducible transaction data")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default="auto", 
+                       help="Event loop implementation (uvloop means uvloop/winloop, required)")
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+async def main(args=None):
+    """Main function to run performance tests"""
+    if args is None:
+        args = parse_args()
     
-    test = PerformanceTest(args.url)
-    await test.run_load_test(args.transactions, args.concurrent)
+    async with PerformanceTest(args.url, args.concurrent, args.max_batch, args.batch_ms, args.seed) as test:
+        await test.run_load_test(args.transactions, args.concurrent)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_args()
+    print(f"Event loop: {install_event_loop(args.loop)}")
+    asyncio.run(main(args))
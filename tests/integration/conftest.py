@@ -0,0 +1,61 @@
+"""
+Shared fixtures for the integration tests
+"""
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = "http://localhost:8001"
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive HTTP session shared by every integration test"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+
+def login(http, username: str) -> str:
+    """Log in as `username` and return its access token"""
+    response = http.post(f"{BASE_URL}/auth/login", json={
+        "username": username,
+        "password": "test_password"
+    })
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+def bearer_headers(token: str):
+    """Build JSON request headers for a bearer token"""
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+
+@pytest.fixture(scope="session")
+def auth_token(http):
+    """Supervisor token, logged in once per test session"""
+    return login(http, "sup:test_user")
+
+
+@pytest.fixture(scope="session")
+def headers(auth_token):
+    """Get headers with authentication"""
+    return bearer_headers(auth_token)
+
+
+@pytest.fixture(scope="module")
+def analyst_headers(http):
+    """Analyst-role headers"""
+    return bearer_headers(login(http, "analyst:test_user"))
+
+
+@pytest.fixture(scope="module")
+def admin_headers(http):
+    """Admin-role headers"""
+    return bearer_headers(login(http, "admin:test_user"))
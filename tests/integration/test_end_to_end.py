@@ -2,34 +2,16 @@
 Integration tests for end-to-end fraud detection flow
 """
 import pytest
-import requests
-import time
-from typing import Dict, Any
+
+from conftest import BASE_URL
+
+pytestmark = pytest.mark.integration
+
 
 class TestEndToEndFlow:
     """Test the complete fraud detection pipeline"""
     
-    BASE_URL = "http://localhost:8001"
-    
-    @pytest.fixture
-    def auth_token(self):
-        """Get authentication token"""
-        response = requests.post(f"{self.BASE_URL}/auth/login", json={
-            "username": "sup:test_user",
-            "password": "test_password"
-        })
-        assert response.status_code == 200
-        return response.json()["access_token"]
-    
-    @pytest.fixture
-    def headers(self, auth_token):
-        """Get headers with authentication"""
-        return {
-            "Authorization": f"Bearer {auth_token}",
-            "Content-Type": "application/json"
-        }
-    
-    def test_complete_fraud_detection_flow(self, headers):
+    def test_complete_fraud_detection_flow(self, http, headers):
         """Test the complete flow: score -> decide -> case creation"""
         
         # Step 1: Score a transaction
@@ -48,8 +30,8 @@ class TestEndToEndFlow:
             "features_version": "v1"
         }
         
-        score_response = requests.post(
-            f"{self.BASE_URL}/score",
+        score_response = http.post(
+            f"{BASE_URL}/score",
             json=transaction_data,
             headers=headers
         )
@@ -80,8 +62,8 @@ class TestEndToEndFlow:
             }
         }
         
-        decision_response = requests.post(
-            f"{self.BASE_URL}/decide",
+        decision_response = http.post(
+            f"{BASE_URL}/decide",
             json=decision_data,
             headers=headers
         )
@@ -108,8 +90,8 @@ class TestEndToEndFlow:
                 "reasons": decision_data["reasons"]
             }
             
-            case_response = requests.post(
-                f"{self.BASE_URL}/cases",
+            case_response = http.post(
+                f"{BASE_URL}/cases",
                 json=case_data,
                 headers=headers
             )
@@ -122,8 +104,8 @@ class TestEndToEndFlow:
             
             # Step 4: Verify case can be retrieved
             case_id = case_result["case_id"]
-            get_case_response = requests.get(
-                f"{self.BASE_URL}/cases/{case_id}",
+            get_case_response = http.get(
+                f"{BASE_URL}/cases/{case_id}",
                 headers=headers
             )
             assert get_case_response.status_code == 200
@@ -135,12 +117,12 @@ class TestEndToEndFlow:
             assert case_details["action"] == decision_data["action"]
             assert case_details["status"] == "open"
     
-    def test_analytics_endpoints(self, headers):
+    def test_analytics_endpoints(self, http, headers):
         """Test analytics endpoints"""
         
         # Test main analytics endpoint
-        analytics_response = requests.get(
-            f"{self.BASE_URL}/analytics?hours=24",
+        analytics_response = http.get(
+            f"{BASE_URL}/analytics?hours=24",
             headers=headers
         )
         assert analytics_response.status_code == 200
@@ -154,25 +136,25 @@ class TestEndToEndFlow:
         assert "action_distribution" in analytics_data
         
         # Test individual analytics endpoints
-        kpis_response = requests.get(
-            f"{self.BASE_URL}/analytics/kpis?hours=24",
+        kpis_response = http.get(
+            f"{BASE_URL}/analytics/kpis?hours=24",
             headers=headers
         )
         assert kpis_response.status_code == 200
         
-        trends_response = requests.get(
-            f"{self.BASE_URL}/analytics/trends?hours=24",
+        trends_response = http.get(
+            f"{BASE_URL}/analytics/trends?hours=24",
             headers=headers
         )
         assert trends_response.status_code == 200
         
-        distributions_response = requests.get(
-            f"{self.BASE_URL}/analytics/distributions?hours=24",
+        distributions_response = http.get(
+            f"{BASE_URL}/analytics/distributions?hours=24",
             headers=headers
         )
         assert distributions_response.status_code == 200
     
-    def test_model_monitoring(self, headers):
+    def test_model_monitoring(self, http, headers):
         """Test model monitoring endpoints"""
         
         # Test score ingestion
@@ -185,8 +167,8 @@ class TestEndToEndFlow:
             }
         }
         
-        monitor_response = requests.post(
-            f"{self.BASE_URL}/monitor/ingest-score",
+        monitor_response = http.post(
+            f"{BASE_URL}/monitor/ingest-score",
             json=monitor_data,
             headers=headers
         )
@@ -199,13 +181,13 @@ class TestEndToEndFlow:
         assert "n" in monitor_result
         assert monitor_result["n"] > 0
     
-    def test_rate_limiting(self, headers):
+    def test_rate_limiting(self, http, headers):
         """Test rate limiting functionality"""
         
         # Make multiple requests quickly to test rate limiting
         responses = []
         for i in range(10):
-            response = requests.post(f"{self.BASE_URL}/auth/login", json={
+            response = http.post(f"{BASE_URL}/auth/login", json={
                 "username": f"test_user_{i}",
                 "password": "test_password"
             })
@@ -215,53 +197,29 @@ class TestEndToEndFlow:
         status_codes = [r.status_code for r in responses]
         assert 429 in status_codes or all(code == 200 for code in status_codes)
     
-    def test_authentication_required(self):
+    def test_authentication_required(self, http):
         """Test that endpoints require authentication"""
         
         # Test without authentication
-        response = requests.post(f"{self.BASE_URL}/score", json={
+        response = http.post(f"{BASE_URL}/score", json={
             "event_id": "test",
             "entity_id": "test",
             "amount": 100.0
         })
         assert response.status_code == 401
     
-    def test_role_based_access(self):
+    def test_role_based_access(self, http, analyst_headers, admin_headers):
         """Test role-based access control"""
         
-        # Test with analyst role
-        analyst_response = requests.post(f"{self.BASE_URL}/auth/login", json={
-            "username": "analyst:test_user",
-            "password": "test_password"
-        })
-        assert analyst_response.status_code == 200
-        analyst_token = analyst_response.json()["access_token"]
-        analyst_headers = {
-            "Authorization": f"Bearer {analyst_token}",
-            "Content-Type": "application/json"
-        }
-        
         # Analyst should be able to access basic endpoints
-        score_response = requests.post(f"{self.BASE_URL}/score", 
+        score_response = http.post(f"{BASE_URL}/score", 
             json={"event_id": "test", "entity_id": "test", "amount": 100.0},
             headers=analyst_headers
         )
         assert score_response.status_code == 200
         
-        # Test with admin role
-        admin_response = requests.post(f"{self.BASE_URL}/auth/login", json={
-            "username": "admin:test_user",
-            "password": "test_password"
-        })
-        assert admin_response.status_code == 200
-        admin_token = admin_response.json()["access_token"]
-        admin_headers = {
-            "Authorization": f"Bearer {admin_token}",
-            "Content-Type": "application/json"
-        }
-        
         # Admin should be able to access monitoring endpoints
-        monitor_response = requests.post(f"{self.BASE_URL}/monitor/ingest-score",
+        monitor_response = http.post(f"{BASE_URL}/monitor/ingest-score",
             json={"calibrated": 0.5, "features": {}},
             headers=admin_headers
         )
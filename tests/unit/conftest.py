@@ -0,0 +1,111 @@
+"""Shared fixtures for the unit tests."""
+
+import pytest
+from datetime import datetime
+from uuid import uuid4
+
+
+@pytest.fixture(scope="module")
+def frozen_uuid():
+    """One event id for every payload in the module."""
+    return uuid4().hex
+
+
+@pytest.fixture(scope="module")
+def frozen_ts():
+    """One timestamp for every payload in the module."""
+    return datetime.utcnow()
+
+
+@pytest.fixture(scope="module")
+def base_tx(frozen_uuid, frozen_ts):
+    """Valid transaction event payload; tests override single fields."""
+    return {
+        "event_id": frozen_uuid,
+        "entity_id": "user_123",
+        "timestamp": frozen_ts,
+        "amount": 100.50,
+        "currency": "USD",
+        "channel": "web",
+        "merchant_id": "merchant_456",
+        "ip_address": "192.168.1.1"
+    }
+
+
+@pytest.fixture(scope="module")
+def base_claim(frozen_uuid, frozen_ts):
+    """Valid claim event payload."""
+    return {
+        "event_id": frozen_uuid,
+        "entity_id": "policy_123",
+        "timestamp": frozen_ts,
+        "claim_amount": 5000.00,
+        "claim_type": "auto",
+        "policy_id": "policy_456"
+    }
+
+
+@pytest.fixture(scope="module")
+def base_features(frozen_uuid, frozen_ts):
+    """Valid feature vector payload."""
+    return {
+        "event_id": frozen_uuid,
+        "entity_id": "user_123",
+        "timestamp": frozen_ts,
+        "amount": 100.50,
+        "currency": "USD",
+        "velocity_1h": 5,
+        "velocity_24h": 20,
+        "velocity_7d": 100,
+        "ip_risk": 0.3,
+        "geo_distance_km": 50.5,
+        "merchant_risk": 0.1,
+        "age_days": 365,
+        "features_version": "v1"
+    }
+
+
+@pytest.fixture(scope="module")
+def base_scores():
+    """Valid model scores payload."""
+    return {
+        "xgb": 0.8,
+        "nn": 0.7,
+        "rules": 0.3,
+        "ensemble": 0.75,
+        "calibrated": 0.78
+    }
+
+
+@pytest.fixture(scope="module")
+def base_decision(frozen_uuid):
+    """Valid decision output payload."""
+    return {
+        "event_id": frozen_uuid,
+        "risk": 0.8,
+        "action": "block",
+        "policy": "v1.0",
+        "reasons": ["high_risk_score", "velocity_anomaly"]
+    }
+
+
+# Score models are stateless (predict_proba only reads), so one instance serves the session.
+# Imported inside the fixtures so schema-only test modules do not depend on the score service.
+
+@pytest.fixture(scope="session")
+def default_ensemble():
+    """Shared ensemble with 0.5/0.3/0.2 weights."""
+    from services.score_svc.app.models import Ensemble
+    return Ensemble(0.5, 0.3, 0.2)
+
+
+@pytest.fixture(scope="session")
+def xgb_model(default_ensemble):
+    """The shared ensemble's XGB model."""
+    return default_ensemble.xgb
+
+
+@pytest.fixture(scope="session")
+def nn_model(default_ensemble):
+    """The shared ensemble's NN model."""
+    return default_ensemble.nn
@@ -6,66 +6,49 @@ from services.decision_svc.app.policy import decide
 from services.decision_svc.app.schemas import ScoreIn, DecisionOut
 from services.decision_svc.app.config import settings
 
-class TestDecisionPolicy:
-    def test_allow_decision(self):
-        payload = {
-            "scores": {"calibrated": 0.3},
-            "features": {"velocity_1h": 3, "ip_risk": 0.4},
-            "channel": "mobile"
-        }
-        action, reasons = decide(payload)
-        assert action == "allow"
-        assert len(reasons) == 0
-
-    def test_hold_decision_high_velocity(self):
-        payload = {
-            "scores": {"calibrated": 0.5},
-            "features": {"velocity_1h": 10, "ip_risk": 0.4},
-            "channel": "web"
-        }
-        action, reasons = decide(payload)
-        assert action == "hold"
-        assert "velocity_high" in reasons
-
-    def test_hold_decision_threshold(self):
-        payload = {
-            "scores": {"calibrated": 0.75},
-            "features": {"velocity_1h": 3, "ip_risk": 0.4},
-            "channel": "web"
-        }
-        action, reasons = decide(payload)
-        assert action == "hold"
-        assert "untrusted_channel" in reasons
+pytestmark = pytest.mark.unit
 
-    def test_block_decision_threshold(self):
-        payload = {
-            "scores": {"calibrated": 0.95},
-            "features": {"velocity_1h": 3, "ip_risk": 0.4},
-            "channel": "web"
-        }
-        action, reasons = decide(payload)
-        assert action == "block"
-        assert "untrusted_channel" in reasons
-
-    def test_block_decision_ip_proxy(self):
-        payload = {
-            "scores": {"calibrated": 0.85},
-            "features": {"velocity_1h": 3, "ip_risk": 0.9},
-            "channel": "web"
-        }
-        action, reasons = decide(payload)
-        assert action == "block"
-        assert "ip_proxy_match" in reasons
+# (payload, expected action, reasons that must be present, reasons that must be absent)
+DECIDE_CASES = [
+    pytest.param(
+        {"scores": {"calibrated": 0.3}, "features": {"velocity_1h": 3, "ip_risk": 0.4}, "channel": "mobile"},
+        "allow", [], ["velocity_high", "ip_proxy_match", "untrusted_channel"],
+        id="allow"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.5}, "features": {"velocity_1h": 10, "ip_risk": 0.4}, "channel": "web"},
+        "hold", ["velocity_high"], [],
+        id="hold_high_velocity"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.75}, "features": {"velocity_1h": 3, "ip_risk": 0.4}, "channel": "web"},
+        "hold", ["untrusted_channel"], [],
+        id="hold_threshold"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.95}, "features": {"velocity_1h": 3, "ip_risk": 0.4}, "channel": "web"},
+        "block", ["untrusted_channel"], [],
+        id="block_threshold"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.85}, "features": {"velocity_1h": 3, "ip_risk": 0.9}, "channel": "web"},
+        "block", ["ip_proxy_match"], [],
+        id="block_ip_proxy"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.5}, "features": {"velocity_1h": 3, "ip_risk": 0.4}, "channel": "mobile"},
+        "allow", [], ["untrusted_channel"],
+        id="trusted_channel"
+    ),
+]
 
-    def test_trusted_channel(self):
-        payload = {
-            "scores": {"calibrated": 0.5},
-            "features": {"velocity_1h": 3, "ip_risk": 0.4},
-            "channel": "mobile"
-        }
+class TestDecisionPolicy:
+    @pytest.mark.parametrize("payload,expected_action,expected_reasons,unexpected_reasons", DECIDE_CASES)
+    def test_decide(self, payload, expected_action, expected_reasons, unexpected_reasons):
         action, reasons = decide(payload)
-        assert action == "allow"
-        assert "untrusted_channel" not in reasons
+        assert action == expected_action
+        assert set(expected_reasons).issubset(reasons)
+        assert not set(unexpected_reasons) & set(reasons)
 
 class TestScoreInSchema:
     def test_valid_score_input(self):
@@ -120,40 +103,28 @@ class TestDecisionConfig:
         assert settings.WATCHLIST_ENABLED is True
         assert "mobile" in settings.TRUSTED_CHANNELS
 
+# (payload, expected action, exact expected reasons)
+FLOW_CASES = [
+    pytest.param(
+        {"scores": {"calibrated": 0.2}, "features": {"velocity_1h": 2, "ip_risk": 0.3}, "channel": "mobile"},
+        "allow", [],
+        id="allow"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.6}, "features": {"velocity_1h": 9, "ip_risk": 0.5}, "channel": "web"},
+        "hold", ["velocity_high", "untrusted_channel"],
+        id="hold"
+    ),
+    pytest.param(
+        {"scores": {"calibrated": 0.95}, "features": {"velocity_1h": 2, "ip_risk": 0.3}, "channel": "web"},
+        "block", ["untrusted_channel"],
+        id="block"
+    ),
+]
+
 class TestDecisionIntegration:
-    def test_end_to_end_decision_flow(self):
-        # Test a complete decision flow
-        test_cases = [
-            {
-                "input": {
-                    "scores": {"calibrated": 0.2},
-                    "features": {"velocity_1h": 2, "ip_risk": 0.3},
-                    "channel": "mobile"
-                },
-                "expected_action": "allow",
-                "expected_reasons": []
-            },
-            {
-                "input": {
-                    "scores": {"calibrated": 0.6},
-                    "features": {"velocity_1h": 9, "ip_risk": 0.5},
-                    "channel": "web"
-                },
-                "expected_action": "hold",
-                "expected_reasons": ["velocity_high", "untrusted_channel"]
-            },
-            {
-                "input": {
-                    "scores": {"calibrated": 0.95},
-                    "features": {"velocity_1h": 2, "ip_risk": 0.3},
-                    "channel": "web"
-                },
-                "expected_action": "block",
-                "expected_reasons": ["untrusted_channel"]
-            }
-        ]
-        
-        for case in test_cases:
-            action, reasons = decide(case["input"])
-            assert action == case["expected_action"]
-            assert set(reasons) == set(case["expected_reasons"])
+    @pytest.mark.parametrize("payload,expected_action,expected_reasons", FLOW_CASES)
+    def test_end_to_end_decision_flow(self, payload, expected_action, expected_reasons):
+        action, reasons = decide(payload)
+        assert action == expected_action
+        assert set(reasons) == set(expected_reasons)
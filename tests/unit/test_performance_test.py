@@ -0,0 +1,122 @@
+"""Unit tests for the end-to-end performance test harness."""
+
+import asyncio
+import statistics
+
+import pytest
+
+from tests.e2e.performance_test import LatencyReservoir, PerformanceTest
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeResponse:
+    """Minimal stand-in for an aiohttp response context manager."""
+
+    status = 200
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return b'{"case_id": "case_001"}'
+
+    def release(self):
+        self.released = True
+
+
+class _RecordingSession:
+    """Session double that records the URLs it is asked to POST to."""
+
+    def __init__(self):
+        self.urls = []
+
+    def post(self, url, **kwargs):
+        self.urls.append(url)
+        return _FakeResponse()
+
+
+class TestCreateCase:
+    """Test case creation requests."""
+
+    def test_posts_to_cases_endpoint(self):
+        """Test case creation posts to the configured base URL."""
+        test = PerformanceTest("http://gateway:8001")
+        session = _RecordingSession()
+        decision_data = {
+            "event_id": "e1",
+            "risk": 0.9,
+            "action": "block",
+            "reasons": ["score_threshold"]
+        }
+
+        result = asyncio.run(test.create_case(session, decision_data, {"entity_id": "acct_1"}))
+
+        assert session.urls == [f"{test.base_url}/cases"]
+        assert result == {"case_id": "case_001"}
+        assert test.results["successful_requests"] == 1
+        assert test.results["failed_requests"] == 0
+
+    def test_skips_body_when_not_needed(self):
+        """Test a created case is counted without parsing its body."""
+        test = PerformanceTest("http://gateway:8001")
+        decision_data = {"event_id": "e1", "risk": 0.9, "action": "hold", "reasons": []}
+
+        result = asyncio.run(test.create_case(_RecordingSession(), decision_data, {"entity_id": "acct_1"},
+                                              read_body=False))
+
+        assert result == {}
+        assert test.results["successful_requests"] == 1
+
+
+class TestLatencyReservoir:
+    """Test bounded latency collection."""
+
+    def test_exact_count_and_mean_with_bounded_sample(self):
+        """Test count and mean stay exact while the sample is capped."""
+        reservoir = LatencyReservoir(capacity=100, seed=7)
+        reservoir.extend([i / 1000 for i in range(1000)])
+
+        assert len(reservoir) == 1000
+        assert reservoir.mean == pytest.approx(0.4995)
+        assert reservoir.std == pytest.approx(statistics.stdev(i / 1000 for i in range(1000)))
+        assert len(reservoir.values()) == 100
+        assert 0.0 <= reservoir.percentile(50) <= 0.999
+
+
+class _FailingResponse(_FakeResponse):
+    """Response double for a server-side failure."""
+
+    status = 503
+
+    async def text(self):
+        return "unavailable"
+
+
+class _FailingSession:
+    """Session double whose every POST fails."""
+
+    def post(self, url, **kwargs):
+        return _FailingResponse()
+
+
+class TestErrorRecording:
+    """Test bounded error bookkeeping."""
+
+    def test_counts_by_stage_and_caps_samples(self):
+        """Test failures are counted per (stage, status) and samples stay bounded."""
+        test = PerformanceTest("http://gateway:8001")
+        session = _FailingSession()
+
+        async def run():
+            for i in range(150):
+                await test.score_transaction(session, {"event_id": f"e{i}"})
+
+        asyncio.run(run())
+
+        assert test.results["error_counts"] == {("Score", 503): 150}
+        assert len(test.results["error_samples"]) == 100
+        assert test.results["failed_requests"] == 150
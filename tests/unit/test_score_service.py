@@ -2,92 +2,85 @@
 Unit tests for the score service
 """
 import pytest
-from unittest.mock import Mock, patch
-from services.score_svc.app.models import XGBModel, NNModel, Ensemble, rules_score, shap_like
+from pydantic import ValidationError
+from services.score_svc.app.models import rules_score, shap_like
 from services.score_svc.app.schemas import FeatureVector, ScoreResponse
 
+# Keep every test that uses the session model fixtures on one xdist worker so they are built once
+pytestmark = [pytest.mark.unit, pytest.mark.xdist_group("shared_models")]
+
 class TestXGBModel:
-    def test_predict_proba(self):
-        model = XGBModel()
+    def test_predict_proba(self, xgb_model):
         feats = {"ip_risk": 0.8, "velocity_1h": 5}
-        result = model.predict_proba(feats)
+        result = xgb_model.predict_proba(feats)
         assert 0 <= result <= 1
         assert result > 0.1  # Should be above baseline
 
-    def test_version(self):
-        model = XGBModel()
-        assert model.version == "xgb_2025_10_01"
+    def test_version(self, xgb_model):
+        assert xgb_model.version == "xgb_2025_10_01"
 
 class TestNNModel:
-    def test_predict_proba(self):
-        model = NNModel()
+    def test_predict_proba(self, nn_model):
         feats = {"merchant_risk": 0.3, "geo_distance_km": 100}
-        result = model.predict_proba(feats)
+        result = nn_model.predict_proba(feats)
         assert 0 <= result <= 1
         assert result > 0.05  # Should be above baseline
 
-    def test_version(self):
-        model = NNModel()
-        assert model.version == "nn_2025_10_01"
+    def test_version(self, nn_model):
+        assert nn_model.version == "nn_2025_10_01"
 
-class TestRulesScore:
-    def test_velocity_high(self):
-        feats = {"velocity_1h": 10, "ip_risk": 0.5, "amount": 1000}
-        result = rules_score(feats)
-        assert result >= 0.35  # Should trigger velocity rule
-
-    def test_ip_risk_high(self):
-        feats = {"velocity_1h": 3, "ip_risk": 0.9, "amount": 1000}
-        result = rules_score(feats)
-        assert result >= 0.35  # Should trigger IP risk rule
+# (features, minimum expected rules score); a zero minimum means no rule may trigger
+RULES_CASES = [
+    pytest.param({"velocity_1h": 10, "ip_risk": 0.5, "amount": 1000}, 0.35, id="velocity_high"),
+    pytest.param({"velocity_1h": 3, "ip_risk": 0.9, "amount": 1000}, 0.35, id="ip_risk_high"),
+    pytest.param({"velocity_1h": 3, "ip_risk": 0.5, "amount": 3000}, 0.2, id="amount_high"),
+    pytest.param({"velocity_1h": 3, "ip_risk": 0.5, "amount": 1000}, 0.0, id="no_triggers"),
+]
 
-    def test_amount_high(self):
-        feats = {"velocity_1h": 3, "ip_risk": 0.5, "amount": 3000}
+class TestRulesScore:
+    @pytest.mark.parametrize("feats,min_score", RULES_CASES)
+    def test_rules(self, feats, min_score):
         result = rules_score(feats)
-        assert result >= 0.2  # Should trigger amount rule
+        if min_score == 0.0:
+            assert result == 0.0  # No rules should trigger
+        else:
+            assert result >= min_score
 
-    def test_no_triggers(self):
-        feats = {"velocity_1h": 3, "ip_risk": 0.5, "amount": 1000}
-        result = rules_score(feats)
-        assert result == 0.0  # No rules should trigger
+@pytest.fixture(scope="module")
+def scored(default_ensemble):
+    """One ensemble scoring result shared by the score-method checks."""
+    return default_ensemble.score({
+        "velocity_1h": 5,
+        "ip_risk": 0.6,
+        "merchant_risk": 0.3,
+        "geo_distance_km": 200,
+        "amount": 1500
+    })
 
 class TestEnsemble:
-    def test_ensemble_creation(self):
-        ensemble = Ensemble(0.5, 0.3, 0.2)
-        assert ensemble.w == (0.5, 0.3, 0.2)
-        assert ensemble.xgb is not None
-        assert ensemble.nn is not None
-
-    def test_version_property(self):
-        ensemble = Ensemble()
-        version = ensemble.version
+    def test_ensemble_creation(self, default_ensemble):
+        assert default_ensemble.w == (0.5, 0.3, 0.2)
+        assert default_ensemble.xgb is not None
+        assert default_ensemble.nn is not None
+
+    def test_version_property(self, default_ensemble):
+        version = default_ensemble.version
         assert "xgb_2025_10_01" in version
         assert "nn_2025_10_01" in version
 
-    def test_score_method(self):
-        ensemble = Ensemble(0.5, 0.3, 0.2)
-        feats = {
-            "velocity_1h": 5,
-            "ip_risk": 0.6,
-            "merchant_risk": 0.3,
-            "geo_distance_km": 200,
-            "amount": 1500
-        }
-        result = ensemble.score(feats)
-        
-        # Check all expected keys are present
-        expected_keys = ["xgb", "nn", "rules", "ensemble", "calibrated", "explain"]
-        for key in expected_keys:
-            assert key in result
-        
-        # Check all scores are between 0 and 1
-        for key in ["xgb", "nn", "rules", "ensemble", "calibrated"]:
-            assert 0 <= result[key] <= 1
-        
+    @pytest.mark.parametrize("key", ["xgb", "nn", "rules", "ensemble", "calibrated", "explain"])
+    def test_score_has_key(self, scored, key):
+        assert key in scored
+
+    @pytest.mark.parametrize("key", ["xgb", "nn", "rules", "ensemble", "calibrated"])
+    def test_score_bounds(self, scored, key):
+        assert 0 <= scored[key] <= 1
+
+    def test_score_explain(self, scored):
         # Check explain is a list of tuples
-        assert isinstance(result["explain"], list)
-        assert len(result["explain"]) <= 5
-        for item in result["explain"]:
+        assert isinstance(scored["explain"], list)
+        assert len(scored["explain"]) <= 5
+        for item in scored["explain"]:
             assert isinstance(item, tuple)
             assert len(item) == 2
 
@@ -108,41 +101,48 @@ class TestShapLike:
             assert isinstance(item[0], str)  # feature name
             assert isinstance(item[1], float)  # importance
 
+VALID_FEATURES = {
+    "event_id": "test_123",
+    "entity_id": "acct_456",
+    "ts": "2025-10-21T21:10:11Z",
+    "amount": 1200.0,
+    "channel": "web",
+    "velocity_1h": 5,
+    "ip_risk": 0.6,
+    "geo_distance_km": 150.0,
+    "merchant_risk": 0.3,
+    "age_days": 90,
+    "device_fingerprint": "abc123"
+}
+
+# (field, invalid value) applied one at a time to VALID_FEATURES
+INVALID_FEATURE_CASES = [
+    pytest.param("amount", "not_a_number", id="amount"),
+    pytest.param("velocity_1h", "many", id="velocity_1h"),
+    pytest.param("ip_risk", "high", id="ip_risk"),
+    pytest.param("geo_distance_km", None, id="geo_distance_km"),
+    pytest.param("age_days", 1.5, id="age_days"),
+    pytest.param("device_fingerprint", None, id="device_fingerprint"),
+]
+
 class TestFeatureVector:
     def test_feature_vector_validation(self):
         # Valid feature vector
-        fv = FeatureVector(
-            event_id="test_123",
-            entity_id="acct_456",
-            ts="2025-10-21T21:10:11Z",
-            amount=1200.0,
-            channel="web",
-            velocity_1h=5,
-            ip_risk=0.6,
-            geo_distance_km=150.0,
-            merchant_risk=0.3,
-            age_days=90,
-            device_fingerprint="abc123"
-        )
+        fv = FeatureVector(**VALID_FEATURES)
         assert fv.event_id == "test_123"
         assert fv.amount == 1200.0
         assert fv.features_version == "v1"  # default value
 
-    def test_feature_vector_invalid_data(self):
-        with pytest.raises(ValueError):
-            FeatureVector(
-                event_id="test_123",
-                entity_id="acct_456",
-                ts="invalid_timestamp",
-                amount="not_a_number",  # Should be float
-                channel="web",
-                velocity_1h=5,
-                ip_risk=0.6,
-                geo_distance_km=150.0,
-                merchant_risk=0.3,
-                age_days=90,
-                device_fingerprint="abc123"
-            )
+    @pytest.mark.parametrize("field,bad", INVALID_FEATURE_CASES)
+    def test_feature_vector_invalid_data(self, field, bad):
+        with pytest.raises(ValidationError, match=field):
+            FeatureVector(**{**VALID_FEATURES, field: bad})
+
+    def test_feature_vector_missing_field(self):
+        data = dict(VALID_FEATURES)
+        del data["entity_id"]
+        with pytest.raises(ValidationError, match="entity_id"):
+            FeatureVector(**data)
 
 class TestScoreResponse:
     def test_score_response_validation(self):